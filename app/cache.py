@@ -0,0 +1,362 @@
+import hashlib
+import json
+import pickle
+from functools import cache as memoize
+from functools import wraps
+from inspect import Parameter
+from typing import Any, Awaitable, Callable, Optional, ParamSpec, TypeVar, cast
+
+import orjson
+from fastapi import Request, Response
+from fastapi.dependencies.utils import get_typed_signature
+from fastapi_cache import Coder, FastAPICache
+from fastapi_cache.backends.redis import RedisBackend
+from fastapi_cache.decorator import _augment_signature, _locate_param, _uncacheable
+from fastapi_cache.types import Backend
+from redis.asyncio import Redis as AsyncRedis
+from sqlalchemy.ext.asyncio import AsyncConnection
+from starlette.status import HTTP_304_NOT_MODIFIED
+
+from .cache_tags import CacheTagCollector, collect_cache_tags, mark_untracked
+from .config import get_app_info, logger
+from .memory_cache import MemoryBackend
+from .redis import Redis
+from .redis.helpers.cache_tags import set_cache_tags, untrack_cache_key
+from .redis.helpers.invalidation import CacheInvalidation, on_cache_invalidation
+from .redis.helpers.repo_version import get_data_version
+from .redis.helpers.single_flight import refresh_in_background, single_flight
+from .schemas.common import Region
+from .zstd import zstd_compress, zstd_decompress
+
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+def get_region(args: list[Any], kwargs: dict[str, Any]) -> str:  # pragma: no cover
+    if "region" in kwargs and isinstance(kwargs["region"], Region):
+        return kwargs["region"].value
+    elif "search_param" in kwargs:
+        search_param = kwargs["search_param"]
+        if hasattr(search_param, "region") and isinstance(search_param.region, Region):
+            return search_param.region.value
+    else:
+        for arg in args:
+            if isinstance(arg, Region):
+                return arg.value
+            if hasattr(arg, "region") and isinstance(arg.region, Region):
+                return arg.region.value
+
+    return ""
+
+
+def get_static_args(
+    args: tuple[Any, ...], kwargs: dict[str, Any]
+) -> tuple[list[Any], dict[str, Any]]:
+    static_kwargs = {k: v for k, v in kwargs.items() if k not in {"conn", "redis"}}
+
+    static_args = [
+        arg
+        for arg in args
+        if not isinstance(arg, AsyncConnection) and not isinstance(arg, AsyncRedis)
+    ]
+
+    return static_args, static_kwargs
+
+
+def custom_key_builder(
+    __function: Callable[..., Any],
+    __namespace: str = "",
+    *,
+    request: Optional[Request] = None,  # noqa: ARG001
+    response: Optional[Response] = None,  # noqa: ARG001
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+) -> str:
+    prefix = FastAPICache.get_prefix()
+    static_args, static_kwargs = get_static_args(args, kwargs)
+
+    region = get_region(static_args, static_kwargs)
+
+    try:
+        args_dump = orjson.dumps(static_args)
+        kwargs_dump = orjson.dumps(static_kwargs)
+    except TypeError:  # orjson can't dump 64+ bit int
+        args_dump = json.dumps(static_args).encode("utf-8")
+        kwargs_dump = json.dumps(static_kwargs).encode("utf-8")
+
+    raw_key = (
+        f"{__function.__module__}:{__function.__name__}:".encode("utf-8")
+        + args_dump
+        + b":"
+        + kwargs_dump
+    )
+    cache_key = hashlib.sha1(raw_key).hexdigest()
+
+    return f"{prefix}:{region}:{__namespace}:{cache_key}"
+
+
+class PickleCoder(Coder):  # pragma: no cover
+    @classmethod
+    def encode(cls, value: Any) -> bytes:
+        picked = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        return zstd_compress(picked)
+
+    @classmethod
+    def decode(cls, value: bytes) -> Any:
+        return pickle.loads(zstd_decompress(value))
+
+
+def get_backend_redis(backend: Backend) -> Redis | None:
+    if isinstance(backend, RedisBackend):
+        return cast(Redis, backend.redis)
+    return None
+
+
+async def get_with_ttl(backend: Backend, cache_key: str) -> tuple[int, bytes | None]:
+    try:
+        return await backend.get_with_ttl(cache_key)
+    except Exception:  # noqa: BLE001
+        logger.warning(
+            f"Error retrieving cache key '{cache_key}' from backend:", exc_info=True
+        )
+        return 0, None
+
+
+async def register_cache_key(
+    region: str, cache_key: str, collector: CacheTagCollector, expire: int
+) -> None:  # pragma: no cover
+    redis = get_backend_redis(FastAPICache.get_backend())
+    if not region or redis is None:
+        return
+
+    try:
+        if collector.tracked:
+            await set_cache_tags(redis, region, cache_key, collector.tags, expire)
+        else:
+            await untrack_cache_key(redis, region, cache_key)
+    except Exception:  # noqa: BLE001
+        logger.warning(f"Error setting cache tags of '{cache_key}'", exc_info=True)
+
+
+@on_cache_invalidation
+def clear_memory_backend(invalidation: CacheInvalidation) -> None:
+    """Clear the responses cached in process memory after a data update"""
+    backend = FastAPICache._backend
+    if not isinstance(backend, MemoryBackend):
+        return
+
+    prefix = FastAPICache.get_prefix()
+    backend.cache.clear(f"{prefix}::")
+    for region in invalidation.regions:
+        backend.cache.clear(f"{prefix}:{region.value}:")
+
+
+@memoize
+def get_app_version() -> str:  # pragma: no cover
+    try:
+        return get_app_info().hash
+    except Exception:  # noqa: BLE001
+        return ""
+
+
+async def get_etag(redis: Redis | None, region: str, cache_key: str) -> str | None:
+    """Strong ETag of the key, valid until the next data update or app deploy"""
+    if redis is None or not region:
+        return None
+
+    try:
+        data_version = await get_data_version(redis, Region(region))
+    except Exception:  # noqa: BLE001
+        logger.warning("Error retrieving data version", exc_info=True)
+        return None
+    if data_version is None:
+        return None
+
+    raw_etag = f"{get_app_version()}:{data_version}:{cache_key}".encode("utf-8")
+    return f'"{hashlib.sha1(raw_etag).hexdigest()}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def cache(
+    expire: Optional[int] = None,
+    namespace: str = "",
+    stale_ttl: int = 0,
+    etag: bool = True,
+) -> Callable[[Callable[P, Awaitable[R]]], Callable[P, Awaitable[R | Response]]]:
+    """`fastapi_cache.decorator.cache` that also records the dependency tags.
+
+    The reads done while computing a missed key are collected and stored with the
+    key so a data import can invalidate only the keys that depend on changed rows.
+    See `app.cache_tags`.
+
+    With `stale_ttl`, the key is kept for `stale_ttl` seconds after `expire`. In
+    that window, the stale value is served while a background task rebuilds it.
+    The function must not take a DB connection since the rebuild runs after the
+    request is done.
+
+    With `etag`, responses get a strong ETag derived from the data version and the
+    cache key. A matching `If-None-Match` is answered with 304 before the cached
+    value is read. The responses keep their `max-age`, the ETag is used to revalidate
+    them once they expire. Disable it for keys whose value changes between data
+    updates.
+    """
+    injected_request = Parameter(
+        name="__fastapi_cache_request", annotation=Request, kind=Parameter.KEYWORD_ONLY
+    )
+    injected_response = Parameter(
+        name="__fastapi_cache_response",
+        annotation=Response,
+        kind=Parameter.KEYWORD_ONLY,
+    )
+
+    def wrapper(
+        func: Callable[P, Awaitable[R]]
+    ) -> Callable[P, Awaitable[R | Response]]:
+        wrapped_signature = get_typed_signature(func)
+        if stale_ttl and any(
+            param.annotation is AsyncConnection
+            for param in wrapped_signature.parameters.values()
+        ):
+            raise ValueError(f"{func.__name__} can't be refreshed in background")
+        to_inject: list[Parameter] = []
+        request_param = _locate_param(wrapped_signature, injected_request, to_inject)
+        response_param = _locate_param(wrapped_signature, injected_response, to_inject)
+
+        @wraps(func)
+        async def inner(*args: P.args, **kwargs: P.kwargs) -> R | Response:
+            copy_kwargs = kwargs.copy()
+            request = cast(Optional[Request], copy_kwargs.pop(request_param.name, None))
+            response = cast(
+                Optional[Response], copy_kwargs.pop(response_param.name, None)
+            )
+            # Only pass the injected request and response if the function asked for them
+            kwargs.pop(injected_request.name, None)
+            kwargs.pop(injected_response.name, None)
+
+            if _uncacheable(request):
+                return await func(*args, **kwargs)
+
+            prefix = FastAPICache.get_prefix()
+            coder = FastAPICache.get_coder()
+            cache_expire = expire or FastAPICache.get_expire() or 0
+            backend = FastAPICache.get_backend()
+            cache_status_header = FastAPICache.get_cache_status_header()
+
+            cache_key = custom_key_builder(
+                func, f"{prefix}:{namespace}", args=args, kwargs=copy_kwargs
+            )
+
+            region = get_region(*get_static_args(args, copy_kwargs))
+            redis = get_backend_redis(backend)
+            data_etag = None
+            if etag:
+                # The data version is kept in Redis even if the cache is in memory
+                etag_redis = redis or cast(
+                    Optional[Redis], request and request.app.state.redis
+                )
+                data_etag = await get_etag(etag_redis, region, cache_key)
+            if data_etag is not None and request is not None:
+                if etag_matches(request.headers.get("if-none-match"), data_etag):
+                    return Response(
+                        status_code=HTTP_304_NOT_MODIFIED,
+                        headers={
+                            "ETag": data_etag,
+                            "Cache-Control": f"max-age={cache_expire}, must-revalidate",
+                        },
+                    )
+
+            async def build() -> tuple[R, bytes]:
+                with collect_cache_tags() as collector:
+                    result = await func(*args, **kwargs)
+                to_cache = coder.encode(result)
+
+                try:
+                    await backend.set(cache_key, to_cache, cache_expire + stale_ttl)
+                except Exception:  # noqa: BLE001
+                    logger.warning(
+                        f"Error setting cache key '{cache_key}' in backend:",
+                        exc_info=True,
+                    )
+                else:
+                    await register_cache_key(
+                        region, cache_key, collector, cache_expire + stale_ttl
+                    )
+
+                return result, to_cache
+
+            if (
+                request is not None
+                and request.headers.get("Cache-Control") == "no-cache"
+            ):
+                ttl, cached = 0, None
+                result, to_cache = await build()
+            else:
+                ttl, cached = await get_with_ttl(backend, cache_key)
+                if cached is None:
+                    # Concurrent misses wait for the first one and read its result
+                    async with single_flight(redis, cache_key):
+                        ttl, cached = await get_with_ttl(backend, cache_key)
+                        if cached is None:
+                            result, to_cache = await build()
+
+            headers: dict[str, str]
+            if cached is None:
+                headers = {
+                    "Cache-Control": f"max-age={cache_expire}",
+                    "ETag": f"W/{hash(to_cache)}",
+                    cache_status_header: "MISS",
+                }
+
+            else:
+                # The tags of a cached key aren't known to an enclosing cached call
+                mark_untracked()
+
+                if stale_ttl and 0 <= ttl <= stale_ttl:
+                    refresh_in_background(redis, cache_key, build)
+
+                weak_etag = f"W/{hash(cached)}"
+                headers = {
+                    "Cache-Control": f"max-age={max(ttl - stale_ttl, 0)}",
+                    "ETag": weak_etag,
+                    cache_status_header: "HIT",
+                }
+
+                if_none_match = request and request.headers.get("if-none-match")
+                if response and data_etag is None and if_none_match == weak_etag:
+                    response.headers.update(headers)
+                    response.status_code = HTTP_304_NOT_MODIFIED
+                    return response
+
+                result = cast(R, coder.decode(cached))
+
+            if data_etag is not None:
+                # Clients revalidate with the ETag once the response is stale
+                headers["ETag"] = data_etag
+                headers["Cache-Control"] += ", must-revalidate"
+
+            # Routes returning a Response don't get the injected response's headers
+            if isinstance(result, Response):
+                result.headers.update(headers)
+            elif response:
+                response.headers.update(headers)
+
+            return result
+
+        inner.__signature__ = _augment_signature(  # type: ignore[attr-defined]
+            wrapped_signature, *to_inject
+        )
+
+        return inner
+
+    return wrapper
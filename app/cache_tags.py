@@ -0,0 +1,97 @@
+"""Dependency tags for cached responses.
+
+While a cached function runs, every master data read records a tag naming the
+rows it depends on, e.g. ``mstSvt.id:100100``. A whole-table read records
+``mstSvt:*``. The tags are stored next to the cache key so a data import only
+needs to drop the keys whose tags point to changed rows.
+
+A response is only tracked when every SQL statement it executed was tagged.
+Any read that can't be described by tags (custom SQL, reverse mappings, …)
+makes the response untracked and it is cleared on every import like before.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+FULL_CLEAR_TAG = "*"
+
+
+def get_row_tag(table_name: str, column_name: str, value: Any) -> str:
+    return f"{table_name}.{column_name}:{value}"
+
+
+def get_table_tag(table_name: str) -> str:
+    return f"{table_name}:*"
+
+
+@dataclass
+class CacheTagCollector:
+    tags: set[str] = field(default_factory=set)
+    statements: int = 0
+    tagged_statements: int = 0
+    untracked: bool = False
+
+    @property
+    def tracked(self) -> bool:
+        return not self.untracked and self.statements <= self.tagged_statements
+
+    def merge(self, other: "CacheTagCollector") -> None:
+        self.tags |= other.tags
+        self.statements += other.statements
+        self.tagged_statements += other.tagged_statements
+        self.untracked |= other.untracked
+
+
+_collector: ContextVar[CacheTagCollector | None] = ContextVar(
+    "cache_tag_collector", default=None
+)
+
+
+@contextmanager
+def collect_cache_tags() -> Iterator[CacheTagCollector]:
+    """Collect the tags of the reads done inside the block.
+
+    Nested collections are merged into the enclosing one when they exit.
+    """
+    parent = _collector.get()
+    collector = CacheTagCollector()
+    token = _collector.set(collector)
+    try:
+        yield collector
+    finally:
+        _collector.reset(token)
+        if parent is not None:
+            parent.merge(collector)
+
+
+def tag_statement(tags: Iterable[str]) -> None:
+    """Tag the next SQL statement executed in the current collection."""
+    if (collector := _collector.get()) is not None:
+        collector.tags.update(tags)
+        collector.tagged_statements += 1
+
+
+def add_cache_tags(tags: Iterable[str]) -> None:
+    """Add tags for data that wasn't read with SQL, e.g. the redis data hashes."""
+    if (collector := _collector.get()) is not None:
+        collector.tags.update(tags)
+
+
+def mark_untracked() -> None:
+    if (collector := _collector.get()) is not None:
+        collector.untracked = True
+
+
+def _count_statement(*_: Any, **__: Any) -> None:
+    if (collector := _collector.get()) is not None:
+        collector.statements += 1
+
+
+def count_statements(engine: Engine) -> None:
+    event.listen(engine, "before_cursor_execute", _count_statement)
@@ -1,4 +1,5 @@
 import logging
+from enum import StrEnum
 from logging.handlers import HTTPHandler
 from pathlib import Path
 from typing import Any, Optional, Type
@@ -43,9 +44,23 @@ logger.addHandler(console_handler)
 logger.setLevel(uvicorn_logger.level)
 
 
+class CacheBackend(StrEnum):
+    REDIS = "redis"
+    MEMORY = "memory"
+
+
+class ReplicaRouting(StrEnum):
+    ROUND_ROBIN = "round_robin"
+    LEAST_BUSY = "least_busy"
+
+
 class RegionSettings(BaseModel):
     gamedata: DirectoryPath
     postgresdsn: PostgresDsn
+    replica_dsns: list[PostgresDsn] = []
+    # Override the global pool settings for the region's engines
+    db_pool_size: Optional[int] = None
+    db_max_overflow: Optional[int] = None
 
 
 class Settings(BaseSettings):
@@ -53,13 +68,24 @@ class Settings(BaseSettings):
     redisdsn: RedisDsn = Field(default=...)
     redis_prefix: str = "fgoapi"
     clear_redis_cache: bool = True
+    cache_backend: CacheBackend = CacheBackend.REDIS
+    memory_cache_size: int = 256 * 1024 * 1024
+    memory_data_cache_size: int = 0
+    memory_row_cache_size: int = 0
+    memory_master_tables: list[str] = []
+    basic_svt_store_dir: Optional[Path] = None
+    nice_process_pool_workers: int = 0
     rayshift_api_key: SecretStr = SecretStr("")
     rayshift_api_url: str = "https://rayshift.io/api/v1/"
     quest_cache_length: int = 3600
+    quest_stale_cache_length: int = 86400
     db_pool_size: int = 3
     db_max_overflow: int = 10
+    db_prepare_threshold: Optional[int] = 1
+    db_replica_routing: ReplicaRouting = ReplicaRouting.ROUND_ROBIN
     write_postgres_data: bool = True
     write_redis_data: bool = True
+    entity_cache: bool = True
     asset_url: str = "https://assets.atlasacademy.io/GameData"
     openapi_url: Optional[HttpUrl] = None
     export_all_nice: bool = False
@@ -69,8 +95,14 @@ class Settings(BaseSettings):
     webhooks: list[str] = []
     error_webhooks: list[HttpUrl] = []
     quest_heavy_cache_threshold: int = 1000
-
-    @field_validator("asset_url", "rayshift_api_url")
+    heavy_quest_cpu_limit: float = 25
+    single_flight_lock_timeout: int = 30
+    cache_warmer_count: int = 500
+    cache_warmer_url: str = ""
+    cache_warmer_concurrency: int = 4
+    cache_warmer_cpu_limit: float = 50
+
+    @field_validator("asset_url", "rayshift_api_url", "cache_warmer_url")
     @classmethod
     def remove_last_slash(cls, value: str) -> str:
         return value.removesuffix("/")
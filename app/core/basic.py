@@ -6,7 +6,9 @@ from typing import Any, Callable, Generator, Iterable, Optional, Sequence
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncConnection
 
+from ..cache_tags import add_cache_tags, get_row_tag
 from ..config import Settings, logger
+from ..data.basic_svt import BasicSvtData, BasicSvtLimit, get_basic_svt_store
 from ..db.helpers import fetch, quest
 from ..redis import Redis
 from ..redis.helpers import pydantic_object
@@ -80,7 +82,6 @@ from ..schemas.raw import (
     MstSkill,
     MstSvt,
     MstSvtExtra,
-    MstSvtLimit,
     MstTreasureDevice,
     MstWar,
 )
@@ -435,10 +436,10 @@ async def get_basic_td(
 
 
 def select_mstSvtLimit(
-    limits: list[MstSvtLimit],
+    limits: list[BasicSvtLimit],
     svt_limit: Optional[int] = None,
     prefer_lower: bool = False,
-) -> MstSvtLimit | None:
+) -> BasicSvtLimit | None:
     limit_map = {limit.limitCount: limit for limit in limits}
     if svt_limit is not None and svt_limit in limit_map:
         return limit_map[svt_limit]
@@ -455,6 +456,19 @@ def select_mstSvtLimit(
     return None
 
 
+async def get_basic_svt_data(
+    redis: Redis, region: Region, svt_id: int
+) -> BasicSvtData | None:
+    """Read from the mapped basic servant store if the import wrote one, from the
+    `mstSvtExtra` Redis hash otherwise"""
+    store = get_basic_svt_store(region)
+    if store is None:
+        svtExtra = await pydantic_object.fetch_id(redis, region, MstSvtExtra, svt_id)
+        return BasicSvtData.from_svt_extra(svtExtra) if svtExtra else None
+    add_cache_tags([get_row_tag("mstSvtExtra", "svtId", svt_id)])
+    return store.get(svt_id)
+
+
 async def get_basic_svt(
     redis: Redis,
     region: Region,
@@ -465,31 +479,30 @@ async def get_basic_svt(
     lang: Optional[Language] = None,
     mstSvt: Optional[MstSvt] = None,
 ) -> dict[str, Any]:
-    svtExtra = await pydantic_object.fetch_id(redis, region, MstSvtExtra, svt_id)
+    svtExtra = await get_basic_svt_data(redis, region, svt_id)
 
     if not svtExtra:  # pragma: no cover
         raise HTTPException(status_code=404, detail="Svt not found")
 
-    if not mstSvt:
-        mstSvt = svtExtra.mstSvt
+    svt: MstSvt | BasicSvtData = mstSvt or svtExtra
 
-    mstSvtLimit = select_mstSvtLimit(svtExtra.limits, svt_limit, mstSvt.isServant())
+    mstSvtLimit = select_mstSvtLimit(svtExtra.limits, svt_limit, svt.isServant())
 
     if not mstSvtLimit:  # pragma: no cover
         raise HTTPException(status_code=404, detail="Svt limit not found")
 
     basic_servant = {
         "id": svt_id,
-        "collectionNo": mstSvt.collectionNo,
-        "type": SVT_TYPE_NAME[mstSvt.type],
-        "flag": SVT_FLAG_NAME.get(mstSvt.flag, NiceSvtFlag.unknown),
-        "flags": get_flags(mstSvt.flag, SVT_FLAG_ORIGINAL_NAME),
-        "name": mstSvt.name,
-        "originalName": mstSvt.name,
-        "classId": mstSvt.classId,
-        "className": get_class_name(mstSvt.classId),
-        "attribute": ATTRIBUTE_NAME[mstSvt.attri],
-        "traits": get_traits_list(sorted(mstSvt.individuality)),
+        "collectionNo": svt.collectionNo,
+        "type": SVT_TYPE_NAME[svt.type],
+        "flag": SVT_FLAG_NAME.get(svt.flag, NiceSvtFlag.unknown),
+        "flags": get_flags(svt.flag, SVT_FLAG_ORIGINAL_NAME),
+        "name": svt.name,
+        "originalName": svt.name,
+        "classId": svt.classId,
+        "className": get_class_name(svt.classId),
+        "attribute": ATTRIBUTE_NAME[svt.attri],
+        "traits": get_traits_list(sorted(svt.individuality)),
         "rarity": mstSvtLimit.rarity,
         "atkMax": mstSvtLimit.atkMax,
         "hpMax": mstSvtLimit.hpMax,
@@ -514,34 +527,34 @@ async def get_basic_svt(
     if svtExtra.zeroLimitOverwriteName is not None:
         basic_servant["name"] = svtExtra.zeroLimitOverwriteName
         basic_servant["originalName"] = svtExtra.zeroLimitOverwriteName
-        basic_servant["overwriteName"] = mstSvt.name
-        basic_servant["originalOverwriteName"] = mstSvt.name
+        basic_servant["overwriteName"] = svt.name
+        basic_servant["originalOverwriteName"] = svt.name
 
-    for limit_add in svtExtra.limitAdds:
+    for limit_count, limit_attri in svtExtra.limitAdds:
         if (
             svt_limit
-            and limit_add.attri
-            and limit_add.limitCount == svt_limit
-            and limit_add.attri != SvtAttribute.DEFAULT
+            and limit_attri
+            and limit_count == svt_limit
+            and limit_attri != SvtAttribute.DEFAULT
         ):
-            basic_servant["attribute"] = ATTRIBUTE_NAME[limit_add.attri]
+            basic_servant["attribute"] = ATTRIBUTE_NAME[limit_attri]
 
     base_settings = {
         "base_url": settings.asset_url,
         "region": region,
         "item_id": svt_id,
     }
-    if mstSvt.type == SvtType.SVT_MATERIAL_TD:
-        base_settings["item_id"] = mstSvt.baseSvtId
+    if svt.type == SvtType.SVT_MATERIAL_TD:
+        base_settings["item_id"] = svt.baseSvtId
 
     face_limit = disp_limit or mstSvtLimit.limitCount
 
     if image_svt_id:
         base_settings["item_id"] = image_svt_id
         basic_servant["face"] = AssetURL.face.format(**base_settings, i="")
-    elif mstSvt.type == SvtType.SERVANT_EQUIP:
+    elif svt.type == SvtType.SERVANT_EQUIP:
         basic_servant["face"] = AssetURL.face.format(**base_settings, i=0)
-    elif mstSvt.type in (SvtType.ENEMY, SvtType.ENEMY_COLLECTION):
+    elif svt.type in (SvtType.ENEMY, SvtType.ENEMY_COLLECTION):
         if svtExtra and face_limit in svtExtra.costumeLimitSvtIdMap:
             basic_servant["face"] = AssetURL.enemy.format(
                 base_url=settings.asset_url,
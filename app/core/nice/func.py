@@ -1,5 +1,8 @@
 import re
-from typing import Any, Optional
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Iterable, Iterator, Optional
 
 from fastapi import HTTPException
 from pydantic import HttpUrl
@@ -17,7 +20,7 @@ from ...schemas.nice import (
     ValDamageRateBattlePointPhase,
 )
 from ...schemas.raw import FunctionEntityNoReverse, MstFunc, MstFuncGroup
-from ..raw import get_func_entity_no_reverse
+from ..raw import get_func_entities_no_reverse, get_func_entity_no_reverse
 from ..utils import fmt_url, get_traits_list, get_traits_list_list
 from .buff import get_nice_buff
 
@@ -82,6 +85,68 @@ STRING_DATAVALS = {
 STRING_LIST_DATAVALS = {"ApplyValueUp", "CheckOverChargeStageRange"}
 
 
+DEPEND_FUNC_ID_REGEX = re.compile(r"DependFuncId1:\s*\[?(\d+)")
+DependFuncs = dict[int, FunctionEntityNoReverse]
+_preloaded_depend_funcs: ContextVar[DependFuncs | None] = ContextVar(
+    "preloaded_depend_funcs", default=None
+)
+
+
+def get_depend_func_ids(svals: Iterable[str]) -> set[int]:
+    """IDs of the DependFuncs of `svals`, including the ones nested in the
+    DependFuncVals"""
+    return {
+        int(func_id) for sval in svals for func_id in DEPEND_FUNC_ID_REGEX.findall(sval)
+    }
+
+
+async def preload_depend_funcs(
+    conn: AsyncConnection, svals: Iterable[str]
+) -> DependFuncs:
+    """Fetch the DependFunc entities `parse_dataVals` needs for `svals` in one
+    statement"""
+    return await get_func_entities_no_reverse(conn, get_depend_func_ids(svals))
+
+
+@contextmanager
+def use_preloaded_depend_funcs(depend_funcs: DependFuncs) -> Iterator[None]:
+    """Resolve the DependFuncs inside the block from `depend_funcs` instead of the DB
+    so the nice conversion can run after the connection is released"""
+    token = _preloaded_depend_funcs.set(depend_funcs)
+    try:
+        yield
+    finally:
+        _preloaded_depend_funcs.reset(token)
+
+
+async def get_depend_func_entity(
+    conn: AsyncConnection, func_id: int
+) -> FunctionEntityNoReverse:
+    depend_funcs = _preloaded_depend_funcs.get()
+    if depend_funcs is None:
+        return await get_func_entity_no_reverse(conn, func_id)
+    if func_id not in depend_funcs:
+        depend_funcs[func_id] = await get_missing_depend_func_entity(conn, func_id)
+    return depend_funcs[func_id]
+
+
+async def get_missing_depend_func_entity(
+    conn: Optional[AsyncConnection], func_id: int
+) -> FunctionEntityNoReverse:
+    """DependFunc that wasn't preloaded. The connection of the request may already be
+    released and the process pool converts without any."""
+    if conn is None:
+        raise HTTPException(status_code=404, detail="Function not found")
+    logger.warning(f"DependFunc {func_id} wasn't preloaded")
+    if conn.sync_connection is not None and not conn.closed:
+        return await get_func_entity_no_reverse(conn, func_id)
+    async with conn.engine.connect() as new_conn:
+        return await get_func_entity_no_reverse(new_conn, func_id)
+
+
+# Distinct (svals, funcType) pairs kept parsed, the same svals recur across the
+# levels and the servants sharing a skill
+DATAVALS_CACHE_SIZE = 65536
 DataValType = dict[
     str,
     int
@@ -94,9 +159,16 @@ DataValType = dict[
 ]
 
 
-async def parse_dataVals(
-    conn: AsyncConnection, region: Region, datavals: str, functype: int, lang: Language
-) -> DataValType:
+@lru_cache(maxsize=DATAVALS_CACHE_SIZE)
+def parse_dataVals_text(
+    datavals: str, functype: int
+) -> tuple[DataValType, Optional[str]]:
+    """Parse the datavals that don't need the DB.
+
+    The DependFuncVals string is returned as is for `parse_dataVals` to resolve with
+    the DependFunc. The parsed values are shared between calls and mustn't be
+    modified.
+    """
     error_message = f"Can't parse datavals: {datavals}"
     exception = HTTPException(status_code=500, detail=error_message)
     INITIAL_VALUE = -98765
@@ -110,6 +182,7 @@ async def parse_dataVals(
     CheckBattlePointPhaseRange: list[ValCheckBattlePointPhaseRange] = []
 
     output: DataValType = {}
+    depend_func_vals: Optional[str] = None
     if datavals != "[]":
         datavals = remove_brackets(datavals)
         array = re.split(r",\s*(?![^\[\]]*])", datavals)
@@ -237,21 +310,7 @@ async def parse_dataVals(
                             )
                             raise exception from None
 
-                        depend_func_entity = await get_func_entity_no_reverse(
-                            conn,
-                            int(output["DependFuncId"]),  # type: ignore[arg-type]
-                        )
-
-                        output["DependFunc"] = await get_nice_function(
-                            conn, region, depend_func_entity, lang
-                        )
-                        output["DependFuncVals"] = await parse_dataVals(
-                            conn,
-                            region,
-                            array2[1],
-                            depend_func_entity.mstFunc.funcType,
-                            lang,
-                        )
+                        depend_func_vals = array2[1]
                     elif array2[0] in LIST_DATAVALS:
                         try:
                             output[array2[0]] = [int(i) for i in array2[1].split("/")]
@@ -299,7 +358,7 @@ async def parse_dataVals(
         if not any(key.startswith(prefix) for key in output):
             if (
                 len([val for val in array if val])
-                != len([k for k in output if k != "DependFunc"])
+                != len(output) + (depend_func_vals is not None)
                 and functype != FuncType.NONE
             ):
                 logger.warning(
@@ -326,6 +385,24 @@ async def parse_dataVals(
         elif output[prefix_0] == 2:
             output["RateCount"] = output[prefix_1]
 
+    return output, depend_func_vals
+
+
+async def parse_dataVals(
+    conn: AsyncConnection, region: Region, datavals: str, functype: int, lang: Language
+) -> DataValType:
+    parsed, depend_func_vals = parse_dataVals_text(datavals, functype)
+    output = parsed.copy()
+    if depend_func_vals is not None:
+        depend_func_entity = await get_depend_func_entity(
+            conn, int(output["DependFuncId"])  # type: ignore[arg-type]
+        )
+        output["DependFunc"] = await get_nice_function(
+            conn, region, depend_func_entity, lang
+        )
+        output["DependFuncVals"] = await parse_dataVals(
+            conn, region, depend_func_vals, depend_func_entity.mstFunc.funcType, lang
+        )
     return output
 
 
@@ -373,6 +450,35 @@ def get_nice_func_script(mstFunc: MstFunc) -> FunctionScript:
     return FunctionScript.model_validate(script)
 
 
+async def parse_sval_fields(
+    conn: AsyncConnection,
+    region: Region,
+    functype: int,
+    lang: Language,
+    sval_fields: dict[str, Optional[list[str]]],
+) -> dict[str, list[DataValType]]:
+    """Parse the svals of every level of a function, resolving the DependFuncs of
+    all of them in one statement unless they were preloaded"""
+    all_svals = [
+        sval for argument in sval_fields.values() if argument for sval in argument
+    ]
+    if _preloaded_depend_funcs.get() is None and any(
+        DEPEND_FUNC_ID_REGEX.search(sval) for sval in all_svals
+    ):
+        depend_funcs = await preload_depend_funcs(conn, all_svals)
+        with use_preloaded_depend_funcs(depend_funcs):
+            return await parse_sval_fields(conn, region, functype, lang, sval_fields)
+
+    return {
+        field: [
+            await parse_dataVals(conn, region, sval, functype, lang)
+            for sval in argument
+        ]
+        for field, argument in sval_fields.items()
+        if argument
+    }
+
+
 async def get_nice_function(
     conn: AsyncConnection,
     region: Region,
@@ -415,20 +521,19 @@ async def get_nice_function(
             base_url=settings.asset_url, region=region, item_id=funcPopupIconId
         )
 
-    for field, argument in [
-        ("svals", svals),
-        ("svals2", svals2),
-        ("svals3", svals3),
-        ("svals4", svals4),
-        ("svals5", svals5),
-        ("followerVals", followerVals),
-    ]:
-        if argument:
-            nice_func[field] = [
-                await parse_dataVals(
-                    conn, region, sval, function.mstFunc.funcType, lang
-                )
-                for sval in argument
-            ]
+    nice_func |= await parse_sval_fields(
+        conn,
+        region,
+        function.mstFunc.funcType,
+        lang,
+        {
+            "svals": svals,
+            "svals2": svals2,
+            "svals3": svals3,
+            "svals4": svals4,
+            "svals5": svals5,
+            "followerVals": followerVals,
+        },
+    )
 
     return nice_func
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Iterable, Optional
 
 from sqlalchemy.ext.asyncio import AsyncConnection
 
@@ -37,16 +37,46 @@ from ..basic import (
 )
 from .buff import get_nice_buff
 from .cc import get_nice_command_code
-from .func import get_nice_function
+from .func import DependFuncs, get_nice_function, preload_depend_funcs
 from .mc import get_nice_mystic_code
+from .pool import NiceServantJob, get_nice_servants
+from .prebuilt import PrebuiltNiceFunctions, load_prebuilt_functions
 from .skill import get_nice_skill_from_raw
-from .svt.svt import get_nice_servant
+from .svt.svt import get_nice_servant, get_svt_svals
 from .td import get_nice_td
 
 
 settings = Settings()
 
 
+async def preload_servant_depend_funcs(
+    conn: AsyncConnection, raw_svts: Iterable[ServantEntity]
+) -> DependFuncs:
+    """DB reads left for the nice conversion of `raw_svts`, to be used with
+    `use_preloaded_depend_funcs` once the connection is released"""
+    return await preload_depend_funcs(
+        conn, (sval for raw_svt in raw_svts for sval in get_svt_svals(raw_svt))
+    )
+
+
+async def load_servant_prebuilt_functions(
+    conn: AsyncConnection, raw_svts: Iterable[ServantEntity], lang: Language
+) -> PrebuiltNiceFunctions:
+    """Skill and NP functions of `raw_svts` built at import, to be used with
+    `use_prebuilt_functions`"""
+    raw_svts = list(raw_svts)
+    return await load_prebuilt_functions(
+        conn,
+        lang,
+        (skill.mstSkill.id for raw_svt in raw_svts for skill in raw_svt.mstSkill),
+        (
+            td.mstTreasureDevice.id
+            for raw_svt in raw_svts
+            for td in raw_svt.mstTreasureDevice
+        ),
+    )
+
+
 async def get_nice_servant_model(
     conn: AsyncConnection,
     region: Region,
@@ -56,7 +86,7 @@ async def get_nice_servant_model(
     mstSvt: Optional[MstSvt] = None,
     raw_svt: Optional[ServantEntity] = None,
 ) -> NiceServant:
-    return NiceServant.parse_obj(
+    return NiceServant.model_validate(
         await get_nice_servant(conn, region, item_id, lang, lore, mstSvt, raw_svt)
     )
 
@@ -70,11 +100,30 @@ async def get_nice_equip_model(
     mstSvt: Optional[MstSvt] = None,
     raw_svt: Optional[ServantEntity] = None,
 ) -> NiceEquip:
-    return NiceEquip.parse_obj(
+    return NiceEquip.model_validate(
         await get_nice_servant(conn, region, item_id, lang, lore, mstSvt, raw_svt)
     )
 
 
+async def get_nice_servant_models(
+    conn: AsyncConnection, region: Region, svt_ids: Iterable[int], lang: Language
+) -> list[NiceServant]:
+    """Nice servants of the reverse lookups, converted in the process pool when there
+    are many of them"""
+    raw_svts = await raw.get_servant_entities(conn, svt_ids, expand=True)
+    return await get_nice_servants(
+        NiceServantJob(
+            region=region,
+            lang=lang,
+            lore=False,
+            equip=False,
+            raw_svts=raw_svts,
+            depend_funcs=await preload_servant_depend_funcs(conn, raw_svts),
+            prebuilt=await load_servant_prebuilt_functions(conn, raw_svts, lang),
+        )
+    )
+
+
 async def get_nice_buff_with_reverse(
     conn: AsyncConnection,
     redis: Redis,
@@ -217,10 +266,9 @@ async def get_nice_skill_with_reverse(
             nice_skill.reverse = NiceReversedSkillTdType(basic=basic_skill_reverse)
         else:
             skill_reverse = NiceReversedSkillTd(
-                servant=[
-                    await get_nice_servant_model(conn, region, svt_id, lang=lang)
-                    for svt_id in sorted(activeSkills | passiveSkills)
-                ],
+                servant=await get_nice_servant_models(
+                    conn, region, sorted(activeSkills | passiveSkills), lang
+                ),
                 MC=[
                     await get_nice_mystic_code(conn, region, mc_id, lang)
                     for mc_id in mc_ids
@@ -262,10 +310,12 @@ async def get_nice_td_with_reverse(
             nice_td.reverse = NiceReversedSkillTdType(basic=basic_td_reverse)
         else:
             td_reverse = NiceReversedSkillTd(
-                servant=[
-                    await get_nice_servant_model(conn, region, svt_td.svtId, lang=lang)
-                    for svt_td in raw_td.mstSvtTreasureDevice
-                ]
+                servant=await get_nice_servant_models(
+                    conn,
+                    region,
+                    [svt_td.svtId for svt_td in raw_td.mstSvtTreasureDevice],
+                    lang,
+                )
             )
             nice_td.reverse = NiceReversedSkillTdType(nice=td_reverse)
     return nice_td
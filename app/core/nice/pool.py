@@ -0,0 +1,143 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from math import ceil
+from typing import Optional, cast
+
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from ...config import Settings
+from ...schemas.common import Language, Region
+from ...schemas.nice import NiceEquip, NiceServant
+from ...schemas.raw import ServantEntity
+from .func import DependFuncs, use_preloaded_depend_funcs
+from .prebuilt import PrebuiltNiceFunctions, use_prebuilt_functions
+from .svt.svt import get_nice_servant
+
+
+settings = Settings()
+
+
+# Smaller jobs are converted in the worker, the pickling would cost more than it saves
+NICE_POOL_MIN_ENTITIES = 5
+
+
+@dataclass
+class NiceServantJob:
+    """Everything the nice conversion of `raw_svts` needs. The DB reads are all done
+    before so the job can run without a connection."""
+
+    region: Region
+    lang: Language
+    lore: bool
+    equip: bool
+    raw_svts: list[ServantEntity]
+    depend_funcs: DependFuncs
+    prebuilt: PrebuiltNiceFunctions
+
+
+_nice_executor: Optional[ProcessPoolExecutor] = None
+
+
+def get_nice_executor() -> Optional[ProcessPoolExecutor]:
+    global _nice_executor
+    if settings.nice_process_pool_workers <= 0:
+        return None
+    if _nice_executor is None:
+        # Forking would copy the event loop and the open connections of the worker
+        _nice_executor = ProcessPoolExecutor(
+            max_workers=settings.nice_process_pool_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _nice_executor
+
+
+def warm_up() -> None:
+    """Submitted at startup so the pool processes import the app before the first
+    request"""
+
+
+def start_nice_executor() -> None:
+    if executor := get_nice_executor():
+        for _ in range(settings.nice_process_pool_workers):
+            executor.submit(warm_up)
+
+
+def shutdown_nice_executor() -> None:
+    global _nice_executor
+    if _nice_executor is not None:
+        _nice_executor.shutdown(cancel_futures=True)
+        _nice_executor = None
+
+
+async def build_nice_servants(job: NiceServantJob) -> list[NiceServant | NiceEquip]:
+    nice_model: type[NiceServant] | type[NiceEquip] = (
+        NiceEquip if job.equip else NiceServant
+    )
+    with (
+        use_preloaded_depend_funcs(job.depend_funcs),
+        use_prebuilt_functions(job.prebuilt),
+    ):
+        return [
+            nice_model.model_validate(
+                await get_nice_servant(
+                    cast(AsyncConnection, None),
+                    job.region,
+                    raw_svt.mstSvt.id,
+                    job.lang,
+                    job.lore,
+                    raw_svt=raw_svt,
+                )
+            )
+            for raw_svt in job.raw_svts
+        ]
+
+
+def dump_nice_servants(job: NiceServantJob) -> list[str]:
+    """Entry point of the pool processes"""
+    return [
+        nice_svt.model_dump_json(exclude_unset=True, exclude_none=True)
+        for nice_svt in asyncio.run(build_nice_servants(job))
+    ]
+
+
+async def run_in_nice_executor(job: NiceServantJob) -> Optional[list[str]]:
+    """JSON of the nice servants or equips of `job` converted in the process pool, split
+    between the processes. `None` if the job is small enough for the worker."""
+    executor = get_nice_executor()
+    if executor is None or len(job.raw_svts) < NICE_POOL_MIN_ENTITIES:
+        return None
+    chunk_size = max(
+        NICE_POOL_MIN_ENTITIES,
+        ceil(len(job.raw_svts) / settings.nice_process_pool_workers),
+    )
+    loop = asyncio.get_running_loop()
+    chunks = await asyncio.gather(
+        *(
+            loop.run_in_executor(
+                executor,
+                dump_nice_servants,
+                replace(job, raw_svts=job.raw_svts[start : start + chunk_size]),
+            )
+            for start in range(0, len(job.raw_svts), chunk_size)
+        )
+    )
+    return [nice_svt for chunk in chunks for nice_svt in chunk]
+
+
+async def get_nice_servants_json(job: NiceServantJob) -> list[str]:
+    """JSON of the nice servants or equips of `job`. The large jobs are converted in
+    the process pool so the worker keeps serving the other requests."""
+    if (nice_svts := await run_in_nice_executor(job)) is not None:
+        return nice_svts
+    return [
+        nice_svt.model_dump_json(exclude_unset=True, exclude_none=True)
+        for nice_svt in await build_nice_servants(job)
+    ]
+
+
+async def get_nice_servants(job: NiceServantJob) -> list[NiceServant]:
+    if (nice_svts := await run_in_nice_executor(job)) is not None:
+        return [NiceServant.model_validate_json(nice_svt) for nice_svt in nice_svts]
+    return cast(list[NiceServant], await build_nice_servants(job))
@@ -0,0 +1,95 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Iterator, Optional
+
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from ...config import Settings
+from ...db.helpers import entity_cache
+from ...db.helpers.entity_cache import EntityCacheType
+from ...schemas.common import Language
+from ...schemas.nice import NiceFunction
+
+
+settings = Settings()
+
+
+NICE_SKILL_FUNCTIONS_TYPES = {
+    Language.jp: EntityCacheType.NICE_SKILL_FUNCTIONS_JP,
+    Language.en: EntityCacheType.NICE_SKILL_FUNCTIONS_EN,
+}
+NICE_TD_FUNCTIONS_TYPES = {
+    Language.jp: EntityCacheType.NICE_TD_FUNCTIONS_JP,
+    Language.en: EntityCacheType.NICE_TD_FUNCTIONS_EN,
+}
+
+
+NiceFunctions = list[dict[str, Any]]
+nice_functions_adapter = TypeAdapter(list[NiceFunction])
+
+
+def dump_nice_functions(functions: NiceFunctions) -> dict[str, Any]:
+    """Entity cache row of the nice functions of a skill or NP"""
+    return {
+        "functions": nice_functions_adapter.dump_python(
+            nice_functions_adapter.validate_python(functions),
+            mode="json",
+            exclude_unset=True,
+        )
+    }
+
+
+@dataclass
+class PrebuiltNiceFunctions:
+    """Nice functions of skills and NPs built at import, by skill or NP ID"""
+
+    skills: dict[int, NiceFunctions] = field(default_factory=dict)
+    tds: dict[int, NiceFunctions] = field(default_factory=dict)
+
+
+_prebuilt_functions: ContextVar[PrebuiltNiceFunctions | None] = ContextVar(
+    "prebuilt_functions", default=None
+)
+
+
+async def load_prebuilt_functions(
+    conn: AsyncConnection,
+    lang: Language,
+    skill_ids: Iterable[int],
+    td_ids: Iterable[int],
+) -> PrebuiltNiceFunctions:
+    if not settings.entity_cache:
+        return PrebuiltNiceFunctions()
+    skills = await entity_cache.get_cached_entities(
+        conn, NICE_SKILL_FUNCTIONS_TYPES[lang], set(skill_ids)
+    )
+    tds = await entity_cache.get_cached_entities(
+        conn, NICE_TD_FUNCTIONS_TYPES[lang], set(td_ids)
+    )
+    return PrebuiltNiceFunctions(
+        skills={skill_id: row["functions"] for skill_id, row in skills.items()},
+        tds={td_id: row["functions"] for td_id, row in tds.items()},
+    )
+
+
+@contextmanager
+def use_prebuilt_functions(prebuilt: PrebuiltNiceFunctions) -> Iterator[None]:
+    """Take the nice functions of the skills and NPs inside the block from `prebuilt`
+    when they were built at import"""
+    token = _prebuilt_functions.set(prebuilt)
+    try:
+        yield
+    finally:
+        _prebuilt_functions.reset(token)
+
+
+def get_prebuilt_skill_functions(skill_id: int) -> Optional[NiceFunctions]:
+    prebuilt = _prebuilt_functions.get()
+    return prebuilt.skills.get(skill_id) if prebuilt is not None else None
+
+
+def get_prebuilt_td_functions(td_id: int) -> Optional[NiceFunctions]:
+    prebuilt = _prebuilt_functions.get()
+    return prebuilt.tds.get(td_id) if prebuilt is not None else None
@@ -2,13 +2,15 @@ import asyncio
 import time
 from collections import defaultdict
 from dataclasses import dataclass
+from functools import partial
 from typing import Any, Optional, Union, cast
 
 from fastapi import HTTPException
-from fastapi_cache.decorator import cache
 from sqlalchemy.ext.asyncio import AsyncConnection
 
+from ...cache import cache
 from ...config import Settings
+from ...db.engine import async_engines
 from ...db.helpers import war
 from ...db.helpers.quest import get_questSelect_container
 from ...db.helpers.rayshift import (
@@ -22,7 +24,14 @@ from ...db.helpers.rayshift import (
 )
 from ...rayshift.quest import get_quest_detail
 from ...redis import Redis
-from ...redis.helpers.quest import RayshiftRedisData, get_stages_cache, set_stages_cache
+from ...redis.helpers.quest import (
+    RayshiftRedisData,
+    get_redis_cache_key,
+    get_stages_cache,
+    record_stages_cache_writes,
+    set_stages_cache,
+)
+from ...redis.helpers.single_flight import refresh_in_background, run_refresh
 from ...schemas.common import Language, Region, ScriptLink
 from ...schemas.enums import STAGE_LIMIT_ACT_TYPE_NAME, get_class_name
 from ...schemas.gameenums import (
@@ -389,6 +398,52 @@ async def get_nice_quest_alone(
     return NiceQuest.parse_obj(await get_nice_quest(conn, region, raw_quest, lang))
 
 
+async def refresh_stages_cache(
+    redis: Redis,
+    region: Region,
+    quest_id: int,
+    phase: int,
+    lang: Language,
+    questHash: str | None,
+) -> None:  # pragma: no cover
+    async with async_engines[region].begin() as conn:
+        await get_nice_quest_phase(
+            conn, redis, region, quest_id, phase, lang, questHash, False
+        )
+
+
+async def regenerate_stages_cache(
+    redis: Redis,
+    region: Region,
+    quest_id: int,
+    phase: int,
+    lang: Language,
+    questHash: str | None,
+) -> None:  # pragma: no cover
+    """Rebuild the heavy stage cache in place.
+
+    The old data is served until the new one overwrites it. If the quest wasn't
+    saved again, the old data is kept for the stale window so the next request
+    serves it and rebuilds it in background.
+    """
+    redis_key = get_redis_cache_key(region, quest_id, phase, questHash, lang)
+    heavy_key = f"{redis_key}:heavy"
+
+    with record_stages_cache_writes() as written_keys:
+        await run_refresh(
+            redis,
+            redis_key,
+            partial(
+                refresh_stages_cache, redis, region, quest_id, phase, lang, questHash
+            ),
+        )
+
+    if redis_key in written_keys:
+        await redis.delete(heavy_key)
+    elif heavy_key not in written_keys:
+        await redis.expire(heavy_key, settings.quest_stale_cache_length)
+
+
 @dataclass
 class DBQuestPhase:
     raw: QuestPhaseEntity
@@ -529,6 +584,7 @@ async def get_nice_quest_phase(
     phase: int,
     lang: Language = Language.jp,
     questHash: str | None = None,
+    use_stages_cache: bool = True,
 ) -> NiceQuestPhase:
     db_data = cast(
         DBQuestPhase,
@@ -550,9 +606,29 @@ async def get_nice_quest_phase(
         questSelectScript = []
         questSelect = []
 
-    rayshift_data = await get_stages_cache(
-        redis, region, quest_id, phase, lang, questHash
-    )
+    if use_stages_cache:
+        rayshift_data, rayshift_data_ttl = await get_stages_cache(
+            redis, region, quest_id, phase, lang, questHash
+        )
+        if (
+            rayshift_data
+            and 0 <= rayshift_data_ttl <= settings.quest_stale_cache_length
+        ):
+            refresh_in_background(
+                redis,
+                get_redis_cache_key(region, quest_id, phase, questHash, lang),
+                partial(
+                    refresh_stages_cache,
+                    redis,
+                    region,
+                    quest_id,
+                    phase,
+                    lang,
+                    questHash,
+                ),
+            )
+    else:
+        rayshift_data = None
 
     def set_ai_npc_data(ai_npcs: dict[int, QuestEnemy] | None) -> None:
         if ai_npcs is not None:
@@ -31,6 +31,7 @@ from ..raw import get_skill_entity_no_reverse, get_skill_entity_no_reverse_many
 from ..utils import get_traits_list, get_translation, strip_formatting_brackets
 from .common_release import get_nice_common_release
 from .func import get_nice_function
+from .prebuilt import get_prebuilt_skill_functions
 
 
 settings = Settings()
@@ -149,6 +150,41 @@ def get_nice_select_td_info(select_info: Any) -> SelectTreasureDeviceInfo:
     )
 
 
+async def get_nice_skill_functions(
+    conn: AsyncConnection,
+    skillEntity: SkillEntityNoReverse,
+    region: Region,
+    lang: Language,
+) -> list[dict[str, Any]]:
+    functions: list[dict[str, Any]] = []
+    if skillEntity.mstSkillLv[0].expandedFuncId:
+        for funci, _ in enumerate(skillEntity.mstSkillLv[0].funcId):
+            if funci >= len(skillEntity.mstSkillLv[0].expandedFuncId):
+                break
+            function = skillEntity.mstSkillLv[0].expandedFuncId[funci]
+            followerVals = (
+                [
+                    skill_lv.script["followerVals"][funci]
+                    for skill_lv in skillEntity.mstSkillLv
+                ]
+                if "followerVals" in skillEntity.mstSkillLv[0].script
+                else None
+            )
+
+            nice_func = await get_nice_function(
+                conn,
+                region,
+                function,
+                lang,
+                svals=[skill_lv.svals[funci] for skill_lv in skillEntity.mstSkillLv],
+                followerVals=followerVals,
+            )
+
+            functions.append(nice_func)
+
+    return functions
+
+
 async def get_nice_skill_with_svt(
     conn: AsyncConnection,
     skillEntity: SkillEntityNoReverse,
@@ -232,31 +268,12 @@ async def get_nice_skill_with_svt(
                 skillEntity.mstSkill.script[key] for _ in skillEntity.mstSkillLv
             ]
 
-    nice_skill["functions"] = []
-    if skillEntity.mstSkillLv[0].expandedFuncId:
-        for funci, _ in enumerate(skillEntity.mstSkillLv[0].funcId):
-            if funci >= len(skillEntity.mstSkillLv[0].expandedFuncId):
-                break
-            function = skillEntity.mstSkillLv[0].expandedFuncId[funci]
-            followerVals = (
-                [
-                    skill_lv.script["followerVals"][funci]
-                    for skill_lv in skillEntity.mstSkillLv
-                ]
-                if "followerVals" in skillEntity.mstSkillLv[0].script
-                else None
-            )
-
-            nice_func = await get_nice_function(
-                conn,
-                region,
-                function,
-                lang,
-                svals=[skill_lv.svals[funci] for skill_lv in skillEntity.mstSkillLv],
-                followerVals=followerVals,
-            )
-
-            nice_skill["functions"].append(nice_func)
+    prebuilt_functions = get_prebuilt_skill_functions(skillEntity.mstSkill.id)
+    nice_skill["functions"] = (
+        prebuilt_functions
+        if prebuilt_functions is not None
+        else await get_nice_skill_functions(conn, skillEntity, region, lang)
+    )
 
     if skillEntity.mstSkillGroup and skillEntity.mstSkillGroupOverwrite:
         skill_groups: list[dict[str, Any]] = []
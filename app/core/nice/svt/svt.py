@@ -1,4 +1,5 @@
-from typing import Any, Optional
+from itertools import chain
+from typing import Any, Iterator, Optional
 
 import orjson
 from fastapi import HTTPException
@@ -133,6 +134,27 @@ def get_nice_svt_limit_image(limit_image: MstSvtLimitImage) -> NiceServantLimitI
     )
 
 
+def get_svt_svals(raw_svt: ServantEntity) -> Iterator[str]:
+    """Datavals of every skill and NP function of the servant, with the skill group
+    overwrites"""
+    for skill in chain(
+        raw_svt.mstSkill,
+        raw_svt.mstSvt.expandedClassPassive,
+        raw_svt.expandedExtraPassive,
+        raw_svt.expandedAppendPassive,
+    ):
+        for skill_lv in skill.mstSkillLv:
+            yield from skill_lv.svals
+            yield from skill_lv.script.get("followerVals", [])
+        for overwrite in skill.mstSkillGroupOverwrite:
+            yield from overwrite.svals
+    for td in raw_svt.mstTreasureDevice:
+        for td_lv in td.mstTreasureDeviceLv:
+            yield from chain(
+                td_lv.svals, td_lv.svals2, td_lv.svals3, td_lv.svals4, td_lv.svals5
+            )
+
+
 async def get_nice_servant(
     conn: AsyncConnection,
     region: Region,
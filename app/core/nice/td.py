@@ -15,6 +15,7 @@ from ...schemas.raw import (
 from ..raw import get_td_entity_no_reverse, get_td_entity_no_reverse_many
 from ..utils import get_np_name, get_traits_list, strip_formatting_brackets
 from .func import get_nice_function
+from .prebuilt import get_prebuilt_td_functions
 from .skill import get_nice_skill_release, get_nice_skill_script
 
 
@@ -57,6 +58,47 @@ def get_nice_td_effect_flag(effectFlag: int) -> NiceTdEffectFlag:
     return NiceTdEffectFlag.support
 
 
+async def get_nice_td_functions(
+    conn: AsyncConnection,
+    tdEntity: TdEntityNoReverse,
+    region: Region,
+    lang: Language,
+) -> list[dict[str, Any]]:
+    functions: list[dict[str, Any]] = []
+
+    for funci, _ in enumerate(tdEntity.mstTreasureDeviceLv[0].funcId):
+        if tdEntity.mstTreasureDeviceLv[0].expandedFuncId:
+            if funci >= len(tdEntity.mstTreasureDeviceLv[0].expandedFuncId):
+                break
+            function = tdEntity.mstTreasureDeviceLv[0].expandedFuncId[funci]
+
+            nice_func = await get_nice_function(
+                conn,
+                region,
+                function,
+                lang,
+                svals=[
+                    skill_lv.svals[funci] for skill_lv in tdEntity.mstTreasureDeviceLv
+                ],
+                svals2=[
+                    skill_lv.svals2[funci] for skill_lv in tdEntity.mstTreasureDeviceLv
+                ],
+                svals3=[
+                    skill_lv.svals3[funci] for skill_lv in tdEntity.mstTreasureDeviceLv
+                ],
+                svals4=[
+                    skill_lv.svals4[funci] for skill_lv in tdEntity.mstTreasureDeviceLv
+                ],
+                svals5=[
+                    skill_lv.svals5[funci] for skill_lv in tdEntity.mstTreasureDeviceLv
+                ],
+            )
+
+            functions.append(nice_func)
+
+    return functions
+
+
 async def get_nice_td(
     conn: AsyncConnection,
     tdEntity: TdEntityNoReverse,
@@ -130,37 +172,12 @@ async def get_nice_td(
     if tdChangeByBattlePoint:
         nice_td["script"]["tdChangeByBattlePoint"] = tdChangeByBattlePoint
 
-    nice_td["functions"] = []
-
-    for funci, _ in enumerate(tdEntity.mstTreasureDeviceLv[0].funcId):
-        if tdEntity.mstTreasureDeviceLv[0].expandedFuncId:
-            if funci >= len(tdEntity.mstTreasureDeviceLv[0].expandedFuncId):
-                break
-            function = tdEntity.mstTreasureDeviceLv[0].expandedFuncId[funci]
-
-            nice_func = await get_nice_function(
-                conn,
-                region,
-                function,
-                lang,
-                svals=[
-                    skill_lv.svals[funci] for skill_lv in tdEntity.mstTreasureDeviceLv
-                ],
-                svals2=[
-                    skill_lv.svals2[funci] for skill_lv in tdEntity.mstTreasureDeviceLv
-                ],
-                svals3=[
-                    skill_lv.svals3[funci] for skill_lv in tdEntity.mstTreasureDeviceLv
-                ],
-                svals4=[
-                    skill_lv.svals4[funci] for skill_lv in tdEntity.mstTreasureDeviceLv
-                ],
-                svals5=[
-                    skill_lv.svals5[funci] for skill_lv in tdEntity.mstTreasureDeviceLv
-                ],
-            )
-
-            nice_td["functions"].append(nice_func)
+    prebuilt_functions = get_prebuilt_td_functions(tdEntity.mstTreasureDevice.id)
+    nice_td["functions"] = (
+        prebuilt_functions
+        if prebuilt_functions is not None
+        else await get_nice_td_functions(conn, tdEntity, region, lang)
+    )
 
     chosen_svts = [svt_td for svt_td in sorted_svtTd if svt_td.svtId == svtId]
 
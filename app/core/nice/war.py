@@ -1,4 +1,5 @@
 from decimal import Decimal
+from typing import Optional
 
 from sqlalchemy.ext.asyncio import AsyncConnection
 
@@ -44,6 +45,7 @@ from ...schemas.raw import (
     MstWarQuestSelection,
     MstWarRelease,
     QuestEntity,
+    WarEntity,
 )
 from .. import raw
 from ..utils import fmt_url, get_flags, get_translation
@@ -327,9 +329,14 @@ def get_nice_blank_earth_spot(
 
 
 async def get_nice_war(
-    conn: AsyncConnection, region: Region, war_id: int, lang: Language
+    conn: AsyncConnection,
+    region: Region,
+    war_id: int,
+    lang: Language,
+    raw_war: Optional[WarEntity] = None,
 ) -> NiceWar:
-    raw_war = await raw.get_war_entity(conn, war_id)
+    if not raw_war:
+        raw_war = await raw.get_war_entity(conn, war_id)
 
     base_settings = {"base_url": settings.asset_url, "region": region}
     war_asset_id = (
@@ -1,13 +1,15 @@
-from typing import Any, Iterable, Optional
+from typing import Any, Iterable, Optional, Type
 
 import orjson
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncConnection
 
+from ..config import Settings
 from ..data.custom_mappings import EXTRA_CHARAFIGURES
 from ..data.shop import get_shop_cost_item_id
 from ..db.helpers import (
     ai,
+    entity_cache,
     event,
     fetch,
     gacha,
@@ -19,6 +21,7 @@ from ..db.helpers import (
     td,
     war,
 )
+from ..db.helpers.entity_cache import EntityCacheType
 from ..redis import Redis
 from ..redis.helpers.reverse import RedisReverse, get_reverse_ids
 from ..schemas.common import Region, ReverseDepth
@@ -52,6 +55,7 @@ from ..schemas.raw import (
     FunctionEntity,
     FunctionEntityNoReverse,
     GachaEntity,
+    GlobalNewMstSubtitle,
     ItemEntity,
     MasterMissionEntity,
     MstBattleMasterImage,
@@ -63,6 +67,7 @@ from ..schemas.raw import (
     MstBgmRelease,
     MstBlankEarthSpot,
     MstBoxGacha,
+    MstBoxGachaBase,
     MstBoxGachaTalk,
     MstBuff,
     MstClassBoardBase,
@@ -122,6 +127,7 @@ from ..schemas.raw import (
     MstEventRewardSet,
     MstEventSvt,
     MstEventTower,
+    MstEventTowerReward,
     MstEventTradeGoods,
     MstEventTradePickup,
     MstEventVoicePlay,
@@ -136,6 +142,7 @@ from ..schemas.raw import (
     MstMap,
     MstMapGimmick,
     MstMasterMission,
+    MstSetItem,
     MstShop,
     MstShopRelease,
     MstShopScript,
@@ -165,11 +172,14 @@ from ..schemas.raw import (
     MstSvtOverwrite,
     MstSvtPassiveSkill,
     MstSvtScript,
+    MstSvtSkill,
+    MstSvtTreasureDevice,
     MstSvtVoice,
     MstSvtVoiceRelation,
     MstTreasureBox,
     MstTreasureBoxGift,
     MstVoice,
+    MstVoicePlayCond,
     MstWar,
     MstWarAdd,
     MstWarBoard,
@@ -199,6 +209,9 @@ from ..schemas.raw import (
 )
 
 
+settings = Settings()
+
+
 async def get_buff_entity_no_reverse(
     conn: AsyncConnection, buff_id: int, mstBuff: Optional[MstBuff] = None
 ) -> BuffEntityNoReverse:
@@ -262,6 +275,32 @@ async def get_func_entity_no_reverse(
     return func_entity
 
 
+async def get_func_entities_no_reverse(
+    conn: AsyncConnection, func_ids: Iterable[int]
+) -> dict[int, FunctionEntityNoReverse]:
+    """Unexpanded function entities of `func_ids` in one statement, missing IDs are
+    skipped"""
+    func_ids = set(func_ids)
+    if not func_ids:
+        return {}
+    jsonb = await fetch.get_jsonb(
+        conn,
+        {
+            "mstFunc": fetch.get_one_jsonb(MstFunc, func_ids),
+            "mstFuncGroup": fetch.get_all_jsonb(MstFuncGroup, func_ids),
+        },
+    )
+    func_groups = fetch.group_by(
+        fetch.parse_all(MstFuncGroup, jsonb["mstFuncGroup"]), "funcId"
+    )
+    return {
+        mstFunc.id: FunctionEntityNoReverse(
+            mstFunc=mstFunc, mstFuncGroup=func_groups.get(mstFunc.id, [])
+        )
+        for mstFunc in fetch.parse_all(MstFunc, jsonb["mstFunc"])
+    }
+
+
 async def get_func_entity(
     conn: AsyncConnection,
     redis: Redis,
@@ -435,23 +474,18 @@ async def get_event_allout(
     return await fetch.get_all_multiple(conn, MstEventAlloutBattle, event_ids)
 
 
-async def get_voice_from_svtVoice(
-    conn: AsyncConnection, mstSvtVoices: list[MstSvtVoice]
-) -> list[MstVoice]:
-    base_voice_ids = {
+def get_base_voice_ids(mstSvtVoices: Iterable[MstSvtVoice]) -> set[str]:
+    return {
         info.get_voice_id()
         for svt_voice in mstSvtVoices
         for script_json in svt_voice.scriptJson
         if script_json is not None
         for info in script_json.infos
     }
-    return await fetch.get_all_multiple(conn, MstVoice, base_voice_ids)
 
 
-async def get_voice_group_from_svtVoice(
-    conn: AsyncConnection, mstSvtVoices: list[MstSvtVoice]
-) -> list[MstSvtGroup]:
-    group_ids = {
+def get_voice_group_ids(mstSvtVoices: Iterable[MstSvtVoice]) -> set[int]:
+    return {
         cond.value
         for svt_voice in mstSvtVoices
         for script_json in svt_voice.scriptJson
@@ -459,107 +493,117 @@ async def get_voice_group_from_svtVoice(
         for cond in (script_json.conds if script_json.conds is not None else [])
         if cond.condType == VoiceCondType.SVT_GROUP
     }
-    return await fetch.get_all_multiple(conn, MstSvtGroup, group_ids)
 
 
-async def get_servant_entity(
-    conn: AsyncConnection,
-    servant_id: int,
-    expand: bool = False,
-    lore: bool = False,
-    mstSvt: Optional[MstSvt] = None,
-) -> ServantEntity:
-    svt_db = mstSvt if mstSvt else await fetch.get_one(conn, MstSvt, servant_id)
-    if not svt_db:
-        raise HTTPException(status_code=404, detail="Svt not found")
+async def get_voice_from_svtVoice(
+    conn: AsyncConnection, mstSvtVoices: list[MstSvtVoice]
+) -> list[MstVoice]:
+    base_voice_ids = get_base_voice_ids(mstSvtVoices)
+    return await fetch.get_all_multiple(conn, MstVoice, base_voice_ids)
 
-    mstSvtIndividuality = await fetch.get_all(conn, MstSvtIndividuality, servant_id)
-    mstSvtCard = await fetch.get_all(conn, MstSvtCard, servant_id)
-    mstSvtCardAdd = await fetch.get_all(conn, MstSvtCardAdd, servant_id)
-    mstSvtLimit = await fetch.get_all(conn, MstSvtLimit, servant_id)
-    mstCombineSkill = await fetch.get_all(conn, MstCombineSkill, svt_db.combineSkillId)
-    mstCombineLimit = await fetch.get_all(conn, MstCombineLimit, svt_db.combineLimitId)
-    mstCombineCostume = await fetch.get_all(conn, MstCombineCostume, servant_id)
-    mstSvtLimitAdd = await fetch.get_all(conn, MstSvtLimitAdd, servant_id)
-    mstSvtLimitImage = await fetch.get_all(conn, MstSvtLimitImage, servant_id)
-    mstSvtChange = await fetch.get_all(conn, MstSvtChange, servant_id)
-    mstSvtCostume = await fetch.get_all(conn, MstSvtCostume, servant_id)
-    mstSvtExp = await fetch.get_all(conn, MstSvtExp, svt_db.expType)
-    mstFriendship = await fetch.get_all(conn, MstFriendship, svt_db.friendshipId)
-    mstCombineMaterial = await fetch.get_all(
-        conn, MstCombineMaterial, svt_db.combineMaterialId
-    )
-    mstSvtPassiveSkill = await fetch.get_all(conn, MstSvtPassiveSkill, servant_id)
-    mstSvtExtra = await fetch.get_one(conn, MstSvtExtra, servant_id)
-    mstSvtAppendPassiveSkill = await fetch.get_all(
-        conn, MstSvtAppendPassiveSkill, servant_id
-    )
-    mstSvtAppendPassiveSkillUnlock = await fetch.get_all(
-        conn, MstSvtAppendPassiveSkillUnlock, servant_id
-    )
-    mstCombineAppendPassiveSkill = await fetch.get_all(
-        conn, MstCombineAppendPassiveSkill, servant_id
-    )
-    mstSvtCoin = await fetch.get_one(conn, MstSvtCoin, servant_id)
-    mstSvtAdd = await fetch.get_one(conn, MstSvtAdd, servant_id)
-    mstSvtMultiPortrait = await fetch.get_all(conn, MstSvtMultiPortrait, servant_id)
-    mstSvtOverwrite = await fetch.get_all(conn, MstSvtOverwrite, servant_id)
 
-    costume_chara_ids = [limit.battleCharaId for limit in mstSvtLimitAdd]
-    mstSvtScript = await svt.get_svt_script(
-        conn, {servant_id, *costume_chara_ids, *EXTRA_CHARAFIGURES.get(servant_id, [])}
-    )
+async def get_voice_group_from_svtVoice(
+    conn: AsyncConnection, mstSvtVoices: list[MstSvtVoice]
+) -> list[MstSvtGroup]:
+    group_ids = get_voice_group_ids(mstSvtVoices)
+    return await fetch.get_all_multiple(conn, MstSvtGroup, group_ids)
 
-    mstSvtBattlePoint = await fetch.get_all_multiple(
-        conn, MstSvtBattlePoint, [servant_id]
-    )
-    battle_point_ids = {bp.battlePointId for bp in mstSvtBattlePoint}
-    mstBattlePoint = await fetch.get_all_multiple(
-        conn, MstBattlePoint, battle_point_ids
-    )
-    mstBattlePointPhase = await fetch.get_all_multiple(
-        conn, MstBattlePointPhase, battle_point_ids
-    )
 
-    skill_ids = [
-        skill.skillId for skill in await skill.get_mstSvtSkill(conn, svt_id=servant_id)
-    ]
-    mstSkill = await get_skill_entity_no_reverse_many(conn, skill_ids, expand)
+def get_svt_voice_ids(svt_id: int, mstSvtChange: list[MstSvtChange]) -> list[int]:
+    # Try to match order in the voice tab in game
+    voice_ids = [change.svtVoiceId for change in mstSvtChange]
 
-    td_ids = {
-        td.treasureDeviceId
-        for td in await td.get_mstSvtTreasureDevice(conn, svt_id=servant_id)
-        if td.treasureDeviceId != EXTRA_ATTACK_TD_ID
-    } | {
-        int(overwrite.overwriteValue["overwriteTreasureDeviceId"])
-        for overwrite in mstSvtOverwrite
-        if overwrite.type == ServantOverwriteType.TREASURE_DEVICE
-    }
-    mstTreasureDevice = await get_td_entity_no_reverse_many(conn, td_ids, expand)
+    voice_ids.append(svt_id)
 
-    extra_td_ids = {
-        int(v)
-        for td in mstTreasureDevice
-        for k, v in td.mstTreasureDevice.script.items()
-        if k.startswith("tdChangeByBattlePoint")
+    for main_id, sub_id in (
+        (600700, 600710),  # Jekyll/Hyde
+        (800100, 800101),  # Mash
+    ):
+        if svt_id == main_id:
+            voice_ids.append(sub_id)
+
+    return voice_ids
+
+
+async def add_svt_lore_voices(
+    conn: AsyncConnection, svt_entities: list[ServantEntity]
+) -> None:
+    """Add the voice tables to the servant entities, fetched once for all of them"""
+    # Moriarty deadheat summer lines use his hidden name svt_id
+    relation_svt_ids = {
+        svt_id
+        for svt_entity in svt_entities
+        for svt_id in [
+            *(change.svtVoiceId for change in svt_entity.mstSvtChange),
+            svt_entity.mstSvt.id,
+        ]
     }
+    voiceRelations = fetch.group_by(
+        await fetch.get_all_multiple(conn, MstSvtVoiceRelation, relation_svt_ids),
+        "svtId",
+    )
 
-    mstTreasureDevice += await get_td_entity_no_reverse_many(conn, extra_td_ids, expand)
+    svt_voice_ids: list[list[int]] = []
+    for svt_entity in svt_entities:
+        voice_ids = get_svt_voice_ids(svt_entity.mstSvt.id, svt_entity.mstSvtChange)
+        for relation_svt_id in [
+            *(change.svtVoiceId for change in svt_entity.mstSvtChange),
+            svt_entity.mstSvt.id,
+        ]:
+            for voiceRelation in voiceRelations.get(relation_svt_id, []):
+                voice_ids.append(voiceRelation.relationSvtId)
+        svt_voice_ids.append(voice_ids)
+
+    all_voice_ids = {voice_id for voice_ids in svt_voice_ids for voice_id in voice_ids}
+    all_mstSvtVoice = await svt.get_mstSvtVoice(conn, all_voice_ids)
+    all_mstSubtitle = await svt.get_mstSubtitle(conn, all_voice_ids)
+    all_mstVoicePlayCond = await svt.get_mstVoicePlayCond(conn, all_voice_ids)
+    all_mstVoice = await get_voice_from_svtVoice(conn, all_mstSvtVoice)
+    all_mstSvtGroup = await get_voice_group_from_svtVoice(conn, all_mstSvtVoice)
+
+    for svt_entity, voice_ids in zip(svt_entities, svt_voice_ids):
+        order = {voice_id: i for i, voice_id in enumerate(voice_ids)}
+        mstSvtVoice = [voice for voice in all_mstSvtVoice if voice.id in order]
+        base_voice_ids = get_base_voice_ids(mstSvtVoice)
+        group_ids = get_voice_group_ids(mstSvtVoice)
 
-    item_ids: set[int] = set()
-    for combine in (
-        mstCombineLimit
-        + mstCombineSkill
-        + mstCombineAppendPassiveSkill
-        + mstCombineCostume
-        + mstSvtAppendPassiveSkillUnlock
-    ):
-        item_ids.update(combine.itemIds)
-    if mstSvtCoin is not None:
-        item_ids.add(mstSvtCoin.itemId)
+        svt_entity.mstVoice = [
+            voice for voice in all_mstVoice if voice.id in base_voice_ids
+        ]
+        svt_entity.mstSvtGroup = [
+            group for group in all_mstSvtGroup if group.id in group_ids
+        ]
+        svt_entity.mstSvtVoice = sorted(mstSvtVoice, key=lambda voice: order[voice.id])
+        svt_entity.mstVoicePlayCond = sorted(
+            (cond for cond in all_mstVoicePlayCond if cond.svtId in order),
+            key=lambda voice: order[voice.svtId],
+        )
+        svt_entity.mstSubtitle = sorted(
+            (sub for sub in all_mstSubtitle if sub.get_svtId() in order),
+            key=lambda sub: order[sub.get_svtId()],
+        )
 
-    mstItem = await get_multiple_items(conn, item_ids)
 
+def split_svt_scripts(
+    svt_id: int,
+    mstSvtLimitAdd: list[MstSvtLimitAdd],
+    mstSvtScript: list[MstSvtScript],
+) -> list[MstSvtScript]:
+    script_svt_ids = {
+        svt_id,
+        *EXTRA_CHARAFIGURES.get(svt_id, []),
+        *(limit_add.battleCharaId for limit_add in mstSvtLimitAdd),
+    }
+    return [
+        script
+        for script in mstSvtScript
+        if script.id in script_svt_ids or script.id // 10 in script_svt_ids
+    ]
+
+
+def get_svt_common_release_ids(
+    mstSvtPassiveSkill: list[MstSvtPassiveSkill], mstSvtLimit: list[MstSvtLimit]
+) -> set[int]:
     common_release_ids = {
         skill.commonReleaseId
         for skill in mstSvtPassiveSkill
@@ -576,129 +620,406 @@ async def get_servant_entity(
                     common_release_ids.add(strParam[field_name])
         except orjson.JSONDecodeError:  # pragma: no cover
             pass
+    return common_release_ids
 
-    mstCommonRelease = await fetch.get_all_multiple(
-        conn, MstCommonRelease, common_release_ids
-    )
 
-    svt_entity = ServantEntity(
-        mstSvt=svt_db,
-        mstSvtIndividuality=mstSvtIndividuality,
-        mstSvtCard=mstSvtCard,
-        mstSvtCardAdd=mstSvtCardAdd,
-        mstSvtLimit=mstSvtLimit,
-        mstCombineSkill=mstCombineSkill,
-        mstCombineLimit=mstCombineLimit,
-        mstCombineCostume=mstCombineCostume,
-        mstCombineMaterial=mstCombineMaterial,
-        mstSvtLimitAdd=mstSvtLimitAdd,
-        mstSvtLimitImage=mstSvtLimitImage,
-        mstSvtChange=mstSvtChange,
-        mstSvtPassiveSkill=mstSvtPassiveSkill,
-        mstSvtAppendPassiveSkill=mstSvtAppendPassiveSkill,
-        mstSvtAppendPassiveSkillUnlock=mstSvtAppendPassiveSkillUnlock,
-        mstCombineAppendPassiveSkill=mstCombineAppendPassiveSkill,
-        mstSvtCoin=mstSvtCoin,
-        mstSvtAdd=mstSvtAdd,
-        mstSvtOverwrite=mstSvtOverwrite,
-        # needed costume to get the nice limits and costume ids
-        mstSvtCostume=mstSvtCostume,
-        # needed this to get CharaFigure available forms
-        mstSvtScript=mstSvtScript,
-        mstSvtExp=mstSvtExp,
-        mstFriendship=mstFriendship,
-        mstSvtBattlePoint=mstSvtBattlePoint,
-        mstBattlePoint=mstBattlePoint,
-        mstBattlePointPhase=mstBattlePointPhase,
-        mstSkill=mstSkill,
-        mstTreasureDevice=mstTreasureDevice,
-        mstSvtExtra=mstSvtExtra,
-        mstItem=mstItem,
-        mstSvtMultiPortrait=mstSvtMultiPortrait,
-        mstCommonRelease=mstCommonRelease,
+async def build_servant_entities(
+    conn: AsyncConnection,
+    servant_ids: Iterable[int],
+    expand: bool = False,
+    lore: bool = False,
+    mstSvts: Optional[Iterable[MstSvt]] = None,
+) -> list[ServantEntity]:
+    """Servant entities of `servant_ids` assembled from the master tables,
+    skipping the IDs without a servant.
+
+    The tables of all servants are fetched together so a page of servants takes
+    a handful of round trips instead of a few dozen per servant. The skills and
+    NPs shared by several servants are only fetched and parsed once.
+    """
+    servant_ids = list(dict.fromkeys(servant_ids))
+    svt_dbs = {mstSvt.id: mstSvt for mstSvt in mstSvts or []}
+    if missing_ids := [svt_id for svt_id in servant_ids if svt_id not in svt_dbs]:
+        missing_rows = await fetch.get_jsonb(
+            conn, {"mstSvt": fetch.get_one_jsonb(MstSvt, missing_ids)}
+        )
+        for mstSvt in fetch.parse_all(MstSvt, missing_rows["mstSvt"]):
+            svt_dbs[mstSvt.id] = mstSvt
+    svt_list = [svt_dbs[svt_id] for svt_id in servant_ids if svt_id in svt_dbs]
+    if not svt_list:
+        return []
+    svt_ids = [svt_db.id for svt_db in svt_list]
+
+    # The tables that only depend on the svts are fetched in one round trip
+    svt_jsonb = {
+        "mstSvtIndividuality": fetch.get_all_jsonb(MstSvtIndividuality, svt_ids),
+        "mstSvtCard": fetch.get_all_jsonb(MstSvtCard, svt_ids),
+        "mstSvtCardAdd": fetch.get_all_jsonb(MstSvtCardAdd, svt_ids),
+        "mstSvtLimit": fetch.get_all_jsonb(MstSvtLimit, svt_ids),
+        "mstCombineSkill": fetch.get_all_jsonb(
+            MstCombineSkill, {svt_db.combineSkillId for svt_db in svt_list}
+        ),
+        "mstCombineLimit": fetch.get_all_jsonb(
+            MstCombineLimit, {svt_db.combineLimitId for svt_db in svt_list}
+        ),
+        "mstCombineCostume": fetch.get_all_jsonb(MstCombineCostume, svt_ids),
+        "mstSvtLimitAdd": fetch.get_all_jsonb(MstSvtLimitAdd, svt_ids),
+        "mstSvtLimitImage": fetch.get_all_jsonb(MstSvtLimitImage, svt_ids),
+        "mstSvtChange": fetch.get_all_jsonb(MstSvtChange, svt_ids),
+        "mstSvtCostume": fetch.get_all_jsonb(MstSvtCostume, svt_ids),
+        "mstSvtExp": fetch.get_all_jsonb(
+            MstSvtExp, {svt_db.expType for svt_db in svt_list}
+        ),
+        "mstFriendship": fetch.get_all_jsonb(
+            MstFriendship, {svt_db.friendshipId for svt_db in svt_list}
+        ),
+        "mstCombineMaterial": fetch.get_all_jsonb(
+            MstCombineMaterial, {svt_db.combineMaterialId for svt_db in svt_list}
+        ),
+        "mstSvtPassiveSkill": fetch.get_all_jsonb(MstSvtPassiveSkill, svt_ids),
+        "mstSvtExtra": fetch.get_one_jsonb(MstSvtExtra, svt_ids),
+        "mstSvtAppendPassiveSkill": fetch.get_all_jsonb(
+            MstSvtAppendPassiveSkill, svt_ids
+        ),
+        "mstSvtAppendPassiveSkillUnlock": fetch.get_all_jsonb(
+            MstSvtAppendPassiveSkillUnlock, svt_ids
+        ),
+        "mstCombineAppendPassiveSkill": fetch.get_all_jsonb(
+            MstCombineAppendPassiveSkill, svt_ids
+        ),
+        "mstSvtCoin": fetch.get_one_jsonb(MstSvtCoin, svt_ids),
+        "mstSvtAdd": fetch.get_one_jsonb(MstSvtAdd, svt_ids),
+        "mstSvtMultiPortrait": fetch.get_all_jsonb(MstSvtMultiPortrait, svt_ids),
+        "mstSvtOverwrite": fetch.get_all_jsonb(MstSvtOverwrite, svt_ids),
+        "mstSvtScript": svt.get_svt_script_jsonb(
+            {
+                script_svt_id
+                for svt_id in svt_ids
+                for script_svt_id in [svt_id, *EXTRA_CHARAFIGURES.get(svt_id, [])]
+            },
+            svt_ids,
+        ),
+        "mstSvtBattlePoint": fetch.get_all_multiple_jsonb(MstSvtBattlePoint, svt_ids),
+        "mstSvtSkill": skill.get_mstSvtSkill_jsonb(svt_ids),
+        "mstSvtTreasureDevice": td.get_mstSvtTreasureDevice_jsonb(svt_ids),
+    }
+    if lore:
+        svt_jsonb |= {
+            "mstCv": fetch.get_one_jsonb(MstCv, {svt_db.cvId for svt_db in svt_list}),
+            "mstIllustrator": fetch.get_one_jsonb(
+                MstIllustrator, {svt_db.illustratorId for svt_db in svt_list}
+            ),
+            "mstSvtComment": fetch.get_all_jsonb(MstSvtComment, svt_ids),
+            "mstSvtCommentAdd": fetch.get_all_jsonb(MstSvtCommentAdd, svt_ids),
+        }
+    svt_rows = await fetch.get_jsonb(conn, svt_jsonb)
+
+    def group_rows(
+        name: str, schema: Type[fetch.TFetchAll], field: str = "svtId"
+    ) -> dict[Any, list[fetch.TFetchAll]]:
+        return fetch.group_by(fetch.parse_all(schema, svt_rows[name]), field)
+
+    mstSvtIndividuality = group_rows("mstSvtIndividuality", MstSvtIndividuality)
+    mstSvtCard = group_rows("mstSvtCard", MstSvtCard)
+    mstSvtCardAdd = group_rows("mstSvtCardAdd", MstSvtCardAdd)
+    mstSvtLimit = group_rows("mstSvtLimit", MstSvtLimit)
+    mstCombineSkill = group_rows("mstCombineSkill", MstCombineSkill, "id")
+    mstCombineLimit = group_rows("mstCombineLimit", MstCombineLimit, "id")
+    mstCombineCostume = group_rows("mstCombineCostume", MstCombineCostume)
+    mstSvtLimitAdd = group_rows("mstSvtLimitAdd", MstSvtLimitAdd)
+    mstSvtLimitImage = group_rows("mstSvtLimitImage", MstSvtLimitImage)
+    mstSvtChange = group_rows("mstSvtChange", MstSvtChange)
+    mstSvtCostume = group_rows("mstSvtCostume", MstSvtCostume)
+    mstSvtExp = group_rows("mstSvtExp", MstSvtExp, "type")
+    mstFriendship = group_rows("mstFriendship", MstFriendship, "id")
+    mstCombineMaterial = group_rows("mstCombineMaterial", MstCombineMaterial, "id")
+    mstSvtPassiveSkill = group_rows("mstSvtPassiveSkill", MstSvtPassiveSkill)
+    mstSvtExtra = group_rows("mstSvtExtra", MstSvtExtra)
+    mstSvtAppendPassiveSkill = group_rows(
+        "mstSvtAppendPassiveSkill", MstSvtAppendPassiveSkill
     )
-
+    mstSvtAppendPassiveSkillUnlock = group_rows(
+        "mstSvtAppendPassiveSkillUnlock", MstSvtAppendPassiveSkillUnlock
+    )
+    mstCombineAppendPassiveSkill = group_rows(
+        "mstCombineAppendPassiveSkill", MstCombineAppendPassiveSkill
+    )
+    mstSvtCoin = group_rows("mstSvtCoin", MstSvtCoin)
+    mstSvtAdd = group_rows("mstSvtAdd", MstSvtAdd)
+    mstSvtMultiPortrait = group_rows("mstSvtMultiPortrait", MstSvtMultiPortrait)
+    mstSvtOverwrite = group_rows("mstSvtOverwrite", MstSvtOverwrite)
+    mstSvtBattlePoint = group_rows("mstSvtBattlePoint", MstSvtBattlePoint)
+    mstSvtSkill = group_rows("mstSvtSkill", MstSvtSkill)
+    mstSvtTreasureDevice = group_rows("mstSvtTreasureDevice", MstSvtTreasureDevice)
+    all_mstSvtScript = fetch.parse_all(MstSvtScript, svt_rows["mstSvtScript"])
+
+    svt_skill_ids = {
+        svt_id: [svt_skill.skillId for svt_skill in svt_skills]
+        for svt_id, svt_skills in mstSvtSkill.items()
+    }
+    expand_skill_ids: dict[int, set[int]] = {}
     if expand:
-        extra_passive_ids = {skill.skillId for skill in mstSvtPassiveSkill}
-        append_passive_ids = {skill.skillId for skill in mstSvtAppendPassiveSkill}
-        expand_skill_ids = (
-            set(svt_entity.mstSvt.classPassive) | extra_passive_ids | append_passive_ids
-        )
-        expand_skills = {
-            skill.mstSkill.id: skill
-            for skill in await get_skill_entity_no_reverse_many(
-                conn, expand_skill_ids, expand
+        for svt_db in svt_list:
+            expand_skill_ids[svt_db.id] = (
+                set(svt_db.classPassive)
+                | {skill.skillId for skill in mstSvtPassiveSkill.get(svt_db.id, [])}
+                | {
+                    skill.skillId
+                    for skill in mstSvtAppendPassiveSkill.get(svt_db.id, [])
+                }
             )
+    all_skills = await get_skill_entity_no_reverse_many(
+        conn,
+        {
+            skill_id
+            for skill_ids in [*svt_skill_ids.values(), *expand_skill_ids.values()]
+            for skill_id in skill_ids
+        },
+        expand,
+    )
+
+    svt_td_ids: dict[int, set[int]] = {}
+    for svt_id in svt_ids:
+        svt_td_ids[svt_id] = {
+            svt_td.treasureDeviceId
+            for svt_td in mstSvtTreasureDevice.get(svt_id, [])
+            if svt_td.treasureDeviceId != EXTRA_ATTACK_TD_ID
+        } | {
+            int(overwrite.overwriteValue["overwriteTreasureDeviceId"])
+            for overwrite in mstSvtOverwrite.get(svt_id, [])
+            if overwrite.type == ServantOverwriteType.TREASURE_DEVICE
         }
-        svt_entity.mstSvt.expandedClassPassive = [
-            expand_skills[skill_id]
-            for skill_id in svt_entity.mstSvt.classPassive
-            if skill_id in expand_skills
-        ]
-        svt_entity.expandedExtraPassive = [
-            expand_skills[skill.skillId]
-            for skill in mstSvtPassiveSkill
-            if skill.skillId in expand_skills
-        ]
-        svt_entity.expandedAppendPassive = [
-            expand_skills[skill.skillId]
-            for skill in mstSvtAppendPassiveSkill
-            if skill.skillId in expand_skills
-        ]
+    all_tds = await get_td_entity_no_reverse_many(
+        conn, set().union(*svt_td_ids.values()), expand
+    )
+    td_map = {td.mstTreasureDevice.id: td for td in all_tds}
+    svt_tds = {
+        svt_id: [td_map[td_id] for td_id in td_ids if td_id in td_map]
+        for svt_id, td_ids in svt_td_ids.items()
+    }
 
-    if lore:
-        svt_entity.mstCv = await fetch.get_one(conn, MstCv, svt_db.cvId)
-        svt_entity.mstIllustrator = await fetch.get_one(
-            conn, MstIllustrator, svt_db.illustratorId
+    svt_extra_td_ids = {
+        svt_id: {
+            int(v)
+            for td in tds
+            for k, v in td.mstTreasureDevice.script.items()
+            if k.startswith("tdChangeByBattlePoint")
+        }
+        for svt_id, tds in svt_tds.items()
+    }
+    all_extra_tds = await get_td_entity_no_reverse_many(
+        conn, set().union(*svt_extra_td_ids.values()), expand
+    )
+    extra_td_map = {td.mstTreasureDevice.id: td for td in all_extra_tds}
+    skill_map = {skill.mstSkill.id: skill for skill in all_skills}
+
+    svt_item_ids: dict[int, set[int]] = {}
+    svt_common_release_ids: dict[int, set[int]] = {}
+    for svt_db in svt_list:
+        item_ids: set[int] = set()
+        for combine in (
+            mstCombineLimit.get(svt_db.combineLimitId, [])
+            + mstCombineSkill.get(svt_db.combineSkillId, [])
+            + mstCombineAppendPassiveSkill.get(svt_db.id, [])
+            + mstCombineCostume.get(svt_db.id, [])
+            + mstSvtAppendPassiveSkillUnlock.get(svt_db.id, [])
+        ):
+            item_ids.update(combine.itemIds)
+        for svt_coin in mstSvtCoin.get(svt_db.id, []):
+            item_ids.add(svt_coin.itemId)
+        svt_item_ids[svt_db.id] = item_ids
+
+        svt_common_release_ids[svt_db.id] = get_svt_common_release_ids(
+            mstSvtPassiveSkill.get(svt_db.id, []), mstSvtLimit.get(svt_db.id, [])
         )
-        svt_entity.mstSvtComment = await fetch.get_all(conn, MstSvtComment, servant_id)
-        svt_entity.mstSvtCommentAdd = await fetch.get_all(
-            conn, MstSvtCommentAdd, servant_id
+
+    battle_point_ids = {
+        bp.battlePointId for svt_bps in mstSvtBattlePoint.values() for bp in svt_bps
+    }
+
+    # The tables depending on the values of the svt tables
+    related_rows = await fetch.get_jsonb(
+        conn,
+        {
+            "mstBattlePoint": fetch.get_all_multiple_jsonb(
+                MstBattlePoint, battle_point_ids
+            ),
+            "mstBattlePointPhase": fetch.get_all_multiple_jsonb(
+                MstBattlePointPhase, battle_point_ids
+            ),
+            "mstItem": fetch.get_all_multiple_jsonb(
+                MstItem, set().union(*svt_item_ids.values())
+            ),
+            "mstCommonRelease": fetch.get_all_multiple_jsonb(
+                MstCommonRelease, set().union(*svt_common_release_ids.values())
+            ),
+        },
+    )
+    all_mstBattlePoint = fetch.parse_all(MstBattlePoint, related_rows["mstBattlePoint"])
+    all_mstBattlePointPhase = fetch.parse_all(
+        MstBattlePointPhase, related_rows["mstBattlePointPhase"]
+    )
+    all_mstItem = fetch.parse_all(MstItem, related_rows["mstItem"])
+    all_mstCommonRelease = fetch.parse_all(
+        MstCommonRelease, related_rows["mstCommonRelease"]
+    )
+    if lore:
+        mstCv = {cv.id: cv for cv in fetch.parse_all(MstCv, svt_rows["mstCv"])}
+        mstIllustrator = {
+            illustrator.id: illustrator
+            for illustrator in fetch.parse_all(
+                MstIllustrator, svt_rows["mstIllustrator"]
+            )
+        }
+        mstSvtComment = group_rows("mstSvtComment", MstSvtComment)
+        mstSvtCommentAdd = group_rows("mstSvtCommentAdd", MstSvtCommentAdd)
+
+    svt_entities: list[ServantEntity] = []
+    for svt_db in svt_list:
+        svt_id = svt_db.id
+        # Same order as the batch helpers return for a single servant
+        skill_order = {
+            skill_id: i for i, skill_id in enumerate(svt_skill_ids.get(svt_id, []))
+        }
+        bp_ids = {bp.battlePointId for bp in mstSvtBattlePoint.get(svt_id, [])}
+        common_release_ids = svt_common_release_ids[svt_id]
+        svt_entity = ServantEntity(
+            mstSvt=svt_db,
+            mstSvtIndividuality=mstSvtIndividuality.get(svt_id, []),
+            mstSvtCard=mstSvtCard.get(svt_id, []),
+            mstSvtCardAdd=mstSvtCardAdd.get(svt_id, []),
+            mstSvtLimit=mstSvtLimit.get(svt_id, []),
+            mstCombineSkill=mstCombineSkill.get(svt_db.combineSkillId, []),
+            mstCombineLimit=mstCombineLimit.get(svt_db.combineLimitId, []),
+            mstCombineCostume=mstCombineCostume.get(svt_id, []),
+            mstCombineMaterial=mstCombineMaterial.get(svt_db.combineMaterialId, []),
+            mstSvtLimitAdd=mstSvtLimitAdd.get(svt_id, []),
+            mstSvtLimitImage=mstSvtLimitImage.get(svt_id, []),
+            mstSvtChange=mstSvtChange.get(svt_id, []),
+            mstSvtPassiveSkill=mstSvtPassiveSkill.get(svt_id, []),
+            mstSvtAppendPassiveSkill=mstSvtAppendPassiveSkill.get(svt_id, []),
+            mstSvtAppendPassiveSkillUnlock=mstSvtAppendPassiveSkillUnlock.get(
+                svt_id, []
+            ),
+            mstCombineAppendPassiveSkill=mstCombineAppendPassiveSkill.get(svt_id, []),
+            mstSvtCoin=next(iter(mstSvtCoin.get(svt_id, [])), None),
+            mstSvtAdd=next(iter(mstSvtAdd.get(svt_id, [])), None),
+            mstSvtOverwrite=mstSvtOverwrite.get(svt_id, []),
+            # needed costume to get the nice limits and costume ids
+            mstSvtCostume=mstSvtCostume.get(svt_id, []),
+            # needed this to get CharaFigure available forms
+            mstSvtScript=split_svt_scripts(
+                svt_id, mstSvtLimitAdd.get(svt_id, []), all_mstSvtScript
+            ),
+            mstSvtExp=mstSvtExp.get(svt_db.expType, []),
+            mstFriendship=mstFriendship.get(svt_db.friendshipId, []),
+            mstSvtBattlePoint=mstSvtBattlePoint.get(svt_id, []),
+            mstBattlePoint=[bp for bp in all_mstBattlePoint if bp.id in bp_ids],
+            mstBattlePointPhase=[
+                phase
+                for phase in all_mstBattlePointPhase
+                if phase.battlePointId in bp_ids
+            ],
+            mstSkill=[
+                skill_map[skill_id]
+                for skill_id in sorted(skill_order, key=skill_order.__getitem__)
+                if skill_id in skill_map
+            ],
+            mstTreasureDevice=svt_tds[svt_id]
+            + [
+                extra_td_map[td_id]
+                for td_id in svt_extra_td_ids[svt_id]
+                if td_id in extra_td_map
+            ],
+            mstSvtExtra=next(iter(mstSvtExtra.get(svt_id, [])), None),
+            mstItem=sort_by_ids(all_mstItem, svt_item_ids[svt_id]),
+            mstSvtMultiPortrait=mstSvtMultiPortrait.get(svt_id, []),
+            mstCommonRelease=[
+                release
+                for release in all_mstCommonRelease
+                if release.id in common_release_ids
+            ],
         )
 
-        # Try to match order in the voice tab in game
-        voice_ids = []
+        if expand:
+            expand_skills = {
+                skill_id: skill_map[skill_id]
+                for skill_id in expand_skill_ids[svt_id]
+                if skill_id in skill_map
+            }
+            svt_entity.mstSvt.expandedClassPassive = [
+                expand_skills[skill_id]
+                for skill_id in svt_entity.mstSvt.classPassive
+                if skill_id in expand_skills
+            ]
+            svt_entity.expandedExtraPassive = [
+                expand_skills[skill.skillId]
+                for skill in svt_entity.mstSvtPassiveSkill
+                if skill.skillId in expand_skills
+            ]
+            svt_entity.expandedAppendPassive = [
+                expand_skills[skill.skillId]
+                for skill in svt_entity.mstSvtAppendPassiveSkill
+                if skill.skillId in expand_skills
+            ]
 
-        for change in svt_entity.mstSvtChange:
-            voice_ids.append(change.svtVoiceId)
+        if lore:
+            svt_entity.mstCv = mstCv.get(svt_db.cvId)
+            svt_entity.mstIllustrator = mstIllustrator.get(svt_db.illustratorId)
+            svt_entity.mstSvtComment = mstSvtComment.get(svt_id, [])
+            svt_entity.mstSvtCommentAdd = mstSvtCommentAdd.get(svt_id, [])
 
-        voice_ids.append(servant_id)
+        svt_entities.append(svt_entity)
 
-        for main_id, sub_id in (
-            (600700, 600710),  # Jekyll/Hyde
-            (800100, 800101),  # Mash
-        ):
-            if servant_id == main_id:
-                voice_ids.append(sub_id)
+    if lore:
+        await add_svt_lore_voices(conn, svt_entities)
 
-        # Moriarty deadheat summer lines use his hidden name svt_id
-        relation_svt_ids = [change.svtVoiceId for change in svt_entity.mstSvtChange] + [
-            servant_id
-        ]
-        voiceRelations = await fetch.get_all_multiple(
-            conn, MstSvtVoiceRelation, relation_svt_ids
-        )
-        for voiceRelation in voiceRelations:
-            voice_ids.append(voiceRelation.relationSvtId)
+    return svt_entities
 
-        order = {voice_id: i for i, voice_id in enumerate(voice_ids)}
-        mstSvtVoice = await svt.get_mstSvtVoice(conn, voice_ids)
-        mstSubtitle = await svt.get_mstSubtitle(conn, voice_ids)
-        mstVoicePlayCond = await svt.get_mstVoicePlayCond(conn, voice_ids)
 
-        svt_entity.mstVoice = await get_voice_from_svtVoice(conn, mstSvtVoice)
+async def get_servant_entities(
+    conn: AsyncConnection,
+    servant_ids: Iterable[int],
+    expand: bool = False,
+    lore: bool = False,
+    mstSvts: Optional[Iterable[MstSvt]] = None,
+) -> list[ServantEntity]:
+    """Servant entities of `servant_ids`, skipping the IDs without a servant.
+
+    The expanded entities are read from the entity cache built at import and
+    the missing ones are built from the master tables.
+    """
+    servant_ids = list(dict.fromkeys(servant_ids))
+    svt_entities: dict[int, ServantEntity] = {}
+    if expand and settings.entity_cache:
+        entity_type = EntityCacheType.SERVANT_LORE if lore else EntityCacheType.SERVANT
+        cached = await entity_cache.get_cached_entities(conn, entity_type, servant_ids)
+        for svt_id, jsonb in cached.items():
+            svt_entities[svt_id] = ServantEntity.model_validate(jsonb)
+
+    if missing_ids := [svt_id for svt_id in servant_ids if svt_id not in svt_entities]:
+        missing_svts = [svt for svt in mstSvts or [] if svt.id in missing_ids]
+        for svt_entity in await build_servant_entities(
+            conn, missing_ids, expand, lore, missing_svts
+        ):
+            svt_entities[svt_entity.mstSvt.id] = svt_entity
 
-        svt_entity.mstSvtGroup = await get_voice_group_from_svtVoice(conn, mstSvtVoice)
+    return [svt_entities[svt_id] for svt_id in servant_ids if svt_id in svt_entities]
 
-        svt_entity.mstSvtVoice = sorted(mstSvtVoice, key=lambda voice: order[voice.id])
-        svt_entity.mstVoicePlayCond = sorted(
-            mstVoicePlayCond, key=lambda voice: order[voice.svtId]
-        )
-        svt_entity.mstSubtitle = sorted(
-            mstSubtitle, key=lambda sub: order[sub.get_svtId()]
-        )
 
-    return svt_entity
+async def get_servant_entity(
+    conn: AsyncConnection,
+    servant_id: int,
+    expand: bool = False,
+    lore: bool = False,
+    mstSvt: Optional[MstSvt] = None,
+) -> ServantEntity:
+    svt_entities = await get_servant_entities(
+        conn, [servant_id], expand, lore, [mstSvt] if mstSvt else None
+    )
+    if not svt_entities:
+        raise HTTPException(status_code=404, detail="Svt not found")
+    return svt_entities[0]
 
 
 async def get_mystic_code_entity(
@@ -844,10 +1165,7 @@ async def get_command_code_entity(
     )
 
 
-async def get_multiple_items(
-    conn: AsyncConnection, item_ids: Iterable[int]
-) -> list[MstItem]:
-    items = await fetch.get_all_multiple(conn, MstItem, item_ids)
+def sort_by_ids(items: list[MstItem], item_ids: Iterable[int]) -> list[MstItem]:
     item_map = {item.id: item for item in items}
     out_list: list[MstItem] = []
     for item_id in item_ids:
@@ -856,6 +1174,13 @@ async def get_multiple_items(
     return out_list
 
 
+async def get_multiple_items(
+    conn: AsyncConnection, item_ids: Iterable[int]
+) -> list[MstItem]:
+    items = await fetch.get_all_multiple(conn, MstItem, item_ids)
+    return sort_by_ids(items, item_ids)
+
+
 async def get_item_entity(conn: AsyncConnection, item_id: int) -> ItemEntity:
     mstItem = await fetch.get_one(conn, MstItem, item_id)
     if not mstItem:
@@ -864,52 +1189,168 @@ async def get_item_entity(conn: AsyncConnection, item_id: int) -> ItemEntity:
     return ItemEntity(mstItem=mstItem)
 
 
-async def get_war_entity(conn: AsyncConnection, war_id: int) -> WarEntity:
-    war_db = await fetch.get_one(conn, MstWar, war_id)
-    if not war_db:
-        raise HTTPException(status_code=404, detail="War not found")
-
-    quest_selections = await fetch.get_all(conn, MstWarQuestSelection, war_id)
+async def get_war_entities(
+    conn: AsyncConnection,
+    war_ids: Iterable[int],
+    mstWars: Optional[Iterable[MstWar]] = None,
+) -> list[WarEntity]:
+    """War entities of `war_ids`, skipping the IDs without a war.
+
+    The tables of all wars are fetched together, one statement per level of
+    dependent IDs, and the quests of all their spots with one quest query.
+    """
+    war_ids = list(dict.fromkeys(war_ids))
+    war_dbs = {mstWar.id: mstWar for mstWar in mstWars or []}
+    war_jsonb = {
+        "mstWarQuestSelection": fetch.get_all_jsonb(MstWarQuestSelection, war_ids),
+        "mstMap": fetch.get_all_jsonb(MstMap, war_ids),
+        "mstWarAdd": fetch.get_all_jsonb(MstWarAdd, war_ids),
+        "mstWarRelease": fetch.get_all_multiple_jsonb(MstWarRelease, war_ids),
+    }
+    if missing_ids := [war_id for war_id in war_ids if war_id not in war_dbs]:
+        war_jsonb["mstWar"] = fetch.get_one_jsonb(MstWar, missing_ids)
+    war_rows = await fetch.get_jsonb(conn, war_jsonb)
+    for mstWar in fetch.parse_all(MstWar, war_rows.get("mstWar", [])):
+        war_dbs[mstWar.id] = mstWar
+    war_list = [war_dbs[war_id] for war_id in war_ids if war_id in war_dbs]
+    if not war_list:
+        return []
 
-    maps = await fetch.get_all(conn, MstMap, war_id)
-    map_ids = [event_map.id for event_map in maps]
+    quest_selections = fetch.group_by(
+        fetch.parse_all(MstWarQuestSelection, war_rows["mstWarQuestSelection"]),
+        "warId",
+    )
+    maps = fetch.group_by(fetch.parse_all(MstMap, war_rows["mstMap"]), "warId")
+    war_adds = fetch.group_by(
+        fetch.parse_all(MstWarAdd, war_rows["mstWarAdd"]), "warId"
+    )
+    war_releases = fetch.group_by(
+        fetch.parse_all(MstWarRelease, war_rows["mstWarRelease"]), "warId"
+    )
 
-    spots = await fetch.get_all_multiple(conn, MstSpot, map_ids)
-    blank_earth_spots = await fetch.get_all_multiple(conn, MstBlankEarthSpot, map_ids)
+    map_ids = {war_map.id for war_maps in maps.values() for war_map in war_maps}
+    bgm_ids = {war_map.bgmId for war_maps in maps.values() for war_map in war_maps}
+    bgm_ids |= {war_db.bgmId for war_db in war_list}
+    map_rows = await fetch.get_jsonb(
+        conn,
+        {
+            "mstSpot": fetch.get_all_multiple_jsonb(MstSpot, map_ids),
+            "mstBlankEarthSpot": fetch.get_all_multiple_jsonb(
+                MstBlankEarthSpot, map_ids
+            ),
+            "mstSpotRoad": fetch.get_all_multiple_jsonb(MstSpotRoad, map_ids),
+            "mstMapGimmick": fetch.get_all_multiple_jsonb(MstMapGimmick, map_ids),
+            "mstBgm": fetch.get_all_multiple_jsonb(MstBgm, bgm_ids),
+            "mstEvent": fetch.get_one_jsonb(
+                MstEvent, {war_db.eventId for war_db in war_list}
+            ),
+        },
+    )
+    all_spots = fetch.parse_all(MstSpot, map_rows["mstSpot"])
+    all_blank_earth_spots = fetch.parse_all(
+        MstBlankEarthSpot, map_rows["mstBlankEarthSpot"]
+    )
+    all_spot_roads = fetch.parse_all(MstSpotRoad, map_rows["mstSpotRoad"])
+    all_map_gimmicks = fetch.parse_all(MstMapGimmick, map_rows["mstMapGimmick"])
+    all_bgms = fetch.parse_all(MstBgm, map_rows["mstBgm"])
+    events = {
+        mstEvent.id: mstEvent
+        for mstEvent in fetch.parse_all(MstEvent, map_rows["mstEvent"])
+    }
 
-    spot_ids = [spot.id for spot in spots] + [spot.id for spot in blank_earth_spots]
-    spot_adds = await fetch.get_all_multiple(conn, MstSpotAdd, spot_ids)
+    spot_ids = [spot.id for spot in all_spots] + [
+        spot.id for spot in all_blank_earth_spots
+    ]
+    all_spot_adds = await fetch.get_all_multiple(conn, MstSpotAdd, spot_ids)
+    all_spot_quests = await quest.get_quest_by_spot(conn, spot_ids)
 
-    quests = await quest.get_quest_by_spot(conn, spot_ids)
+    quest_selection_ids = {
+        selection.questId
+        for war_selections in quest_selections.values()
+        for selection in war_selections
+    }
+    all_selection_quests = (
+        await quest.get_quest_entity(conn, quest_selection_ids)
+        if quest_selection_ids
+        else []
+    )
+    selection_spot_ids = {quest.mstQuest.spotId for quest in all_selection_quests}
+    all_selection_spots = (
+        await war.get_spot_from_ids(conn, selection_spot_ids)
+        if selection_spot_ids
+        else []
+    )
 
-    quest_selection_ids = [selection.questId for selection in quest_selections]
-    selection_quests = await quest.get_quest_entity(conn, quest_selection_ids)
-    selection_spot_ids = {quest.mstQuest.spotId for quest in selection_quests}
-    selection_spots = await war.get_spot_from_ids(conn, selection_spot_ids)
+    war_entities: list[WarEntity] = []
+    for war_db in war_list:
+        war_maps = maps.get(war_db.id, [])
+        war_map_ids = {war_map.id for war_map in war_maps}
+        war_bgm_ids = {war_map.bgmId for war_map in war_maps} | {war_db.bgmId}
+        spots = [spot for spot in all_spots if spot.mapId in war_map_ids]
+        blank_earth_spots = [
+            spot for spot in all_blank_earth_spots if spot.mapId in war_map_ids
+        ]
+        war_spot_ids = {spot.id for spot in spots} | {
+            spot.id for spot in blank_earth_spots
+        }
 
-    quests += selection_quests
-    spots += selection_spots
+        war_quest_selections = quest_selections.get(war_db.id, [])
+        war_selection_quest_ids = {
+            selection.questId for selection in war_quest_selections
+        }
+        selection_quests = [
+            quest
+            for quest in all_selection_quests
+            if quest.mstQuest.id in war_selection_quest_ids
+        ]
+        war_selection_spot_ids = {quest.mstQuest.spotId for quest in selection_quests}
+
+        war_entities.append(
+            WarEntity(
+                mstWar=war_db,
+                mstEvent=events.get(war_db.eventId),
+                mstWarAdd=war_adds.get(war_db.id, []),
+                mstMap=war_maps,
+                mstMapGimmick=[
+                    gimmick
+                    for gimmick in all_map_gimmicks
+                    if gimmick.mapId in war_map_ids
+                ],
+                mstBgm=[bgm for bgm in all_bgms if bgm.id in war_bgm_ids],
+                mstSpot=spots
+                + [
+                    spot
+                    for spot in all_selection_spots
+                    if spot.id in war_selection_spot_ids
+                ],
+                mstBlankEarthSpot=blank_earth_spots,
+                mstSpotAdd=[
+                    spot_add
+                    for spot_add in all_spot_adds
+                    if spot_add.spotId in war_spot_ids
+                ],
+                mstQuest=[
+                    quest
+                    for quest in all_spot_quests
+                    if quest.mstQuest.spotId in war_spot_ids
+                ]
+                + selection_quests,
+                mstSpotRoad=[
+                    road for road in all_spot_roads if road.mapId in war_map_ids
+                ],
+                mstWarQuestSelection=war_quest_selections,
+                mstWarRelease=war_releases.get(war_db.id, []),
+            )
+        )
 
-    bgm_ids = [war_map.bgmId for war_map in maps] + [war_db.bgmId]
-    bgms = await fetch.get_all_multiple(conn, MstBgm, bgm_ids)
+    return war_entities
 
-    spot_roads = await fetch.get_all_multiple(conn, MstSpotRoad, map_ids)
 
-    return WarEntity(
-        mstWar=war_db,
-        mstEvent=await fetch.get_one(conn, MstEvent, war_db.eventId),
-        mstWarAdd=await fetch.get_all(conn, MstWarAdd, war_id),
-        mstMap=maps,
-        mstMapGimmick=await fetch.get_all_multiple(conn, MstMapGimmick, map_ids),
-        mstBgm=bgms,
-        mstSpot=spots,
-        mstBlankEarthSpot=blank_earth_spots,
-        mstSpotAdd=spot_adds,
-        mstQuest=quests,
-        mstSpotRoad=spot_roads,
-        mstWarQuestSelection=quest_selections,
-        mstWarRelease=await fetch.get_all_multiple(conn, MstWarRelease, [war_id]),
-    )
+async def get_war_entity(conn: AsyncConnection, war_id: int) -> WarEntity:
+    war_entities = await get_war_entities(conn, [war_id])
+    if not war_entities:
+        raise HTTPException(status_code=404, detail="War not found")
+    return war_entities[0]
 
 
 def get_quest_ids_in_conds(
@@ -1035,167 +1476,173 @@ async def get_master_mission_entity(
 
 
 async def get_event_entity(conn: AsyncConnection, event_id: int) -> EventEntity:
-    mstEvent = await fetch.get_one(conn, MstEvent, event_id)
-    if not mstEvent:
-        raise HTTPException(status_code=404, detail="Event not found")
+    if settings.entity_cache:
+        cached = await entity_cache.get_cached_entities(
+            conn, EntityCacheType.EVENT, [event_id]
+        )
+        if event_id in cached:
+            return EventEntity.model_validate(cached[event_id])
 
-    missions = await fetch.get_all(conn, MstEventMission, event_id)
-    mission_ids = [mission.id for mission in missions]
+    return await build_event_entity(conn, event_id)
 
-    conds = await fetch.get_all_multiple(conn, MstEventMissionCondition, mission_ids)
-    cond_detail_ids = [
-        target_id
-        for cond in conds
-        if cond.condType == CondType.MISSION_CONDITION_DETAIL
-        for target_id in cond.targetIds
-    ]
 
-    mission_groups = await fetch.get_all_multiple(
-        conn, MstEventMissionGroup, mission_ids
+async def build_event_entity(conn: AsyncConnection, event_id: int) -> EventEntity:
+    """Event entity assembled from the master tables"""
+    # The event tables are fetched level by level, one statement per level of
+    # dependent IDs instead of one round trip per table
+    event_rows = await fetch.get_jsonb(
+        conn,
+        {
+            "mstEvent": fetch.get_one_jsonb(MstEvent, [event_id]),
+            "mstEventAdd": fetch.get_all_jsonb(MstEventAdd, [event_id]),
+            "mstWar": event.get_event_wars_jsonb(event_id),
+            "mstEventMission": fetch.get_all_jsonb(MstEventMission, [event_id]),
+            "mstBoxGacha": fetch.get_all_jsonb(MstBoxGacha, [event_id]),
+            "mstEventCommandAssist": fetch.get_all_jsonb(
+                MstEventCommandAssist, [event_id]
+            ),
+            "mstEventVoicePlay": fetch.get_all_jsonb(MstEventVoicePlay, [event_id]),
+            "mstEventRewardScene": fetch.get_all_jsonb(MstEventRewardScene, [event_id]),
+            "mstShop": fetch.get_all_jsonb(MstShop, [event_id]),
+            "mstEventReward": fetch.get_all_jsonb(MstEventReward, [event_id]),
+            "mstEventTowerReward": event.get_mstEventTowerReward_jsonb(event_id),
+            "mstTreasureBox": fetch.get_all_jsonb(MstTreasureBox, [event_id]),
+            "mstEventDigging": fetch.get_one_jsonb(MstEventDigging, [event_id]),
+            "mstEventDiggingBlock": fetch.get_all_jsonb(
+                MstEventDiggingBlock, [event_id]
+            ),
+            "mstEventDiggingReward": fetch.get_all_jsonb(
+                MstEventDiggingReward, [event_id]
+            ),
+            "mstEventCooltimeReward": fetch.get_all_jsonb(
+                MstEventCooltimeReward, [event_id]
+            ),
+            "mstEventBulletinBoard": fetch.get_all_jsonb(
+                MstEventBulletinBoard, [event_id]
+            ),
+            "mstEventRecipe": fetch.get_all_jsonb(MstEventRecipe, [event_id]),
+            "mstEventFortification": fetch.get_all_jsonb(
+                MstEventFortification, [event_id]
+            ),
+            "mstEventFortificationDetail": fetch.get_all_jsonb(
+                MstEventFortificationDetail, [event_id]
+            ),
+            "mstEventFortificationSvt": fetch.get_all_jsonb(
+                MstEventFortificationSvt, [event_id]
+            ),
+            "mstEventTradeGoods": fetch.get_all_jsonb(MstEventTradeGoods, [event_id]),
+            "mstWarBoard": fetch.get_all_jsonb(MstWarBoard, [event_id]),
+            "mstEventSvt": fetch.get_all_jsonb(MstEventSvt, [event_id]),
+            "mstEventRewardSet": fetch.get_all_jsonb(MstEventRewardSet, [event_id]),
+            "mstEventPointGroup": fetch.get_all_jsonb(MstEventPointGroup, [event_id]),
+            "mstEventPointBuff": fetch.get_all_jsonb(MstEventPointBuff, [event_id]),
+            "mstEventRandomMission": fetch.get_all_jsonb(
+                MstEventRandomMission, [event_id]
+            ),
+            "mstEventTower": fetch.get_all_jsonb(MstEventTower, [event_id]),
+            "mstEventQuestCooltime": fetch.get_all_jsonb(
+                MstEventQuestCooltime, [event_id]
+            ),
+            "mstEventTradePickup": fetch.get_all_jsonb(MstEventTradePickup, [event_id]),
+            "mstEventQuest": fetch.get_all_jsonb(MstEventQuest, [event_id]),
+            "mstEventCampaign": fetch.get_all_multiple_jsonb(
+                MstEventCampaign, [event_id]
+            ),
+            "mstHeelPortrait": fetch.get_all_jsonb(MstHeelPortrait, [event_id]),
+            "mstEventMural": fetch.get_all_jsonb(MstEventMural, [event_id]),
+            "mstEventPointActivity": fetch.get_all_jsonb(
+                MstEventPointActivity, [event_id]
+            ),
+        },
     )
+    mstEvent = next(iter(fetch.parse_all(MstEvent, event_rows["mstEvent"])), None)
+    if not mstEvent:
+        raise HTTPException(status_code=404, detail="Event not found")
 
-    cond_details = await fetch.get_all_multiple(
-        conn, MstEventMissionConditionDetail, cond_detail_ids
+    missions = fetch.parse_all(MstEventMission, event_rows["mstEventMission"])
+    box_gachas = fetch.parse_all(MstBoxGacha, event_rows["mstBoxGacha"])
+    command_assists = fetch.parse_all(
+        MstEventCommandAssist, event_rows["mstEventCommandAssist"]
     )
+    voice_plays = fetch.parse_all(MstEventVoicePlay, event_rows["mstEventVoicePlay"])
+    reward_scenes = fetch.parse_all(
+        MstEventRewardScene, event_rows["mstEventRewardScene"]
+    )
+    shops = fetch.parse_all(MstShop, event_rows["mstShop"])
+    rewards = fetch.parse_all(MstEventReward, event_rows["mstEventReward"])
+    tower_rewards = fetch.parse_all(
+        MstEventTowerReward, event_rows["mstEventTowerReward"]
+    )
+    treasure_boxes = fetch.parse_all(MstTreasureBox, event_rows["mstTreasureBox"])
+    digging = next(
+        iter(fetch.parse_all(MstEventDigging, event_rows["mstEventDigging"])), None
+    )
+    if digging:
+        digging_blocks = fetch.parse_all(
+            MstEventDiggingBlock, event_rows["mstEventDiggingBlock"]
+        )
+        digging_rewards = fetch.parse_all(
+            MstEventDiggingReward, event_rows["mstEventDiggingReward"]
+        )
+    else:
+        digging_blocks = []
+        digging_rewards = []
+    event_cooltimes = fetch.parse_all(
+        MstEventCooltimeReward, event_rows["mstEventCooltimeReward"]
+    )
+    bulletins = fetch.parse_all(
+        MstEventBulletinBoard, event_rows["mstEventBulletinBoard"]
+    )
+    recipes = fetch.parse_all(MstEventRecipe, event_rows["mstEventRecipe"])
+    fortifications = fetch.parse_all(
+        MstEventFortification, event_rows["mstEventFortification"]
+    )
+    fortification_details = fetch.parse_all(
+        MstEventFortificationDetail, event_rows["mstEventFortificationDetail"]
+    )
+    fortification_servants = fetch.parse_all(
+        MstEventFortificationSvt, event_rows["mstEventFortificationSvt"]
+    )
+    trade_goods = fetch.parse_all(MstEventTradeGoods, event_rows["mstEventTradeGoods"])
+    warboards = fetch.parse_all(MstWarBoard, event_rows["mstWarBoard"])
+    event_svts = fetch.parse_all(MstEventSvt, event_rows["mstEventSvt"])
 
-    box_gachas = await fetch.get_all(conn, MstBoxGacha, event_id)
-
+    mission_ids = [mission.id for mission in missions]
     box_gacha_base_ids = [
         base_id for box_gacha in box_gachas for base_id in box_gacha.baseIds
     ]
-    gacha_bases = await event.get_mstBoxGachaBase(conn, box_gacha_base_ids)
-
     box_gacha_talk_ids = {
         talk_id for box_gacha in box_gachas for talk_id in box_gacha.talkIds
     }
-    gacha_talks = await fetch.get_all_multiple(
-        conn, MstBoxGachaTalk, box_gacha_talk_ids
-    )
-
-    command_assists = await fetch.get_all(conn, MstEventCommandAssist, event_id)
     command_assist_release_ids = {
         command.commonReleaseId for command in command_assists
     }
     command_assist_skill_ids = {command.skillId for command in command_assists}
 
-    raw_skills = await get_skill_entity_no_reverse_many(
-        conn, command_assist_skill_ids, True
-    )
-
-    voice_plays = await fetch.get_all(conn, MstEventVoicePlay, event_id)
-
-    reward_scenes = await fetch.get_all(conn, MstEventRewardScene, event_id)
-
-    costume_limits = [
-        svt.SvtLimit(svt_id=svt_id, limit=limit)
-        for reward_scene in reward_scenes
-        for svt_id, limit in zip(
-            reward_scene.guideImageIds, reward_scene.guideLimitCounts, strict=False
-        )
-        if limit >= COSTUME_LIMIT_NO_LESS_THAN
-    ]
-    mstSvtLimitAdd = await svt.get_svt_limit_add(conn, costume_limits)
-
-    voice_ids = (
-        {voice_play.guideImageId for voice_play in voice_plays}
-        | {gacha_talk.guideImageId for gacha_talk in gacha_talks}
-        | {guide_id for scene in reward_scenes for guide_id in scene.guideImageIds}
-    )
-
-    mstSvtVoice = await svt.get_mstSvtVoice(conn, voice_ids)
-    mstVoice = await get_voice_from_svtVoice(conn, mstSvtVoice)
-    mstSvtGroup = await get_voice_group_from_svtVoice(conn, mstSvtVoice)
-    mstSubtitle = await svt.get_mstSubtitle(conn, voice_ids)
-    mstVoicePlayCond = await svt.get_mstVoicePlayCond(conn, voice_ids)
-    mstSvtExtra = await fetch.get_all_multiple(conn, MstSvtExtra, voice_ids)
-
-    shops = await fetch.get_all(conn, MstShop, event_id)
     set_item_ids = [
         set_id
         for shop in shops
         for set_id in shop.targetIds
         if shop.purchaseType == PurchaseType.SET_ITEM
     ]
-    set_items = await item.get_mstSetItem(conn, set_item_ids)
     shop_consume_ids = {
         shop.itemIds[0] for shop in shops if shop.payType == PayType.COMMON_CONSUME
     }
-
     shop_ids = [shop.id for shop in shops]
-    shop_scripts = await fetch.get_all_multiple(conn, MstShopScript, shop_ids)
-    shop_releases = await fetch.get_all_multiple(conn, MstShopRelease, shop_ids)
     shop_release_ids = {shop.freeShopCondId for shop in shops if shop.freeShopCondId}
 
-    rewards = await fetch.get_all(conn, MstEventReward, event_id)
-
-    tower_rewards = await event.get_mstEventTowerReward(conn, event_id)
-
-    treasure_boxes = await fetch.get_all(conn, MstTreasureBox, event_id)
     box_gift_ids = {box.treasureBoxGiftId for box in treasure_boxes}
-    box_gifts = await fetch.get_all_multiple(conn, MstTreasureBoxGift, box_gift_ids)
-
-    digging = await fetch.get_one(conn, MstEventDigging, event_id)
-    if digging:
-        digging_blocks = await fetch.get_all(conn, MstEventDiggingBlock, event_id)
-        digging_rewards = await fetch.get_all(conn, MstEventDiggingReward, event_id)
-        digging_gift_ids = {reward.giftId for reward in digging_rewards}
-        digging_consume_ids = {block.commonConsumeId for block in digging_blocks}
-    else:
-        digging_blocks = []
-        digging_rewards = []
-        digging_gift_ids = set()
-        digging_consume_ids = set()
-
-    event_cooltimes = await fetch.get_all(conn, MstEventCooltimeReward, event_id)
+    digging_gift_ids = {reward.giftId for reward in digging_rewards}
+    digging_consume_ids = {block.commonConsumeId for block in digging_blocks}
     cooltime_release_ids = {cooltime.commonReleaseId for cooltime in event_cooltimes}
-
-    bulletins = await fetch.get_all(conn, MstEventBulletinBoard, event_id)
     bulletin_ids = {bulletin.id for bulletin in bulletins}
-    bulletin_releases = await fetch.get_all_multiple(
-        conn, MstEventBulletinBoardRelease, bulletin_ids
-    )
-
-    recipes = await fetch.get_all(conn, MstEventRecipe, event_id)
     recipe_ids = {recipe.id for recipe in recipes}
-    recipe_gifts = await fetch.get_all_multiple(conn, MstEventRecipeGift, recipe_ids)
     recipe_release_ids = {recipe.commonReleaseId for recipe in recipes}
-
-    fortifications = await fetch.get_all(conn, MstEventFortification, event_id)
-    fortification_details = await fetch.get_all(
-        conn, MstEventFortificationDetail, event_id
-    )
-    fortification_servants = await fetch.get_all(
-        conn, MstEventFortificationSvt, event_id
-    )
     fortification_release_ids = (
         {fortification.commonReleaseId for fortification in fortifications}
         | {detail.commonReleaseId for detail in fortification_details}
         | {svt.commonReleaseId for svt in fortification_servants}
     )
-
-    trade_goods = await fetch.get_all(conn, MstEventTradeGoods, event_id)
-
-    warboards = await fetch.get_all(conn, MstWarBoard, event_id)
-    warboard_stages = await fetch.get_all_multiple(
-        conn, MstWarBoardStage, {w.id for w in warboards}
-    )
-    warboard_stage_layouts = await fetch.get_all_multiple(
-        conn, MstWarBoardStageLayout, {w.id for w in warboard_stages}
-    )
-    warboard_quests = await fetch.get_all_multiple(
-        conn, MstWarBoardQuest, {w.id for w in warboard_stages}
-    )
-    warboard_treasures = await fetch.get_all_multiple(
-        conn,
-        MstWarBoardTreasure,
-        {
-            w.effectId
-            for w in warboard_stage_layouts
-            if w.type == WarBoardStageLayoutType.TREASURE
-        },
-    )
-
-    event_svts = await fetch.get_all(conn, MstEventSvt, event_id)
     event_svt_release_ids = {svt.commonReleaseId for svt in event_svts} | {
         svt.script["addMessageCommonReleaseId"]
         for svt in event_svts
@@ -1211,10 +1658,6 @@ async def get_event_entity(conn: AsyncConnection, event_id: int) -> EventEntity:
         | shop_release_ids
         | {trade.commonReleaseId for trade in trade_goods}
     )
-    common_releases = await fetch.get_all_multiple(
-        conn, MstCommonRelease, common_release_ids
-    )
-
     common_consume_ids = (
         shop_consume_ids
         | digging_consume_ids
@@ -1222,9 +1665,150 @@ async def get_event_entity(conn: AsyncConnection, event_id: int) -> EventEntity:
         | {recipe.commonConsumeId for recipe in recipes}
         | {trade.commonConsumeId for trade in trade_goods}
     )
-    common_consumes = await fetch.get_all_multiple(
-        conn, MstCommonConsume, common_consume_ids
+    item_ids = (
+        {get_shop_cost_item_id(shop) for shop in shops}
+        | {lottery.payTargetId for lottery in box_gachas}
+        | {recipe.eventPointItemId for recipe in recipes}
+        | {trade.eventPointItemId for trade in trade_goods}
+    )
+    if digging:
+        item_ids |= {digging.eventPointItemId}
+
+    related_rows = await fetch.get_jsonb(
+        conn,
+        {
+            "mstEventMissionCondition": fetch.get_all_multiple_jsonb(
+                MstEventMissionCondition, mission_ids
+            ),
+            "mstEventMissionGroup": fetch.get_all_multiple_jsonb(
+                MstEventMissionGroup, mission_ids
+            ),
+            "mstBoxGachaBase": event.get_mstBoxGachaBase_jsonb(box_gacha_base_ids),
+            "mstBoxGachaTalk": fetch.get_all_multiple_jsonb(
+                MstBoxGachaTalk, box_gacha_talk_ids
+            ),
+            "mstSetItem": item.get_mstSetItem_jsonb(set_item_ids),
+            "mstShopScript": fetch.get_all_multiple_jsonb(MstShopScript, shop_ids),
+            "mstShopRelease": fetch.get_all_multiple_jsonb(MstShopRelease, shop_ids),
+            "mstTreasureBoxGift": fetch.get_all_multiple_jsonb(
+                MstTreasureBoxGift, box_gift_ids
+            ),
+            "mstEventBulletinBoardRelease": fetch.get_all_multiple_jsonb(
+                MstEventBulletinBoardRelease, bulletin_ids
+            ),
+            "mstEventRecipeGift": fetch.get_all_multiple_jsonb(
+                MstEventRecipeGift, recipe_ids
+            ),
+            "mstWarBoardStage": fetch.get_all_multiple_jsonb(
+                MstWarBoardStage, {w.id for w in warboards}
+            ),
+            "mstCommonRelease": fetch.get_all_multiple_jsonb(
+                MstCommonRelease, common_release_ids
+            ),
+            "mstCommonConsume": fetch.get_all_multiple_jsonb(
+                MstCommonConsume, common_consume_ids
+            ),
+            "mstItem": fetch.get_all_multiple_jsonb(MstItem, item_ids),
+        },
+    )
+    conds = fetch.parse_all(
+        MstEventMissionCondition, related_rows["mstEventMissionCondition"]
+    )
+    mission_groups = fetch.parse_all(
+        MstEventMissionGroup, related_rows["mstEventMissionGroup"]
     )
+    gacha_bases = fetch.parse_all(MstBoxGachaBase, related_rows["mstBoxGachaBase"])
+    gacha_talks = fetch.parse_all(MstBoxGachaTalk, related_rows["mstBoxGachaTalk"])
+    set_items = fetch.parse_all(MstSetItem, related_rows["mstSetItem"])
+    shop_scripts = fetch.parse_all(MstShopScript, related_rows["mstShopScript"])
+    shop_releases = fetch.parse_all(MstShopRelease, related_rows["mstShopRelease"])
+    box_gifts = fetch.parse_all(MstTreasureBoxGift, related_rows["mstTreasureBoxGift"])
+    bulletin_releases = fetch.parse_all(
+        MstEventBulletinBoardRelease, related_rows["mstEventBulletinBoardRelease"]
+    )
+    recipe_gifts = fetch.parse_all(
+        MstEventRecipeGift, related_rows["mstEventRecipeGift"]
+    )
+    warboard_stages = fetch.parse_all(
+        MstWarBoardStage, related_rows["mstWarBoardStage"]
+    )
+    common_releases = fetch.parse_all(
+        MstCommonRelease, related_rows["mstCommonRelease"]
+    )
+    common_consumes = fetch.parse_all(
+        MstCommonConsume, related_rows["mstCommonConsume"]
+    )
+    mstItem = sort_by_ids(fetch.parse_all(MstItem, related_rows["mstItem"]), item_ids)
+
+    cond_detail_ids = [
+        target_id
+        for cond in conds
+        if cond.condType == CondType.MISSION_CONDITION_DETAIL
+        for target_id in cond.targetIds
+    ]
+    voice_ids = (
+        {voice_play.guideImageId for voice_play in voice_plays}
+        | {gacha_talk.guideImageId for gacha_talk in gacha_talks}
+        | {guide_id for scene in reward_scenes for guide_id in scene.guideImageIds}
+    )
+    warboard_stage_ids = {w.id for w in warboard_stages}
+
+    detail_rows = await fetch.get_jsonb(
+        conn,
+        {
+            "mstEventMissionConditionDetail": fetch.get_all_multiple_jsonb(
+                MstEventMissionConditionDetail, cond_detail_ids
+            ),
+            "mstWarBoardStageLayout": fetch.get_all_multiple_jsonb(
+                MstWarBoardStageLayout, warboard_stage_ids
+            ),
+            "mstWarBoardQuest": fetch.get_all_multiple_jsonb(
+                MstWarBoardQuest, warboard_stage_ids
+            ),
+            "mstSvtVoice": svt.get_mstSvtVoice_jsonb(voice_ids),
+            "mstSubtitle": svt.get_mstSubtitle_jsonb(voice_ids),
+            "mstVoicePlayCond": svt.get_mstVoicePlayCond_jsonb(voice_ids),
+            "mstSvtExtra": fetch.get_all_multiple_jsonb(MstSvtExtra, voice_ids),
+        },
+    )
+    cond_details = fetch.parse_all(
+        MstEventMissionConditionDetail, detail_rows["mstEventMissionConditionDetail"]
+    )
+    warboard_stage_layouts = fetch.parse_all(
+        MstWarBoardStageLayout, detail_rows["mstWarBoardStageLayout"]
+    )
+    warboard_quests = fetch.parse_all(MstWarBoardQuest, detail_rows["mstWarBoardQuest"])
+    mstSvtVoice = fetch.parse_all(MstSvtVoice, detail_rows["mstSvtVoice"])
+    mstSubtitle = fetch.parse_all(GlobalNewMstSubtitle, detail_rows["mstSubtitle"])
+    mstVoicePlayCond = fetch.parse_all(
+        MstVoicePlayCond, detail_rows["mstVoicePlayCond"]
+    )
+    mstSvtExtra = fetch.parse_all(MstSvtExtra, detail_rows["mstSvtExtra"])
+
+    voice_detail_rows = await fetch.get_jsonb(
+        conn,
+        {
+            "mstWarBoardTreasure": fetch.get_all_multiple_jsonb(
+                MstWarBoardTreasure,
+                {
+                    w.effectId
+                    for w in warboard_stage_layouts
+                    if w.type == WarBoardStageLayoutType.TREASURE
+                },
+            ),
+            "mstVoice": fetch.get_all_multiple_jsonb(
+                MstVoice, get_base_voice_ids(mstSvtVoice)
+            ),
+            "mstSvtGroup": fetch.get_all_multiple_jsonb(
+                MstSvtGroup, get_voice_group_ids(mstSvtVoice)
+            ),
+        },
+    )
+    warboard_treasures = fetch.parse_all(
+        MstWarBoardTreasure, voice_detail_rows["mstWarBoardTreasure"]
+    )
+    mstVoice = fetch.parse_all(MstVoice, voice_detail_rows["mstVoice"])
+    mstSvtGroup = fetch.parse_all(MstSvtGroup, voice_detail_rows["mstSvtGroup"])
 
     gift_ids = (
         {shop.targetIds[0] for shop in shops if shop.purchaseType == PurchaseType.GIFT}
@@ -1252,15 +1836,19 @@ async def get_event_entity(conn: AsyncConnection, event_id: int) -> EventEntity:
 
     gifts = await fetch.get_all_multiple(conn, MstGift, gift_ids | replacement_gift_ids)
 
-    item_ids = (
-        {get_shop_cost_item_id(shop) for shop in shops}
-        | {lottery.payTargetId for lottery in box_gachas}
-        | {recipe.eventPointItemId for recipe in recipes}
-        | {trade.eventPointItemId for trade in trade_goods}
+    raw_skills = await get_skill_entity_no_reverse_many(
+        conn, command_assist_skill_ids, True
     )
-    if digging:
-        item_ids |= {digging.eventPointItemId}
-    mstItem = await get_multiple_items(conn, item_ids)
+
+    costume_limits = [
+        svt.SvtLimit(svt_id=svt_id, limit=limit)
+        for reward_scene in reward_scenes
+        for svt_id, limit in zip(
+            reward_scene.guideImageIds, reward_scene.guideLimitCounts, strict=False
+        )
+        if limit >= COSTUME_LIMIT_NO_LESS_THAN
+    ]
+    mstSvtLimitAdd = await svt.get_svt_limit_add(conn, costume_limits)
 
     bgm_ids = {reward_scene.bgmId for reward_scene in reward_scenes} | {
         reward_scene.afterBgmId for reward_scene in reward_scenes
@@ -1269,8 +1857,8 @@ async def get_event_entity(conn: AsyncConnection, event_id: int) -> EventEntity:
 
     return EventEntity(
         mstEvent=mstEvent,
-        mstEventAdd=await fetch.get_all(conn, MstEventAdd, event_id),
-        mstWar=await event.get_event_wars(conn, event_id),
+        mstEventAdd=fetch.parse_all(MstEventAdd, event_rows["mstEventAdd"]),
+        mstWar=fetch.parse_all(MstWar, event_rows["mstWar"]),
         mstEventRewardScene=reward_scenes,
         mstEventVoicePlay=voice_plays,
         mstShop=shops,
@@ -1280,17 +1868,23 @@ async def get_event_entity(conn: AsyncConnection, event_id: int) -> EventEntity:
         mstGiftAdd=gift_adds,
         mstSetItem=set_items,
         mstEventReward=rewards,
-        mstEventRewardSet=await fetch.get_all(conn, MstEventRewardSet, event_id),
-        mstEventPointGroup=await fetch.get_all(conn, MstEventPointGroup, event_id),
-        mstEventPointBuff=await fetch.get_all(conn, MstEventPointBuff, event_id),
+        mstEventRewardSet=fetch.parse_all(
+            MstEventRewardSet, event_rows["mstEventRewardSet"]
+        ),
+        mstEventPointGroup=fetch.parse_all(
+            MstEventPointGroup, event_rows["mstEventPointGroup"]
+        ),
+        mstEventPointBuff=fetch.parse_all(
+            MstEventPointBuff, event_rows["mstEventPointBuff"]
+        ),
         mstEventMission=missions,
-        mstEventRandomMission=await fetch.get_all(
-            conn, MstEventRandomMission, event_id
+        mstEventRandomMission=fetch.parse_all(
+            MstEventRandomMission, event_rows["mstEventRandomMission"]
         ),
         mstEventMissionCondition=conds,
         mstEventMissionConditionDetail=cond_details,
         mstEventMissionGroup=mission_groups,
-        mstEventTower=await fetch.get_all(conn, MstEventTower, event_id),
+        mstEventTower=fetch.parse_all(MstEventTower, event_rows["mstEventTower"]),
         mstEventTowerReward=tower_rewards,
         mstBoxGacha=box_gachas,
         mstBoxGachaBase=gacha_bases,
@@ -1301,27 +1895,29 @@ async def get_event_entity(conn: AsyncConnection, event_id: int) -> EventEntity:
         mstEventDiggingBlock=digging_blocks,
         mstEventDiggingReward=digging_rewards,
         mstEventCooltimeReward=event_cooltimes,
-        mstEventQuestCooltime=await fetch.get_all(
-            conn, MstEventQuestCooltime, event_id
+        mstEventQuestCooltime=fetch.parse_all(
+            MstEventQuestCooltime, event_rows["mstEventQuestCooltime"]
         ),
         mstEventFortification=fortifications,
         mstEventFortificationDetail=fortification_details,
         mstEventFortificationSvt=fortification_servants,
         mstEventTradeGoods=trade_goods,
-        mstEventTradePickup=await fetch.get_all(conn, MstEventTradePickup, event_id),
-        mstEventQuest=await fetch.get_all(conn, MstEventQuest, event_id),
-        mstEventCampaign=await fetch.get_all_multiple(
-            conn, MstEventCampaign, [event_id]
+        mstEventTradePickup=fetch.parse_all(
+            MstEventTradePickup, event_rows["mstEventTradePickup"]
+        ),
+        mstEventQuest=fetch.parse_all(MstEventQuest, event_rows["mstEventQuest"]),
+        mstEventCampaign=fetch.parse_all(
+            MstEventCampaign, event_rows["mstEventCampaign"]
         ),
         mstEventBulletinBoard=bulletins,
         mstEventBulletinBoardRelease=bulletin_releases,
         mstEventRecipe=recipes,
         mstEventRecipeGift=recipe_gifts,
         mstEventCommandAssist=command_assists,
-        mstHeelPortrait=await fetch.get_all(conn, MstHeelPortrait, event_id),
-        mstEventMural=await fetch.get_all(conn, MstEventMural, event_id),
-        mstEventPointActivity=await fetch.get_all(
-            conn, MstEventPointActivity, event_id
+        mstHeelPortrait=fetch.parse_all(MstHeelPortrait, event_rows["mstHeelPortrait"]),
+        mstEventMural=fetch.parse_all(MstEventMural, event_rows["mstEventMural"]),
+        mstEventPointActivity=fetch.parse_all(
+            MstEventPointActivity, event_rows["mstEventPointActivity"]
         ),
         mstEventSvt=event_svts,
         mstWarBoard=warboards,
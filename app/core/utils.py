@@ -1,14 +1,22 @@
 import re
 import string
+from collections import defaultdict
 from enum import Enum
-from typing import Any, Iterable, Literal, Optional, TypeVar, Union
+from functools import cache
+from typing import Any, Iterable, Iterator, Literal, Optional, TypeVar, Union
 
 from pydantic import HttpUrl
+from pydantic_core import Url
 
+from ..config import Settings
 from ..data.custom_mappings import TRANSLATION_OVERRIDE, TRANSLATIONS, Translation
 from ..schemas.base import HttpUrlAdapter
 from ..schemas.common import Language, NiceTrait
 from ..schemas.enums import TRAIT_NAME, Trait
+from ..schemas.nice import AssetURL
+
+
+settings = Settings()
 
 
 TValue = TypeVar("TValue")
@@ -126,8 +134,35 @@ def nullable_to_string(nullable: Optional[str]) -> str:
         return nullable
 
 
+@cache
+def check_url_template(url_fmt: str) -> None:
+    """Validate the URL template once with placeholder values.
+
+    The scheme and host of the formatted URLs come from the template so they only
+    need parsing, not the constraint checks of `HttpUrl`.
+    """
+    HttpUrlAdapter.validate_python(
+        url_fmt.format_map(defaultdict(lambda: "0", base_url=settings.asset_url))
+    )
+
+
+def get_asset_url_templates() -> Iterator[str]:
+    for name, value in vars(AssetURL).items():
+        if name.startswith("__"):
+            continue
+        if isinstance(value, str):
+            yield value
+        elif isinstance(value, dict):
+            yield from value.values()
+
+
+for asset_url_template in get_asset_url_templates():
+    check_url_template(asset_url_template)
+
+
 def fmt_url(url_fmt: str, **kwargs: Any) -> HttpUrl:
-    return HttpUrlAdapter.validate_python(url_fmt.format(**kwargs))
+    check_url_template(url_fmt)
+    return Url(url_fmt.format(**kwargs))
 
 
 TFlagEnum = TypeVar("TFlagEnum", bound=Enum)
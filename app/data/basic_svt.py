@@ -0,0 +1,183 @@
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from itertools import accumulate
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+import orjson
+
+from ..config import Settings
+from ..redis.helpers.invalidation import CacheInvalidation, on_cache_invalidation
+from ..schemas.common import Region
+from ..schemas.enums import SERVANT_TYPES
+from ..schemas.raw import MstSvt, MstSvtExtra
+
+
+settings = Settings()
+
+
+@dataclass(slots=True)
+class BasicSvtLimit:
+    limitCount: int
+    rarity: int
+    atkMax: int
+    hpMax: int
+
+
+@dataclass(slots=True)
+class BasicSvtCostume:
+    id: int
+    costumeCollectionNo: int
+    battleCharaId: int
+    shortName: str
+
+
+@dataclass(slots=True)
+class BasicSvtData:
+    """The `mstSvt` and `mstSvtExtra` fields `get_basic_svt` reads"""
+
+    svtId: int
+    collectionNo: int
+    type: int
+    flag: int
+    name: str
+    classId: int
+    attri: int
+    individuality: list[int]
+    baseSvtId: int
+    zeroLimitOverwriteName: Optional[str]
+    bondEquipOwner: Optional[int]
+    valentineEquipOwner: Optional[int]
+    costumeLimitSvtIdMap: dict[int, BasicSvtCostume]
+    limitAdds: list[tuple[int, Optional[int]]]  # (limitCount, attri)
+    limits: list[BasicSvtLimit]
+
+    def isServant(self) -> bool:
+        return self.type in SERVANT_TYPES
+
+    @classmethod
+    def from_svt_extra(cls, svtExtra: MstSvtExtra) -> "BasicSvtData":
+        mstSvt: MstSvt = svtExtra.mstSvt
+        return cls(
+            svtId=svtExtra.svtId,
+            collectionNo=mstSvt.collectionNo,
+            type=mstSvt.type,
+            flag=mstSvt.flag,
+            name=mstSvt.name,
+            classId=mstSvt.classId,
+            attri=mstSvt.attri,
+            individuality=mstSvt.individuality,
+            baseSvtId=mstSvt.baseSvtId,
+            zeroLimitOverwriteName=svtExtra.zeroLimitOverwriteName,
+            bondEquipOwner=svtExtra.bondEquipOwner,
+            valentineEquipOwner=svtExtra.valentineEquipOwner,
+            costumeLimitSvtIdMap={
+                limitCount: BasicSvtCostume(
+                    id=costume.id,
+                    costumeCollectionNo=costume.costumeCollectionNo,
+                    battleCharaId=costume.battleCharaId,
+                    shortName=costume.shortName,
+                )
+                for limitCount, costume in svtExtra.costumeLimitSvtIdMap.items()
+            },
+            limitAdds=[
+                (limitAdd.limitCount, limitAdd.attri) for limitAdd in svtExtra.limitAdds
+            ],
+            limits=[
+                BasicSvtLimit(
+                    limitCount=limit.limitCount,
+                    rarity=limit.rarity,
+                    atkMax=limit.atkMax,
+                    hpMax=limit.hpMax,
+                )
+                for limit in svtExtra.limits
+            ],
+        )
+
+    @classmethod
+    def from_json(cls, data: bytes) -> "BasicSvtData":
+        fields: dict[str, Any] = orjson.loads(data)
+        fields["costumeLimitSvtIdMap"] = {
+            int(limitCount): BasicSvtCostume(**costume)
+            for limitCount, costume in fields["costumeLimitSvtIdMap"].items()
+        }
+        fields["limitAdds"] = [tuple(limitAdd) for limitAdd in fields["limitAdds"]]
+        fields["limits"] = [BasicSvtLimit(**limit) for limit in fields["limits"]]
+        return cls(**fields)
+
+
+# File layout: header, sorted svt IDs, offsets of the records in the data section
+# and the JSON records. Both arrays are native int64 so they can be read in place.
+HEADER = struct.Struct("<8sQ")
+MAGIC = b"BSVTPK01"
+
+
+def write_basic_svt_store(path: Path, svtExtras: Iterable[MstSvtExtra]) -> None:
+    """Write the store then swap it in, the mapped old file stays readable"""
+    records = sorted(
+        (svtExtra.svtId, orjson.dumps(BasicSvtData.from_svt_extra(svtExtra)))
+        for svtExtra in svtExtras
+    )
+    svt_ids = array("q", [svt_id for svt_id, _ in records])
+    offsets = array("q", accumulate((len(record) for _, record in records), initial=0))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_suffix(".tmp")
+    with open(temp_path, "wb") as fp:
+        fp.write(HEADER.pack(MAGIC, len(svt_ids)))
+        fp.write(svt_ids.tobytes())
+        fp.write(offsets.tobytes())
+        for _, record in records:
+            fp.write(record)
+    os.replace(temp_path, path)
+
+
+class BasicSvtStore:
+    def __init__(self, path: Path) -> None:
+        with open(path, "rb") as fp:
+            self.buffer = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count = HEADER.unpack_from(self.buffer)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a basic servant store")
+        ids_start = HEADER.size
+        offsets_start = ids_start + count * 8
+        self.data_start = offsets_start + (count + 1) * 8
+        view = memoryview(self.buffer)
+        self.svt_ids = view[ids_start:offsets_start].cast("q")
+        self.offsets = view[offsets_start : self.data_start].cast("q")
+
+    def get(self, svt_id: int) -> Optional[BasicSvtData]:
+        index = bisect_left(self.svt_ids, svt_id)
+        if index == len(self.svt_ids) or self.svt_ids[index] != svt_id:
+            return None
+        start = self.data_start + self.offsets[index]
+        end = self.data_start + self.offsets[index + 1]
+        return BasicSvtData.from_json(self.buffer[start:end])
+
+
+def get_basic_svt_store_path(region: Region) -> Optional[Path]:
+    if settings.basic_svt_store_dir is None:
+        return None
+    return settings.basic_svt_store_dir / f"{region.name}_basic_svt.bin"
+
+
+_basic_svt_stores: dict[Region, Optional[BasicSvtStore]] = {}
+
+
+def get_basic_svt_store(region: Region) -> Optional[BasicSvtStore]:
+    """The region's store mapped once per worker, None if it hasn't been written"""
+    if region not in _basic_svt_stores:
+        path = get_basic_svt_store_path(region)
+        _basic_svt_stores[region] = (
+            BasicSvtStore(path) if path is not None and path.exists() else None
+        )
+    return _basic_svt_stores[region]
+
+
+@on_cache_invalidation
+def clear_basic_svt_stores(invalidation: CacheInvalidation) -> None:
+    for region in invalidation.regions:
+        _basic_svt_stores.pop(region, None)
@@ -1,8 +1,14 @@
+from itertools import count
+
+from pydantic import PostgresDsn
 from sqlalchemy import create_engine
-from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import QueuePool
 from uvicorn.logging import TRACE_LOG_LEVEL
 
-from ..config import Settings, logger
+from ..cache_tags import count_statements
+from ..config import RegionSettings, ReplicaRouting, Settings, logger
+from ..schemas.common import Region
 
 
 settings = Settings()
@@ -18,13 +24,74 @@ engines = {
     for region, region_data in settings.data.items()
 }
 
-async_engines = {
-    region: create_async_engine(
-        str(region_data.postgresdsn).replace("postgresql", "postgresql+psycopg"),
+
+def create_region_async_engine(
+    dsn: PostgresDsn, region_data: RegionSettings
+) -> AsyncEngine:
+    return create_async_engine(
+        str(dsn).replace("postgresql", "postgresql+psycopg"),
         echo=logger.isEnabledFor(TRACE_LOG_LEVEL),
-        pool_size=settings.db_pool_size,
-        max_overflow=settings.db_max_overflow,
+        pool_size=(
+            region_data.db_pool_size
+            if region_data.db_pool_size is not None
+            else settings.db_pool_size
+        ),
+        max_overflow=(
+            region_data.db_max_overflow
+            if region_data.db_max_overflow is not None
+            else settings.db_max_overflow
+        ),
         pool_pre_ping=True,
+        connect_args={"prepare_threshold": settings.db_prepare_threshold},
     )
+
+
+# Primary engines, used for the writes and the reads that must see them
+async_engines = {
+    region: create_region_async_engine(region_data.postgresdsn, region_data)
     for region, region_data in settings.data.items()
 }
+
+replica_engines = {
+    region: [
+        create_region_async_engine(replica_dsn, region_data)
+        for replica_dsn in region_data.replica_dsns
+    ]
+    for region, region_data in settings.data.items()
+}
+
+
+for async_engine in async_engines.values():
+    count_statements(async_engine.sync_engine)
+for region_replicas in replica_engines.values():
+    for replica_engine in region_replicas:
+        count_statements(replica_engine.sync_engine)
+
+
+# Region of each async engine, to key the in-process caches of DB reads
+engine_regions = {
+    async_engine.sync_engine: region for region, async_engine in async_engines.items()
+} | {
+    replica_engine.sync_engine: region
+    for region, region_replicas in replica_engines.items()
+    for replica_engine in region_replicas
+}
+
+
+_replica_counters = {region: count() for region in replica_engines}
+
+
+def get_checked_out(engine: AsyncEngine) -> int:
+    pool = engine.sync_engine.pool
+    return pool.checkedout() if isinstance(pool, QueuePool) else 0
+
+
+def get_read_engine(region: Region) -> AsyncEngine:
+    """Engine for read-only work: one of the region's replicas if there are any,
+    the primary otherwise"""
+    region_replicas = replica_engines[region]
+    if not region_replicas:
+        return async_engines[region]
+    if settings.db_replica_routing == ReplicaRouting.LEAST_BUSY:
+        return min(region_replicas, key=get_checked_out)
+    return region_replicas[next(_replica_counters[region]) % len(region_replicas)]
@@ -6,6 +6,7 @@ from sqlalchemy.sql import cast, func, select
 
 from ...models.raw import mstAi, mstAiAct, mstAiField
 from ...schemas.raw import AiEntity
+from .utils import parse_rows
 
 
 async def get_ai_entity(
@@ -45,10 +46,7 @@ async def get_ai_entity(
         .order_by(ai_table.c.id, ai_table.c.idx)
     )
     try:
-        return [
-            AiEntity.from_orm(ai_entity)
-            for ai_entity in (await conn.execute(stmt)).fetchall()
-        ]
+        return parse_rows(AiEntity, (await conn.execute(stmt)).fetchall())
     except DBAPIError:
         return []
 
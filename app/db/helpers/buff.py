@@ -6,6 +6,7 @@ from sqlalchemy.sql._typing import _ColumnExpressionArgument
 
 from ...models.raw import mstBuff
 from ...schemas.raw import MstBuff
+from .utils import parse_rows
 
 
 async def get_buff_search(
@@ -33,7 +34,4 @@ async def get_buff_search(
 
     func_search_stmt = select(mstBuff).distinct().where(and_(*where_clause))
 
-    return [
-        MstBuff.from_orm(buff)
-        for buff in (await conn.execute(func_search_stmt)).fetchall()
-    ]
+    return parse_rows(MstBuff, (await conn.execute(func_search_stmt)).fetchall())
@@ -0,0 +1,115 @@
+import hashlib
+from collections import defaultdict
+from functools import cache
+from typing import Any, Iterable
+
+import orjson
+from sqlalchemy import Table
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.sql import delete, select
+
+from ...cache_tags import FULL_CLEAR_TAG, get_row_tag, get_table_tag
+from ...models.cache import cacheTagChange, cacheTagDigest
+from ...redis.helpers.pydantic_object import pydantic_obj_redis_table
+from .fetch import (
+    schema_map_fetch_one,
+    schema_table_fetch_all,
+    schema_table_fetch_all_multiple,
+)
+from .skill import SKILL_TAG_COLUMNS
+from .td import TD_TAG_COLUMNS
+
+
+@cache
+def get_cache_tag_columns() -> dict[str, set[str]]:
+    """Columns that cached reads use as row tags, grouped by table name"""
+    tag_columns: dict[str, set[str]] = defaultdict(set)
+    for fetch_map in (
+        schema_map_fetch_one,
+        schema_table_fetch_all,
+        schema_table_fetch_all_multiple,
+    ):
+        for table, where_col, *_ in fetch_map.values():
+            tag_columns[table.name].add(str(where_col.key))
+    for column in (*SKILL_TAG_COLUMNS, *TD_TAG_COLUMNS):
+        tag_columns[column.table.name].add(column.key)
+    for redis_table, id_field in pydantic_obj_redis_table.values():
+        tag_columns[redis_table].add(id_field)
+    return tag_columns
+
+
+def get_cache_tag_digests(table_name: str, db_data: Iterable[Any]) -> dict[str, str]:
+    """Hash the table and every group of rows that shares a tag column value"""
+    tag_columns = get_cache_tag_columns().get(table_name, set())
+    table_hash = hashlib.sha1()
+    group_hashes: dict[str, Any] = {}
+
+    for row in db_data:
+        row_dump = orjson.dumps(row, default=str)
+        table_hash.update(row_dump)
+        for column in tag_columns:
+            tag = get_row_tag(table_name, column, row.get(column))
+            if tag not in group_hashes:
+                group_hashes[tag] = hashlib.sha1()
+            group_hashes[tag].update(row_dump)
+
+    digests = {tag: group_hash.hexdigest() for tag, group_hash in group_hashes.items()}
+    digests[get_table_tag(table_name)] = table_hash.hexdigest()
+    return digests
+
+
+def record_cache_tag_changes(
+    conn: Connection, table: Table, db_data: Any
+) -> None:  # pragma: no cover
+    """Compare the new table data with the last import and queue the changed tags.
+
+    The first import of a table queues a full cache clear since there's nothing
+    to compare with.
+    """
+    new_digests = get_cache_tag_digests(table.name, db_data or [])
+    old_digests: dict[str, str] = dict(
+        conn.execute(
+            select(cacheTagDigest.c.tag, cacheTagDigest.c.digest).where(
+                cacheTagDigest.c.tableName == table.name
+            )
+        ).tuples()
+    )
+
+    table_tag = get_table_tag(table.name)
+    if old_digests.get(table_tag) == new_digests[table_tag]:
+        return
+
+    if old_digests:
+        changed_tags = {
+            tag
+            for tag in old_digests.keys() | new_digests.keys()
+            if old_digests.get(tag) != new_digests.get(tag)
+        }
+    else:
+        changed_tags = {FULL_CLEAR_TAG}
+
+    conn.execute(delete(cacheTagDigest).where(cacheTagDigest.c.tableName == table.name))
+    conn.execute(
+        cacheTagDigest.insert(),
+        [
+            {"tag": tag, "tableName": table.name, "digest": digest}
+            for tag, digest in new_digests.items()
+        ],
+    )
+    conn.execute(
+        insert(cacheTagChange).on_conflict_do_nothing(),
+        [{"tag": tag} for tag in changed_tags],
+    )
+
+
+async def get_changed_cache_tags(conn: AsyncConnection) -> set[str]:
+    result = await conn.execute(select(cacheTagChange.c.tag))
+    return {tag for (tag,) in result.fetchall()}
+
+
+async def clear_changed_cache_tags(
+    conn: AsyncConnection, tags: Iterable[str]
+) -> None:  # pragma: no cover
+    await conn.execute(delete(cacheTagChange).where(cacheTagChange.c.tag.in_(tags)))
@@ -0,0 +1,166 @@
+from enum import StrEnum
+from functools import cache
+from typing import Any, Iterable
+
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.sql import delete, func, or_, select
+
+from ...cache_tags import add_cache_tags, mark_untracked, tag_statement
+from ...config import get_app_info
+from ...models.cache import entityCache
+from ...models.raw import mstEvent, mstSvt, mstSvtSkill, mstSvtTreasureDevice
+from ...redis.helpers.invalidation import CacheInvalidation, on_cache_invalidation
+from ...schemas.common import Region
+from ..engine import engine_regions
+
+
+class EntityCacheType(StrEnum):
+    # Servant entities with expand=True
+    SERVANT = "svt"
+    SERVANT_LORE = "svt_lore"
+    EVENT = "event"
+    # Nice functions of the servants' skills and NPs, by language
+    NICE_SKILL_FUNCTIONS_JP = "nice_skill_functions_jp"
+    NICE_SKILL_FUNCTIONS_EN = "nice_skill_functions_en"
+    NICE_TD_FUNCTIONS_JP = "nice_td_functions_jp"
+    NICE_TD_FUNCTIONS_EN = "nice_td_functions_en"
+
+
+def clear_entity_cache(conn: Connection) -> None:  # pragma: no cover
+    """Drop the cached entities before the master tables are overwritten.
+
+    The entities are read from the master tables until they are rebuilt.
+    """
+    entityCache.create(conn, checkfirst=True)
+    conn.execute(delete(entityCache))
+
+
+@cache
+def get_entity_cache_version() -> str:
+    """Hash of the app. The entities depend on the code and the translations shipped
+    with it so the rows built by another version aren't read."""
+    return get_app_info().hash
+
+
+def get_entity_cache_type(entity_type: EntityCacheType) -> str:
+    return f"{entity_type}@{get_entity_cache_version()}"
+
+
+# Whether the table exists in each region. It is only created by the import so
+# it is checked again after every data update.
+_entity_cache_exists: dict[Region, bool] = {}
+
+
+@on_cache_invalidation
+def clear_entity_cache_exists(invalidation: CacheInvalidation) -> None:
+    for region in invalidation.regions:
+        _entity_cache_exists.pop(region, None)
+
+
+async def has_entity_cache(conn: AsyncConnection) -> bool:
+    region = engine_regions.get(conn.sync_engine)
+    if region is not None and region in _entity_cache_exists:
+        return _entity_cache_exists[region]
+    tag_statement([])
+    exists = (
+        await conn.scalar(select(func.to_regclass(f'"{entityCache.name}"')))
+    ) is not None
+    if region is not None:
+        _entity_cache_exists[region] = exists
+    return exists
+
+
+async def get_cached_entities(
+    conn: AsyncConnection, entity_type: EntityCacheType, ids: Iterable[int]
+) -> dict[int, dict[str, Any]]:
+    """Cached entities of `ids` in the jsonb form, missing IDs are skipped.
+
+    The response depends on the rows the entities were built from so their cache
+    tags are added to the current collection. Nothing is cached if the table wasn't
+    created by an import.
+    """
+    if not await has_entity_cache(conn):
+        return {}
+    stmt = select(
+        entityCache.c.id,
+        entityCache.c.entity,
+        entityCache.c.tags,
+        entityCache.c.tracked,
+    ).where(
+        entityCache.c.type == get_entity_cache_type(entity_type),
+        entityCache.c.id.in_(ids),
+    )
+    tag_statement([])
+    cached: dict[int, dict[str, Any]] = {}
+    for row in (await conn.execute(stmt)).fetchall():
+        add_cache_tags(row.tags)
+        if not row.tracked:
+            mark_untracked()
+        cached[row.id] = row.entity
+    return cached
+
+
+async def insert_cached_entities(
+    conn: AsyncConnection, entity_type: EntityCacheType, rows: list[dict[str, Any]]
+) -> None:  # pragma: no cover
+    if rows:
+        await conn.execute(
+            entityCache.insert(),
+            [{"type": get_entity_cache_type(entity_type)} | row for row in rows],
+        )
+
+
+async def delete_cached_entities(
+    conn: AsyncConnection, entity_type: EntityCacheType
+) -> None:  # pragma: no cover
+    """Delete the rows of `entity_type` built by every app version"""
+    await conn.execute(
+        delete(entityCache).where(
+            or_(
+                entityCache.c.type == entity_type,
+                entityCache.c.type.startswith(f"{entity_type}@"),
+            )
+        )
+    )
+
+
+async def get_entity_cache_svt_ids(conn: AsyncConnection) -> list[int]:
+    """Servants and CEs, the svts served by the search endpoints and exports"""
+    stmt = select(mstSvt.c.id).where(mstSvt.c.collectionNo > 0).order_by(mstSvt.c.id)
+    return list((await conn.scalars(stmt)).all())
+
+
+async def get_entity_cache_event_ids(conn: AsyncConnection) -> list[int]:
+    stmt = select(mstEvent.c.id).order_by(mstEvent.c.id)
+    return list((await conn.scalars(stmt)).all())
+
+
+async def get_entity_cache_skill_ids(conn: AsyncConnection) -> list[int]:
+    """Skills of the servants and CEs"""
+    stmt = (
+        select(mstSvtSkill.c.skillId)
+        .distinct()
+        .where(
+            mstSvtSkill.c.svtId.in_(
+                select(mstSvt.c.id).where(mstSvt.c.collectionNo > 0)
+            )
+        )
+        .order_by(mstSvtSkill.c.skillId)
+    )
+    return list((await conn.scalars(stmt)).all())
+
+
+async def get_entity_cache_td_ids(conn: AsyncConnection) -> list[int]:
+    """NPs of the servants"""
+    stmt = (
+        select(mstSvtTreasureDevice.c.treasureDeviceId)
+        .distinct()
+        .where(
+            mstSvtTreasureDevice.c.svtId.in_(
+                select(mstSvt.c.id).where(mstSvt.c.collectionNo > 0)
+            )
+        )
+        .order_by(mstSvtTreasureDevice.c.treasureDeviceId)
+    )
+    return list((await conn.scalars(stmt)).all())
@@ -1,10 +1,11 @@
 import time
-from typing import Iterable
+from typing import Any, Iterable
 
 from sqlalchemy import Table
 from sqlalchemy.ext.asyncio import AsyncConnection
 from sqlalchemy.sql import Join, and_, or_, select, true
 from sqlalchemy.sql._typing import _ColumnExpressionArgument
+from sqlalchemy.sql.selectable import ScalarSelect
 
 from ...models.raw import (
     mstBoxGachaBase,
@@ -14,23 +15,12 @@ from ...models.raw import (
     mstShop,
     mstWar,
 )
-from ...schemas.raw import (
-    MstBoxGachaBase,
-    MstEvent,
-    MstEventTowerReward,
-    MstShop,
-    MstWar,
-)
-from .utils import fetch_one
+from ...schemas.raw import MstEvent, MstShop
+from .utils import fetch_one, parse_rows, sql_table_jsonb
 
 
-async def get_event_wars(conn: AsyncConnection, event_id: int) -> list[MstWar]:
-    mstWar_stmt = (
-        select(mstWar).where(mstWar.c.eventId == event_id).order_by(mstWar.c.id)
-    )
-    return [
-        MstWar.from_orm(war) for war in (await conn.execute(mstWar_stmt)).fetchall()
-    ]
+def get_event_wars_jsonb(event_id: int) -> ScalarSelect[Any]:
+    return sql_table_jsonb(mstWar, mstWar.c.eventId == event_id, mstWar.c.id)
 
 
 async def get_mstShop_by_id(conn: AsyncConnection, shop_id: int) -> MstShop:
@@ -38,32 +28,22 @@ async def get_mstShop_by_id(conn: AsyncConnection, shop_id: int) -> MstShop:
     return MstShop.from_orm(await fetch_one(conn, mstShop_stmt))
 
 
-async def get_mstEventTowerReward(
-    conn: AsyncConnection, event_id: int
-) -> list[MstEventTowerReward]:
-    mstEventTowerReward_stmt = (
-        select(mstEventTowerReward)
-        .where(mstEventTowerReward.c.eventId == event_id)
-        .order_by(mstEventTowerReward.c.towerId, mstEventTowerReward.c.floor)
+def get_mstEventTowerReward_jsonb(event_id: int) -> ScalarSelect[Any]:
+    return sql_table_jsonb(
+        mstEventTowerReward,
+        mstEventTowerReward.c.eventId == event_id,
+        mstEventTowerReward.c.towerId,
+        mstEventTowerReward.c.floor,
     )
-    return [
-        MstEventTowerReward.from_orm(tower_reward)
-        for tower_reward in (await conn.execute(mstEventTowerReward_stmt)).fetchall()
-    ]
-
-
-async def get_mstBoxGachaBase(
-    conn: AsyncConnection, box_gacha_base_ids: Iterable[int]
-) -> list[MstBoxGachaBase]:
-    mstBoxGachaBase_stmt = (
-        select(mstBoxGachaBase)
-        .where(mstBoxGachaBase.c.id.in_(box_gacha_base_ids))
-        .order_by(mstBoxGachaBase.c.id, mstBoxGachaBase.c.no)
+
+
+def get_mstBoxGachaBase_jsonb(box_gacha_base_ids: Iterable[int]) -> ScalarSelect[Any]:
+    return sql_table_jsonb(
+        mstBoxGachaBase,
+        mstBoxGachaBase.c.id.in_(box_gacha_base_ids),
+        mstBoxGachaBase.c.id,
+        mstBoxGachaBase.c.no,
     )
-    return [
-        MstBoxGachaBase.from_orm(box_gacha_base)
-        for box_gacha_base in (await conn.execute(mstBoxGachaBase_stmt)).fetchall()
-    ]
 
 
 async def get_shop_search(
@@ -86,10 +66,7 @@ async def get_shop_search(
         select(mstShop).distinct().select_from(from_clause).where(and_(*where_clause))
     )
 
-    return [
-        MstShop.from_orm(shop)
-        for shop in (await conn.execute(shop_search_stmt)).fetchall()
-    ]
+    return parse_rows(MstShop, (await conn.execute(shop_search_stmt)).fetchall())
 
 
 async def get_event_search(
@@ -123,7 +100,4 @@ async def get_event_search(
         select(mstEvent).distinct().select_from(from_clause).where(and_(*where_clause))
     )
 
-    return [
-        MstEvent.model_validate(event)
-        for event in (await conn.execute(event_search_stmt)).fetchall()
-    ]
+    return parse_rows(MstEvent, (await conn.execute(event_search_stmt)).fetchall())
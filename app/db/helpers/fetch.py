@@ -1,10 +1,15 @@
-from typing import Iterable, Optional, Type, TypeVar, Union
+from collections import defaultdict
+from functools import cache
+from typing import Any, Iterable, Optional, Type, TypeVar, Union
 
-from sqlalchemy import Table
+from sqlalchemy import Table, bindparam
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncConnection
-from sqlalchemy.sql import ColumnElement, select
+from sqlalchemy.sql import ColumnElement, Select, func, select
+from sqlalchemy.sql.selectable import ScalarSelect
 
+from ...cache_tags import add_cache_tags, get_row_tag, get_table_tag, tag_statement
 from ...models.raw import (
     AssetStorage,
     mstBattleMasterImage,
@@ -268,7 +273,18 @@ from ...schemas.raw import (
     MstWarQuestSelection,
     MstWarRelease,
 )
-from .utils import fetch_one
+from .master_store import (
+    get_master_rows,
+    get_master_rows_multiple,
+    register_master_index,
+)
+from .row_cache import (
+    get_cached_rows,
+    get_row_cache_prefix,
+    get_row_cache_region,
+    set_cached_rows,
+)
+from .utils import get_list_adapter, parse_row, parse_rows
 
 
 schema_map_fetch_one: dict[  # type:ignore
@@ -304,20 +320,65 @@ schema_map_fetch_one: dict[  # type:ignore
 TFetchOne = TypeVar("TFetchOne", bound=BaseModelORJson)
 
 
+# The fetch statements are built once per schema and reuse the compiled SQL through
+# SQLAlchemy's compiled cache, the IDs are sent as parameters.
+@cache
+def get_one_stmt(schema: Type[BaseModelORJson]) -> Select[Any]:
+    table, where_col = schema_map_fetch_one[schema]
+    return select(table).where(where_col == bindparam("where_id")).limit(1)
+
+
 async def get_one(
     conn: AsyncConnection, schema: Type[TFetchOne], where_id: Union[int, str]
 ) -> Optional[TFetchOne]:
     table, where_col = schema_map_fetch_one[schema]
-    stmt = select(table).where(where_col == where_id)
+    # A statement is only counted as tagged when it runs, not on the cache hits
+    add_cache_tags([get_row_tag(table.name, str(where_col.key), where_id)])
+    master_rows = get_master_rows(conn, table, where_col, [], where_id)
+    if master_rows is not None:
+        entities = get_list_adapter(schema).validate_json(master_rows)
+        return entities[0] if entities else None
+
+    cache_region = get_row_cache_region(conn, table)
+    if cache_region is not None:
+        cache_prefix = get_row_cache_prefix(cache_region)
+        cached, _ = get_cached_rows(cache_prefix, schema, [where_id])
+        if where_id in cached:
+            return cached[where_id][0] if cached[where_id] else None
+
     try:
-        entity_db = await fetch_one(conn, stmt)
+        tag_statement([])
+        result = await conn.execute(get_one_stmt(schema), {"where_id": where_id})
+        entity_db = result.first()
     except DBAPIError:
         return None
 
-    if entity_db:
-        return schema.from_orm(entity_db)
+    entity = parse_row(schema, entity_db) if entity_db else None
+    if cache_region is not None:
+        set_cached_rows(cache_prefix, schema, {where_id: [entity] if entity else []})
+    return entity
+
 
-    return None
+def get_one_jsonb(
+    schema: Type[BaseModelORJson], where_ids: Iterable[Union[int, str]]
+) -> ScalarSelect[Any]:
+    """`get_one` of several IDs as a subquery returning a jsonb array, see
+    `get_jsonb`"""
+    table, where_col = schema_map_fetch_one[schema]
+    where_ids = list(where_ids)
+    add_cache_tags(
+        get_row_tag(table.name, str(where_col.key), where_id) for where_id in where_ids
+    )
+    return (
+        select(
+            func.coalesce(
+                func.jsonb_agg(aggregate_order_by(table.table_valued(), where_col)),  # type: ignore[no-untyped-call]
+                func.jsonb_build_array(),
+            )
+        )
+        .where(where_col.in_(where_ids))
+        .scalar_subquery()
+    )
 
 
 schema_table_fetch_all: dict[  # type:ignore
@@ -588,13 +649,48 @@ schema_table_fetch_all: dict[  # type:ignore
 TFetchAll = TypeVar("TFetchAll", bound=BaseModelORJson)
 
 
+@cache
+def get_all_stmt(schema: Type[BaseModelORJson]) -> Select[Any]:
+    table, where_col, order_col = schema_table_fetch_all[schema]
+    return select(table).where(where_col == bindparam("where_id")).order_by(order_col)
+
+
 async def get_all(
     conn: AsyncConnection, schema: Type[TFetchAll], where_id: int
 ) -> list[TFetchAll]:
     table, where_col, order_col = schema_table_fetch_all[schema]
-    stmt = select(table).where(where_col == where_id).order_by(order_col)
-    result = await conn.execute(stmt)
-    return [schema.from_orm(db_row) for db_row in result.fetchall()]
+    add_cache_tags([get_row_tag(table.name, str(where_col.key), where_id)])
+    master_rows = get_master_rows(conn, table, where_col, [order_col], where_id)
+    if master_rows is not None:
+        return get_list_adapter(schema).validate_json(master_rows)
+
+    tag_statement([])
+    result = await conn.execute(get_all_stmt(schema), {"where_id": where_id})
+    return parse_rows(schema, result.fetchall())
+
+
+def get_all_jsonb(
+    schema: Type[BaseModelORJson], where_ids: Iterable[int]
+) -> ScalarSelect[Any]:
+    """`get_all` of several IDs as a subquery returning a jsonb array, see
+    `get_jsonb`"""
+    table, where_col, order_col = schema_table_fetch_all[schema]
+    where_ids = list(where_ids)
+    add_cache_tags(
+        get_row_tag(table.name, str(where_col.key), where_id) for where_id in where_ids
+    )
+    return (
+        select(
+            func.coalesce(
+                func.jsonb_agg(
+                    aggregate_order_by(table.table_valued(), where_col, order_col)  # type: ignore[no-untyped-call]
+                ),
+                func.jsonb_build_array(),
+            )
+        )
+        .where(where_col.in_(where_ids))
+        .scalar_subquery()
+    )
 
 
 schema_table_fetch_all_multiple: dict[  # type:ignore
@@ -791,6 +887,16 @@ schema_table_fetch_all_multiple: dict[  # type:ignore
 TFetchAllMultiple = TypeVar("TFetchAllMultiple", bound=BaseModelORJson)
 
 
+@cache
+def get_all_multiple_stmt(schema: Type[BaseModelORJson]) -> Select[Any]:
+    table, where_col, order_col = schema_table_fetch_all_multiple[schema]
+    return (
+        select(table)
+        .where(where_col.in_(bindparam("where_ids", expanding=True)))
+        .order_by(*order_col)
+    )
+
+
 async def get_all_multiple(
     conn: AsyncConnection,
     schema: Type[TFetchAllMultiple],
@@ -798,10 +904,99 @@ async def get_all_multiple(
 ) -> list[TFetchAllMultiple]:
     if not where_ids:
         return []
+    where_ids = list(where_ids)
     table, where_col, order_col = schema_table_fetch_all_multiple[schema]
-    stmt = select(table).where(where_col.in_(where_ids)).order_by(*order_col)
+    add_cache_tags(
+        get_row_tag(table.name, str(where_col.key), where_id) for where_id in where_ids
+    )
+    master_rows = get_master_rows_multiple(conn, table, where_col, order_col, where_ids)
+    if master_rows is not None:
+        return get_list_adapter(schema).validate_python(master_rows)
+
+    cache_region = get_row_cache_region(conn, table)
+    # The cached rows are put back in order of their IDs
+    if cache_region is None or [col.key for col in order_col] != [where_col.key]:
+        tag_statement([])
+        result = await conn.execute(
+            get_all_multiple_stmt(schema), {"where_ids": where_ids}
+        )
+        return parse_rows(schema, result.fetchall())
+
+    cache_prefix = get_row_cache_prefix(cache_region)
+    unique_ids = {str(where_id): where_id for where_id in where_ids}
+    cached, missing_ids = get_cached_rows(cache_prefix, schema, unique_ids.values())
+    rows_by_id = {str(where_id): rows for where_id, rows in cached.items()}
+    if missing_ids:
+        tag_statement([])
+        result = await conn.execute(
+            get_all_multiple_stmt(schema), {"where_ids": missing_ids}
+        )
+        fetched = group_by(parse_rows(schema, result.fetchall()), str(where_col.key))
+        missing_rows: dict[str, list[TFetchAllMultiple]] = {
+            str(where_id): [] for where_id in missing_ids
+        } | {str(where_id): rows for where_id, rows in fetched.items()}
+        set_cached_rows(cache_prefix, schema, missing_rows)
+        rows_by_id |= missing_rows
+
+    return [
+        row
+        for where_id in sorted(unique_ids.values())
+        for row in rows_by_id[str(where_id)]
+    ]
+
+
+def get_all_multiple_jsonb(
+    schema: Type[BaseModelORJson],
+    where_ids: Iterable[Union[int, str]] | Select[Any],
+) -> ScalarSelect[Any]:
+    """`get_all_multiple` as a subquery returning a jsonb array, see `get_jsonb`.
+
+    `where_ids` can be a subquery. The caller must then tag the fetched rows.
+    """
+    table, where_col, order_col = schema_table_fetch_all_multiple[schema]
+    if not isinstance(where_ids, Select):
+        where_ids = list(where_ids)
+        add_cache_tags(
+            get_row_tag(table.name, str(where_col.key), where_id)
+            for where_id in where_ids
+        )
+    return (
+        select(
+            func.coalesce(
+                func.jsonb_agg(aggregate_order_by(table.table_valued(), *order_col)),  # type: ignore[no-untyped-call]
+                func.jsonb_build_array(),
+            )
+        )
+        .where(where_col.in_(where_ids))
+        .scalar_subquery()
+    )
+
+
+async def get_jsonb(
+    conn: AsyncConnection, subqueries: dict[str, ScalarSelect[Any]]
+) -> dict[str, Any]:
+    """Run the jsonb subqueries in one statement instead of one round trip each.
+
+    Every subquery must have been tagged since the statement counts as tagged.
+    """
+    stmt = select(*(subquery.label(name) for name, subquery in subqueries.items()))
+    tag_statement([])
     result = await conn.execute(stmt)
-    return [schema.from_orm(db_row) for db_row in result.fetchall()]
+    return dict(result.one()._mapping)
+
+
+def parse_all(
+    schema: Type[TFetchAll], jsonb_rows: list[dict[str, Any]]
+) -> list[TFetchAll]:
+    return get_list_adapter(schema).validate_python(jsonb_rows)
+
+
+def group_by(rows: Iterable[TFetchAll], field: str) -> dict[Any, list[TFetchAll]]:
+    """Group the rows by the value of `field`, keeping their order"""
+    groups: dict[Any, list[TFetchAll]] = defaultdict(list)
+    for row in rows:
+        groups[getattr(row, field)].append(row)
+    return groups
 
 
 schema_map_fetch_everything: dict[  # type:ignore
@@ -827,11 +1022,33 @@ schema_map_fetch_everything: dict[  # type:ignore
 TFetchEverything = TypeVar("TFetchEverything", bound=BaseModelORJson)
 
 
+@cache
+def get_everything_stmt(schema: Type[BaseModelORJson]) -> Select[Any]:
+    table, order_col = schema_map_fetch_everything[schema]
+    return select(table).order_by(order_col)
+
+
 async def get_everything(
     conn: AsyncConnection, schema: Type[TFetchEverything]
 ) -> list[TFetchEverything]:  # pragma: no cover
     table, order_col = schema_map_fetch_everything[schema]
-    stmt = select(table).order_by(order_col)
-    entities_db = (await conn.execute(stmt)).fetchall()
+    add_cache_tags([get_table_tag(table.name)])
+    master_rows = get_master_rows(conn, table, None, [order_col], None)
+    if master_rows is not None:
+        return get_list_adapter(schema).validate_json(master_rows)
+
+    tag_statement([])
+    entities_db = (await conn.execute(get_everything_stmt(schema))).fetchall()
+
+    return parse_rows(schema, entities_db)
+
 
-    return [schema.from_orm(entity) for entity in entities_db]
+# Index the master stores by the lookups above
+for table, where_col in schema_map_fetch_one.values():
+    register_master_index(table, where_col)
+for table, where_col, order_col in schema_table_fetch_all.values():
+    register_master_index(table, where_col, [order_col])
+for table, where_col, order_cols in schema_table_fetch_all_multiple.values():
+    register_master_index(table, where_col, order_cols)
+for table, order_col in schema_map_fetch_everything.values():
+    register_master_index(table, None, [order_col])
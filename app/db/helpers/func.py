@@ -6,6 +6,7 @@ from sqlalchemy.sql._typing import _ColumnExpressionArgument
 
 from ...models.raw import mstFunc
 from ...schemas.raw import MstFunc
+from .utils import parse_rows
 
 
 async def get_func_search(
@@ -43,7 +44,4 @@ async def get_func_search(
 
     func_search_stmt = select(mstFunc).distinct().where(and_(*where_clause))
 
-    return [
-        MstFunc.from_orm(func)
-        for func in (await conn.execute(func_search_stmt)).fetchall()
-    ]
+    return parse_rows(MstFunc, (await conn.execute(func_search_stmt)).fetchall())
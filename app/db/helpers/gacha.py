@@ -3,7 +3,7 @@ from sqlalchemy.sql import func, select
 
 from ...models.raw import mstGacha, mstGachaStoryAdjust, viewGachaFeaturedSvt
 from ...schemas.raw import GachaEntity
-from .utils import sql_jsonb_agg
+from .utils import parse_row, parse_rows, sql_jsonb_agg
 
 
 SELECT_GACHA_ENTITY = select(
@@ -24,7 +24,7 @@ async def get_gacha_entity(conn: AsyncConnection, gacha_id: int) -> GachaEntity
     res = (await conn.execute(stmt)).fetchone()
 
     if res is not None:
-        return GachaEntity.from_orm(res)
+        return parse_row(GachaEntity, res)
     else:
         return None
 
@@ -32,6 +32,4 @@ async def get_gacha_entity(conn: AsyncConnection, gacha_id: int) -> GachaEntity
 async def get_all_gacha_entities(conn: AsyncConnection) -> list[GachaEntity]:
     stmt = SELECT_GACHA_ENTITY.group_by(mstGacha.table_valued())
 
-    return [
-        GachaEntity.from_orm(gacha) for gacha in ((await conn.execute(stmt)).fetchall())
-    ]
+    return parse_rows(GachaEntity, (await conn.execute(stmt)).fetchall())
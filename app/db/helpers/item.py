@@ -1,12 +1,20 @@
-from typing import Iterable, Optional
+from typing import Any, Iterable, Optional
 
 from sqlalchemy.ext.asyncio import AsyncConnection
 from sqlalchemy.sql import and_, select, true
 from sqlalchemy.sql._typing import _ColumnExpressionArgument
+from sqlalchemy.sql.selectable import ScalarSelect
 
 from ...models.raw import mstItem, mstSetItem
 from ...schemas.enums import NiceItemUse
 from ...schemas.raw import MstItem, MstSetItem
+from .utils import parse_rows, sql_table_jsonb
+
+
+def get_mstSetItem_jsonb(set_item_ids: Iterable[int]) -> ScalarSelect[Any]:
+    return sql_table_jsonb(
+        mstSetItem, mstSetItem.c.id.in_(set_item_ids), mstSetItem.c.id
+    )
 
 
 async def get_mstSetItem(
@@ -17,10 +25,7 @@ async def get_mstSetItem(
         .where(mstSetItem.c.id.in_(set_item_ids))
         .order_by(mstSetItem.c.id)
     )
-    return [
-        MstSetItem.from_orm(set_item)
-        for set_item in (await conn.execute(mstSetItem_stmt)).fetchall()
-    ]
+    return parse_rows(MstSetItem, (await conn.execute(mstSetItem_stmt)).fetchall())
 
 
 async def get_item_search(
@@ -49,7 +54,4 @@ async def get_item_search(
 
     item_search_stmt = select(mstItem).distinct().where(and_(*where_clause))
 
-    return [
-        MstItem.from_orm(item)
-        for item in (await conn.execute(item_search_stmt)).fetchall()
-    ]
+    return parse_rows(MstItem, (await conn.execute(item_search_stmt)).fetchall())
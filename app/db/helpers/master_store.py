@@ -0,0 +1,160 @@
+import asyncio
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+import orjson
+from sqlalchemy import Table
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.sql import ColumnElement
+
+from ...config import Settings, logger
+from ...models.raw import TABLES_TO_BE_LOADED
+from ...redis.helpers.invalidation import CacheInvalidation, on_cache_invalidation
+from ...schemas.common import Region
+from ..engine import engine_regions
+
+
+settings = Settings()
+
+
+# Tables imported unchanged from the master folder, the others are transformed by
+# `update_db` and can only be read from PostgreSQL
+SUPPORTED_TABLES = {table.name for group in TABLES_TO_BE_LOADED for table in group}
+
+# Column the rows are looked up with, None for whole table reads
+IndexKey = tuple[Optional[str], tuple[str, ...]]
+_index_specs: dict[str, set[IndexKey]] = defaultdict(set)
+
+
+def register_master_index(
+    table: Table,
+    where_col: ColumnElement[Any] | None,
+    order_cols: Iterable[ColumnElement[Any]] = (),
+) -> None:
+    """Declare a lookup the fetch helpers do so the stores index the table by it"""
+    where_key = str(where_col.key) if where_col is not None else None
+    order_keys = tuple(str(col.key) for col in order_cols)
+    _index_specs[table.name].add((where_key, order_keys))
+
+
+def get_sort_key(order_keys: tuple[str, ...]) -> Any:
+    # Same order as PostgreSQL: NULLs last
+    return lambda row: tuple((row.get(key) is None, row.get(key)) for key in order_keys)
+
+
+class MasterStore:
+    """Master tables of a region kept in process memory.
+
+    The rows of each looked up value are packed as one JSON array, sorted like the
+    SQL query of the fetch helper, and validated straight from the bytes.
+    """
+
+    def __init__(self) -> None:
+        self.indexes: dict[str, dict[IndexKey, dict[Any, bytes]]] = {}
+
+    def add_table(self, table_name: str, rows: list[dict[str, Any]]) -> None:
+        table_indexes: dict[IndexKey, dict[Any, bytes]] = {}
+        for index_key in _index_specs[table_name]:
+            where_key, order_keys = index_key
+            groups: dict[Any, list[dict[str, Any]]] = defaultdict(list)
+            for row in rows:
+                groups[row.get(where_key) if where_key else None].append(row)
+            table_indexes[index_key] = {
+                value: orjson.dumps(sorted(group, key=get_sort_key(order_keys)))
+                for value, group in groups.items()
+            }
+        self.indexes[table_name] = table_indexes
+
+    def get_rows(
+        self, table_name: str, index_key: IndexKey, where_id: Any
+    ) -> Optional[bytes]:
+        """JSON array of the matching rows, None if the table isn't stored"""
+        table_indexes = self.indexes.get(table_name)
+        if table_indexes is None or index_key not in table_indexes:
+            return None
+        return table_indexes[index_key].get(where_id, b"[]")
+
+    @classmethod
+    def load(cls, master_folder: Path, table_names: Iterable[str]) -> "MasterStore":
+        store = cls()
+        for table_name in table_names:
+            table_json = master_folder / f"{table_name}.json"
+            rows = orjson.loads(table_json.read_bytes()) if table_json.exists() else []
+            store.add_table(table_name, rows)
+        return store
+
+
+master_stores: dict[Region, MasterStore] = {}
+_reload_tasks: dict[Region, asyncio.Task[None]] = {}
+
+
+def get_master_store_tables() -> list[str]:
+    unsupported = set(settings.memory_master_tables) - SUPPORTED_TABLES
+    if unsupported:
+        logger.warning(f"Can't keep {', '.join(sorted(unsupported))} in memory")
+    return [name for name in settings.memory_master_tables if name in SUPPORTED_TABLES]
+
+
+def load_master_store(region: Region) -> None:  # pragma: no cover
+    start_loading_time = time.perf_counter()
+    master_folder = settings.data[region].gamedata / "master"
+    master_stores[region] = MasterStore.load(master_folder, get_master_store_tables())
+    loading_time = time.perf_counter() - start_loading_time
+    logger.info(f"Loaded {region} master store in {loading_time:.2f}s.")
+
+
+async def reload_master_stores(regions: Iterable[Region]) -> None:  # pragma: no cover
+    """Load the stores in a thread, the reads use PostgreSQL in the meantime"""
+    for region in regions:
+        master_stores.pop(region, None)
+        if previous_task := _reload_tasks.pop(region, None):
+            previous_task.cancel()
+        _reload_tasks[region] = asyncio.create_task(
+            asyncio.to_thread(load_master_store, region)
+        )
+
+
+@on_cache_invalidation
+def clear_master_stores(invalidation: CacheInvalidation) -> None:
+    if not settings.memory_master_tables:
+        return
+    asyncio.get_running_loop().create_task(reload_master_stores(invalidation.regions))
+
+
+def get_master_rows(
+    conn: AsyncConnection,
+    table: Table,
+    where_col: ColumnElement[Any] | None,
+    order_cols: Iterable[ColumnElement[Any]],
+    where_id: Any,
+) -> Optional[bytes]:
+    """Rows of the fetch helper lookup from the region's master store, None if it
+    has to be read from the DB"""
+    if not master_stores:
+        return None
+    region = engine_regions.get(conn.sync_engine)
+    if region is None or (store := master_stores.get(region)) is None:
+        return None
+    where_key = str(where_col.key) if where_col is not None else None
+    index_key = (where_key, tuple(str(col.key) for col in order_cols))
+    return store.get_rows(table.name, index_key, where_id)
+
+
+def get_master_rows_multiple(
+    conn: AsyncConnection,
+    table: Table,
+    where_col: ColumnElement[Any],
+    order_cols: list[ColumnElement[Any]],
+    where_ids: Iterable[Any],
+) -> Optional[list[dict[str, Any]]]:
+    """`get_master_rows` of several IDs, sorted across the IDs"""
+    rows: list[dict[str, Any]] = []
+    for where_id in set(where_ids):
+        id_rows = get_master_rows(conn, table, where_col, order_cols, where_id)
+        if id_rows is None:
+            return None
+        rows += orjson.loads(id_rows)
+    order_keys = tuple(str(col.key) for col in order_cols)
+    return sorted(rows, key=get_sort_key(order_keys))
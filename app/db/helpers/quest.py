@@ -67,7 +67,7 @@ from ...schemas.raw import (
     QuestEntity,
     QuestPhaseEntity,
 )
-from .utils import fetch_one, sql_jsonb_agg
+from .utils import fetch_one, parse_row, parse_rows, sql_jsonb_agg
 
 
 QUEST_WITH_WAR_SELECT = select(
@@ -93,7 +93,7 @@ async def get_one_quest_with_war(
         return None
 
     if mstQuestWar:
-        return MstQuestWithWar.from_orm(mstQuestWar)
+        return parse_row(MstQuestWithWar, mstQuestWar)
 
     return None
 
@@ -103,10 +103,7 @@ async def get_many_quests_with_war(
 ) -> list[MstQuestWithWar]:
     stmt = QUEST_WITH_WAR_SELECT.where(mstQuest.c.id.in_(quest_ids))
 
-    return [
-        MstQuestWithWar.from_orm(quest)
-        for quest in (await conn.execute(stmt)).fetchall()
-    ]
+    return parse_rows(MstQuestWithWar, (await conn.execute(stmt)).fetchall())
 
 
 MSTQUEST_WITH_PHASE_SELECT = select(
@@ -148,7 +145,7 @@ async def get_one_quest_with_phase(
         return None
 
     if mstQuestWithPhase:
-        return MstQuestWithPhase.from_orm(mstQuestWithPhase)
+        return parse_row(MstQuestWithPhase, mstQuestWithPhase)
 
     return None
 
@@ -176,7 +173,7 @@ async def get_latest_quest_with_enemies(
 
     rows = (await conn.execute(stmt)).fetchall()
 
-    return [MstQuestWithPhase.from_orm(row) for row in rows]
+    return parse_rows(MstQuestWithPhase, rows)
 
 
 async def get_quest_phase_search(
@@ -405,10 +402,9 @@ async def get_quest_phase_search(
         .where(and_(*where_clause))
     )
 
-    return [
-        MstQuestWithPhase.from_orm(quest)
-        for quest in (await conn.execute(quest_search_stmt)).fetchall()
-    ]
+    return parse_rows(
+        MstQuestWithPhase, (await conn.execute(quest_search_stmt)).fetchall()
+    )
 
 
 scripts_cte = select(
@@ -543,10 +539,7 @@ async def get_quest_entity(
     )
 
     try:
-        return [
-            QuestEntity.from_orm(quest)
-            for quest in (await conn.execute(stmt)).fetchall()
-        ]
+        return parse_rows(QuestEntity, (await conn.execute(stmt)).fetchall())
     except DBAPIError:
         return []
 
@@ -567,9 +560,7 @@ async def get_quest_by_spot(
         .where(where_cond)
         .group_by(mstQuest.c.id)
     )
-    return [
-        QuestEntity.from_orm(quest) for quest in (await conn.execute(stmt)).fetchall()
-    ]
+    return parse_rows(QuestEntity, (await conn.execute(stmt)).fetchall())
 
 
 async def get_quest_phase_entity(
@@ -812,7 +803,7 @@ async def get_stage_remap(
         )
     )
     stage_remaps = (await conn.execute(stmt)).fetchall()
-    return [MstStageRemap.from_orm(stage_remap) for stage_remap in stage_remaps]
+    return parse_rows(MstStageRemap, stage_remaps)
 
 
 async def get_remapped_stages(
@@ -827,7 +818,7 @@ async def get_remapped_stages(
         for stage_remap in stage_remaps
     ]
     stmt = select(mstStage).where(or_(false(), *remapped_conditions))
-    return [MstStage.from_orm(stage) for stage in (await conn.execute(stmt)).fetchall()]
+    return parse_rows(MstStage, (await conn.execute(stmt)).fetchall())
 
 
 async def get_bgm_from_stage(
@@ -835,7 +826,7 @@ async def get_bgm_from_stage(
 ) -> list[MstBgm]:
     bgm_ids = [stage.bgmId for stage in stages]
     stmt = select(mstBgm).where(mstBgm.c.id.in_(bgm_ids))
-    return [MstBgm.from_orm(bgm) for bgm in (await conn.execute(stmt)).fetchall()]
+    return parse_rows(MstBgm, (await conn.execute(stmt)).fetchall())
 
 
 async def get_quest_from_ai(conn: AsyncConnection, ai_id: int) -> list[StageLink]:
@@ -863,6 +854,6 @@ async def get_questSelect_container(
 
     quest_phase = await fetch_one(conn, stmt)
     if quest_phase:
-        return MstQuestPhase.from_orm(quest_phase)
+        return parse_row(MstQuestPhase, quest_phase)
 
     return None
@@ -14,7 +14,7 @@ from sqlalchemy.sql.expression import text
 from ...core.rayshift import get_quest_enemy_hash
 from ...models.rayshift import rayshiftQuest, rayshiftQuestHash
 from ...schemas.rayshift import CutInSkill, QuestDetail, QuestDrop, QuestList, UserSvt
-from .utils import fetch_one
+from .utils import fetch_one, parse_rows
 
 
 def quest_select_or(questSelect: list[int]) -> ColumnElement[bool]:
@@ -351,7 +351,7 @@ async def get_rayshift_drops(
     stmt = individual_enemy_drops.union_all(run_drops)
 
     results = await conn.execute(stmt)
-    return [QuestDrop.from_orm(row) for row in results.fetchall()]
+    return parse_rows(QuestDrop, results.fetchall())
 
 
 async def get_all_support_servants(
@@ -479,7 +479,7 @@ async def get_cutin_skills(
     )
 
     rows = (await conn.execute(stmt)).fetchall()
-    return [CutInSkill.from_orm(row) for row in rows]
+    return parse_rows(CutInSkill, rows)
 
 
 async def get_cutin_drops(
@@ -580,7 +580,7 @@ async def get_cutin_drops(
     )
 
     rows = (await conn.execute(run_drops)).fetchall()
-    return [QuestDrop.from_orm(row) for row in rows]
+    return parse_rows(QuestDrop, rows)
 
 
 insert_quest_stmt = insert(rayshiftQuest)
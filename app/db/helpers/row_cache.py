@@ -0,0 +1,93 @@
+from collections import defaultdict
+from typing import Any, Iterable, Type, TypeVar
+
+from sqlalchemy import Table
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from ...config import Settings
+from ...memory_cache import MemoryCache
+from ...redis.helpers.invalidation import CacheInvalidation, on_cache_invalidation
+from ...schemas.base import BaseModelORJson
+from ...schemas.common import Region
+from ..engine import engine_regions
+from .utils import get_list_adapter
+
+
+settings = Settings()
+
+
+# Small master tables read by ID on most requests. They only change with imports.
+ROW_CACHE_TABLES = {
+    "mstSvt",
+    "mstSkill",
+    "mstTreasureDevice",
+    "mstFunc",
+    "mstBuff",
+    "mstItem",
+    "mstWar",
+    "mstEvent",
+    "mstConstant",
+    "mstCv",
+    "mstIllustrator",
+}
+
+
+# JSON of the rows of each fetched ID, an empty array if the ID has no row
+row_cache = MemoryCache(settings.memory_row_cache_size)
+# Bounds the staleness if an invalidation message is missed or a replica lags behind
+ROW_CACHE_EXPIRE = 600
+# Data version of each region from the last invalidation message
+_data_versions: dict[Region, str] = defaultdict(str)
+# Bumped on data updates so rows read before an update are never served after it
+_data_generations: dict[Region, int] = defaultdict(int)
+
+
+TModel = TypeVar("TModel", bound=BaseModelORJson)
+
+
+def get_row_cache_region(conn: AsyncConnection, table: Table) -> Region | None:
+    """Region of the connection if the rows of `table` can be cached, or None"""
+    if settings.memory_row_cache_size <= 0 or table.name not in ROW_CACHE_TABLES:
+        return None
+    return engine_regions.get(conn.sync_engine)
+
+
+def get_row_cache_prefix(region: Region) -> str:
+    return f"{region.name}:{_data_versions[region]}:{_data_generations[region]}:"
+
+
+def get_cached_rows(
+    prefix: str, schema: Type[TModel], where_ids: Iterable[Any]
+) -> tuple[dict[Any, list[TModel]], list[Any]]:
+    """Cached rows grouped by ID and the IDs missing from the cache"""
+    cached: dict[Any, list[TModel]] = {}
+    missing: list[Any] = []
+    adapter = get_list_adapter(schema)
+    for where_id in where_ids:
+        rows_json = row_cache.get(f"{prefix}{schema.__name__}:{where_id}")
+        if rows_json is None:
+            missing.append(where_id)
+        else:
+            cached[where_id] = adapter.validate_json(rows_json)
+    return cached, missing
+
+
+def set_cached_rows(
+    prefix: str, schema: Type[TModel], rows: dict[Any, list[TModel]]
+) -> None:
+    adapter = get_list_adapter(schema)
+    for where_id, id_rows in rows.items():
+        row_cache.set(
+            f"{prefix}{schema.__name__}:{where_id}",
+            adapter.dump_json(id_rows),
+            ROW_CACHE_EXPIRE,
+        )
+
+
+@on_cache_invalidation
+def clear_row_cache(invalidation: CacheInvalidation) -> None:
+    for region in invalidation.regions:
+        row_cache.clear(get_row_cache_prefix(region))
+        if invalidation.data_version is not None:
+            _data_versions[region] = invalidation.data_version
+        _data_generations[region] += 1
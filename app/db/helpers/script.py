@@ -7,6 +7,7 @@ from sqlalchemy.sql._typing import _ColumnExpressionArgument
 from ...models.raw import ScriptFileList, mstMap, mstQuest, mstSpot, mstWar
 from ...schemas.raw import ScriptEntity, ScriptSearchResult
 from .quest import get_quest_entity
+from .utils import parse_rows
 
 
 async def get_script(conn: AsyncConnection, script_id: str) -> Optional[ScriptEntity]:
@@ -81,7 +82,4 @@ async def get_script_search(
         .order_by(score.desc())
         .limit(limit_result)
     )
-    return [
-        ScriptSearchResult.from_orm(result)
-        for result in (await conn.execute(stmt)).fetchall()
-    ]
+    return parse_rows(ScriptSearchResult, (await conn.execute(stmt)).fetchall())
@@ -1,10 +1,12 @@
-from typing import Iterable, Optional
+from typing import Any, Iterable, Optional
 
 from sqlalchemy.dialects.postgresql import aggregate_order_by, array_agg
 from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncConnection
 from sqlalchemy.sql import and_, func, or_, select
+from sqlalchemy.sql.selectable import ScalarSelect
 
+from ...cache_tags import add_cache_tags, get_row_tag, get_table_tag, tag_statement
 from ...models.raw import (
     mstAi,
     mstAiAct,
@@ -20,7 +22,41 @@ from ...models.raw import (
     mstSvtSkillRelease,
 )
 from ...schemas.raw import MstSkill, MstSvtSkill, SkillEntityNoReverse
-from .utils import sql_jsonb_agg
+from .utils import parse_rows, sql_jsonb_agg
+
+
+SKILL_ID_TAG_COLUMNS = (
+    mstSkill.c.id,
+    mstSkillDetail.c.id,
+    mstSvtSkill.c.skillId,
+    mstSkillAdd.c.skillId,
+    mstSkillLv.c.skillId,
+    mstSkillGroup.c.skillId,
+)
+SKILL_TAG_COLUMNS = (
+    *SKILL_ID_TAG_COLUMNS,
+    mstCommonRelease.c.id,
+    mstSkillGroupOverwrite.c.skillGroupId,
+    mstSvtSkill.c.svtId,
+    mstSvtSkillRelease.c.svtId,
+)
+
+
+def tag_skill_entities(skill_entities: list[SkillEntityNoReverse]) -> None:
+    """Tag the rows joined through values of the fetched skill entities"""
+    tags: set[str] = set()
+    for skill in skill_entities:
+        for skill_add in skill.mstSkillAdd:
+            tags.add(
+                get_row_tag(mstCommonRelease.name, "id", skill_add.commonReleaseId)
+            )
+        for group in skill.mstSkillGroup:
+            tags.add(get_row_tag(mstSkillGroupOverwrite.name, "skillGroupId", group.id))
+        for overwrite in skill.mstSkillGroupOverwrite:
+            tags.add(get_row_tag(mstSkillDetail.name, "id", overwrite.skillDetailId))
+        for svt_skill in skill.mstSvtSkill:
+            tags.add(get_row_tag(mstSvtSkillRelease.name, "svtId", svt_skill.svtId))
+    add_cache_tags(tags)
 
 
 async def get_skillEntity(
@@ -114,22 +150,49 @@ async def get_skillEntity(
         .group_by(mstSkill.c.id, mstSkillLvJson.c.mstSkillLv, aiIds.c.aiIds)
     )
 
-    try:
-        skill_entities = [
-            SkillEntityNoReverse.from_orm(skill)
-            for skill in (await conn.execute(stmt)).fetchall()
+    tag_statement(
+        [
+            get_row_tag(column.table.name, column.key, skill_id)
+            for column in SKILL_ID_TAG_COLUMNS
+            for skill_id in skill_ids
         ]
+        # aiIds are joined through skillVals so the AI tables are tagged as a whole
+        + [get_table_tag(table.name) for table in (mstAi, mstAiAct, mstAiField)]
+    )
+
+    try:
+        skill_entities = parse_rows(
+            SkillEntityNoReverse, (await conn.execute(stmt)).fetchall()
+        )
         order = {skill_id: i for i, skill_id in enumerate(skill_ids)}
     except DBAPIError:
         return []
 
+    tag_skill_entities(skill_entities)
+
     return sorted(skill_entities, key=lambda skill: order[skill.mstSkill.id])
 
 
+def get_mstSvtSkill_jsonb(svt_ids: Iterable[int]) -> ScalarSelect[Any]:
+    """`get_mstSvtSkill` of several servants as a jsonb array, see
+    `fetch.get_jsonb`"""
+    svt_ids = list(svt_ids)
+    add_cache_tags(get_row_tag(mstSvtSkill.name, "svtId", svt_id) for svt_id in svt_ids)
+    return (
+        select(
+            func.coalesce(
+                func.jsonb_agg(mstSvtSkill.table_valued()), func.jsonb_build_array()
+            )
+        )
+        .where(mstSvtSkill.c.svtId.in_(svt_ids))
+        .scalar_subquery()
+    )
+
+
 async def get_mstSvtSkill(conn: AsyncConnection, svt_id: int) -> list[MstSvtSkill]:
     mstSvtSkill_stmt = select(mstSvtSkill).where(mstSvtSkill.c.svtId == svt_id)
     fetched = (await conn.execute(mstSvtSkill_stmt)).fetchall()
-    return [MstSvtSkill.from_orm(svt_skill) for svt_skill in fetched]
+    return parse_rows(MstSvtSkill, fetched)
 
 
 async def get_skill_search(
@@ -175,7 +238,4 @@ async def get_skill_search(
         .where(and_(*where_clause))
     )
 
-    return [
-        MstSkill.from_orm(skill)
-        for skill in (await conn.execute(skill_search_stmt)).fetchall()
-    ]
+    return parse_rows(MstSkill, (await conn.execute(skill_search_stmt)).fetchall())
@@ -1,11 +1,12 @@
 from dataclasses import dataclass
-from typing import Iterable, Optional, Union
+from typing import Any, Iterable, Optional, Union
 
 from sqlalchemy import Table
 from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncConnection
 from sqlalchemy.sql import Join, and_, not_, or_, select, true
 from sqlalchemy.sql._typing import _ColumnExpressionArgument
+from sqlalchemy.sql.selectable import ScalarSelect
 
 from ...models.raw import (
     mstCv,
@@ -30,6 +31,7 @@ from ...schemas.raw import (
     MstSvtVoice,
     MstVoicePlayCond,
 )
+from .utils import parse_rows, sql_table_jsonb
 
 
 async def get_svt_id(conn: AsyncConnection, col_no: int) -> int:
@@ -107,10 +109,7 @@ async def get_svt_limit_add(
         )
     )
 
-    return [
-        MstSvtLimitAdd.from_orm(db_row)
-        for db_row in (await conn.execute(stmt)).fetchall()
-    ]
+    return parse_rows(MstSvtLimitAdd, (await conn.execute(stmt)).fetchall())
 
 
 async def get_svt_script(
@@ -126,10 +125,39 @@ async def get_svt_script(
         )
         .order_by(mstSvtScript.c.id, mstSvtScript.c.form)
     )
-    return [
-        MstSvtScript.from_orm(db_row)
-        for db_row in (await conn.execute(stmt)).fetchall()
-    ]
+    return parse_rows(MstSvtScript, (await conn.execute(stmt)).fetchall())
+
+
+def get_svt_script_jsonb(
+    svt_ids: Iterable[int], costume_svt_ids: Iterable[int]
+) -> ScalarSelect[Any]:
+    """`get_svt_script` of `svt_ids` and the battle charas of the costumes of
+    `costume_svt_ids` as a jsonb array"""
+    svt_ids = set(svt_ids)
+    costume_chara_ids = select(mstSvtLimitAdd.c.battleCharaId).where(
+        mstSvtLimitAdd.c.svtId.in_(costume_svt_ids)
+    )
+    return sql_table_jsonb(
+        mstSvtScript,
+        or_(
+            (mstSvtScript.c.id // 10).in_(svt_ids),
+            mstSvtScript.c.id.in_(svt_ids),
+            (mstSvtScript.c.id // 10).in_(costume_chara_ids),
+            mstSvtScript.c.id.in_(costume_chara_ids),
+        ),
+        mstSvtScript.c.id,
+        mstSvtScript.c.form,
+    )
+
+
+def get_mstSvtVoice_jsonb(svt_ids: Iterable[int]) -> ScalarSelect[Any]:
+    return sql_table_jsonb(
+        mstSvtVoice,
+        mstSvtVoice.c.id.in_(svt_ids),
+        mstSvtVoice.c.id,
+        mstSvtVoice.c.voicePrefix,
+        mstSvtVoice.c.type,
+    )
 
 
 async def get_mstSvtVoice(
@@ -140,10 +168,17 @@ async def get_mstSvtVoice(
         .where(mstSvtVoice.c.id.in_(svt_ids))
         .order_by(mstSvtVoice.c.id, mstSvtVoice.c.voicePrefix, mstSvtVoice.c.type)
     )
-    return [
-        MstSvtVoice.from_orm(svt_voice)
-        for svt_voice in (await conn.execute(mstSvtVoice_stmt)).fetchall()
-    ]
+    return parse_rows(MstSvtVoice, (await conn.execute(mstSvtVoice_stmt)).fetchall())
+
+
+def get_mstVoicePlayCond_jsonb(svt_ids: Iterable[int]) -> ScalarSelect[Any]:
+    return sql_table_jsonb(
+        mstVoicePlayCond,
+        mstVoicePlayCond.c.svtId.in_(svt_ids),
+        mstVoicePlayCond.c.svtId,
+        mstVoicePlayCond.c.voiceId,
+        mstVoicePlayCond.c.idx,
+    )
 
 
 async def get_mstVoicePlayCond(
@@ -156,10 +191,15 @@ async def get_mstVoicePlayCond(
             mstVoicePlayCond.c.svtId, mstVoicePlayCond.c.voiceId, mstVoicePlayCond.c.idx
         )
     )
-    return [
-        MstVoicePlayCond.from_orm(play_cond)
-        for play_cond in (await conn.execute(mstVoicePlayCond_stmt)).fetchall()
-    ]
+    return parse_rows(
+        MstVoicePlayCond, (await conn.execute(mstVoicePlayCond_stmt)).fetchall()
+    )
+
+
+def get_mstSubtitle_jsonb(svt_ids: Iterable[int]) -> ScalarSelect[Any]:
+    return sql_table_jsonb(
+        mstSubtitle, mstSubtitle.c.svtId.in_(svt_ids), mstSubtitle.c.id
+    )
 
 
 async def get_mstSubtitle(
@@ -170,10 +210,9 @@ async def get_mstSubtitle(
         .where(mstSubtitle.c.svtId.in_(svt_ids))
         .order_by(mstSubtitle.c.id)
     )
-    return [
-        GlobalNewMstSubtitle.from_orm(subtitle)
-        for subtitle in (await conn.execute(mstSubtitle_stmt)).fetchall()
-    ]
+    return parse_rows(
+        GlobalNewMstSubtitle, (await conn.execute(mstSubtitle_stmt)).fetchall()
+    )
 
 
 async def get_svt_ids(conn: AsyncConnection, svt_colNos: Iterable[int]) -> set[int]:
@@ -302,6 +341,4 @@ async def get_svt_search(
         select(mstSvt).distinct().select_from(from_clause).where(and_(*where_clause))
     )
 
-    return [
-        MstSvt.from_orm(svt) for svt in (await conn.execute(svt_search_stmt)).fetchall()
-    ]
+    return parse_rows(MstSvt, (await conn.execute(svt_search_stmt)).fetchall())
@@ -1,10 +1,12 @@
-from typing import Iterable, Optional
+from typing import Any, Iterable, Optional
 
 from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncConnection
 from sqlalchemy.sql import and_, func, or_, select
+from sqlalchemy.sql.selectable import ScalarSelect
 
+from ...cache_tags import add_cache_tags, get_row_tag, tag_statement
 from ...models.raw import (
     mstSvtTreasureDevice,
     mstSvtTreasureDeviceRelease,
@@ -13,7 +15,20 @@ from ...models.raw import (
     mstTreasureDeviceLv,
 )
 from ...schemas.raw import MstSvtTreasureDevice, MstTreasureDevice, TdEntityNoReverse
-from .utils import sql_jsonb_agg
+from .utils import parse_rows, sql_jsonb_agg
+
+
+TD_ID_TAG_COLUMNS = (
+    mstTreasureDevice.c.id,
+    mstTreasureDeviceDetail.c.id,
+    mstSvtTreasureDevice.c.treasureDeviceId,
+    mstTreasureDeviceLv.c.treaureDeviceId,
+)
+TD_TAG_COLUMNS = (
+    *TD_ID_TAG_COLUMNS,
+    mstSvtTreasureDevice.c.svtId,
+    mstSvtTreasureDeviceRelease.c.svtId,
+)
 
 
 async def get_tdEntity(
@@ -73,19 +88,49 @@ async def get_tdEntity(
         .group_by(mstTreasureDevice.c.id, mstTreasureDeviceLvJson.c.mstTreasureDeviceLv)
     )
 
+    tag_statement(
+        get_row_tag(column.table.name, column.key, td_id)
+        for column in TD_ID_TAG_COLUMNS
+        for td_id in td_ids
+    )
+
     try:
-        td_entities = [
-            TdEntityNoReverse.from_orm(td)
-            for td in (await conn.execute(stmt)).fetchall()
-        ]
+        td_entities = parse_rows(
+            TdEntityNoReverse, (await conn.execute(stmt)).fetchall()
+        )
     except DBAPIError:
         return []
 
+    add_cache_tags(
+        get_row_tag(mstSvtTreasureDeviceRelease.name, "svtId", svt_td.svtId)
+        for td in td_entities
+        for svt_td in td.mstSvtTreasureDevice
+    )
+
     order = {td_id: i for i, td_id in enumerate(td_ids)}
 
     return sorted(td_entities, key=lambda td: order[td.mstTreasureDevice.id])
 
 
+def get_mstSvtTreasureDevice_jsonb(svt_ids: Iterable[int]) -> ScalarSelect[Any]:
+    """`get_mstSvtTreasureDevice` of several servants as a jsonb array, see
+    `fetch.get_jsonb`"""
+    svt_ids = list(svt_ids)
+    add_cache_tags(
+        get_row_tag(mstSvtTreasureDevice.name, "svtId", svt_id) for svt_id in svt_ids
+    )
+    return (
+        select(
+            func.coalesce(
+                func.jsonb_agg(mstSvtTreasureDevice.table_valued()),
+                func.jsonb_build_array(),
+            )
+        )
+        .where(mstSvtTreasureDevice.c.svtId.in_(svt_ids))
+        .scalar_subquery()
+    )
+
+
 async def get_mstSvtTreasureDevice(
     conn: AsyncConnection, svt_id: int
 ) -> list[MstSvtTreasureDevice]:
@@ -93,7 +138,7 @@ async def get_mstSvtTreasureDevice(
         mstSvtTreasureDevice.c.svtId == svt_id
     )
     fetched = (await conn.execute(mstSvtTreasureDevice_stmt)).fetchall()
-    return [MstSvtTreasureDevice.from_orm(svt_td) for svt_td in fetched]
+    return parse_rows(MstSvtTreasureDevice, fetched)
 
 
 async def get_td_search(
@@ -168,7 +213,6 @@ async def get_td_search(
         .where(and_(*where_clause))
     )
 
-    return [
-        MstTreasureDevice.from_orm(td)
-        for td in (await conn.execute(td_search_stmt)).fetchall()
-    ]
+    return parse_rows(
+        MstTreasureDevice, (await conn.execute(td_search_stmt)).fetchall()
+    )
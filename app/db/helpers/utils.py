@@ -1,12 +1,17 @@
-from typing import Any, TypeVar
+from functools import cache
+from typing import Any, Iterable, Type, TypeVar
 
+from pydantic import TypeAdapter
 from sqlalchemy import Table
-from sqlalchemy.dialects.postgresql import JSONB, array_agg
+from sqlalchemy.dialects.postgresql import JSONB, aggregate_order_by, array_agg
 from sqlalchemy.engine import CursorResult, Row
 from sqlalchemy.ext.asyncio import AsyncConnection
-from sqlalchemy.sql import Select, func
-from sqlalchemy.sql._typing import _ColumnsClauseArgument
-from sqlalchemy.sql.selectable import NamedFromClause
+from sqlalchemy.sql import ColumnElement, Select, func, select
+from sqlalchemy.sql._typing import _ColumnExpressionArgument, _ColumnsClauseArgument
+from sqlalchemy.sql.selectable import NamedFromClause, ScalarSelect
+
+from ...cache_tags import add_cache_tags, get_table_tag
+from ...schemas.base import BaseModelORJson
 
 
 def sql_jsonb_agg(
@@ -18,9 +23,53 @@ def sql_jsonb_agg(
     ).label(label if label else table.name)
 
 
+def sql_table_jsonb(
+    table: Table,
+    where_clause: _ColumnExpressionArgument[bool],
+    *order_by: ColumnElement[Any],
+) -> ScalarSelect[Any]:
+    """Rows of a custom query of `table` as a subquery returning a jsonb array,
+    see `fetch.get_jsonb`.
+
+    The rows can't be described by row tags so the whole table is tagged.
+    """
+    add_cache_tags([get_table_tag(table.name)])
+    return (
+        select(
+            func.coalesce(
+                func.jsonb_agg(aggregate_order_by(table.table_valued(), *order_by)),  # type: ignore[no-untyped-call]
+                func.jsonb_build_array(),
+            )
+        )
+        .where(where_clause)
+        .scalar_subquery()
+    )
+
+
 T = TypeVar("T", bound=tuple[Any, ...])
 
 
 async def fetch_one(conn: AsyncConnection, stmt: Select[T]) -> Row[T] | None:
     res: CursorResult[T] = await conn.execute(stmt.limit(1))
     return res.first()
+
+
+TModel = TypeVar("TModel", bound=BaseModelORJson)
+
+
+@cache
+def get_list_adapter(schema: Type[TModel]) -> TypeAdapter[list[TModel]]:
+    return TypeAdapter(list[schema])  # type: ignore[valid-type]
+
+
+def parse_rows(schema: Type[TModel], rows: Iterable[Row[Any]]) -> list[TModel]:
+    """Validate a result set as `schema` models in one pydantic call.
+
+    Plain dicts of the rows validate several times faster than `schema.from_orm`,
+    which reads every column of the row as an attribute.
+    """
+    return get_list_adapter(schema).validate_python([row._asdict() for row in rows])
+
+
+def parse_row(schema: Type[TModel], row: Row[Any]) -> TModel:
+    return schema.model_validate(row._asdict())
@@ -5,7 +5,7 @@ from sqlalchemy.sql import or_, select
 
 from ...models.raw import mstBlankEarthSpot, mstMap, mstSpot, mstWar
 from ...schemas.raw import MstBlankEarthSpot, MstSpot, MstWar
-from .utils import fetch_one
+from .utils import fetch_one, parse_row, parse_rows
 
 
 async def get_war_from_spot(conn: AsyncConnection, spot_id: int) -> MstWar | None:
@@ -21,7 +21,7 @@ async def get_war_from_spot(conn: AsyncConnection, spot_id: int) -> MstWar | Non
 
     war = await fetch_one(conn, stmt)
     if war:
-        return MstWar.from_orm(war)
+        return parse_row(MstWar, war)
 
     return None  # pragma: no cover
 
@@ -32,12 +32,12 @@ async def get_spot_from_id(
     stmt = select(mstSpot).where(mstSpot.c.id == spot_id)
     spot = await fetch_one(conn, stmt)
     if spot:
-        return MstSpot.from_orm(spot)
+        return parse_row(MstSpot, spot)
 
     stmt = select(mstBlankEarthSpot).where(mstBlankEarthSpot.c.id == spot_id)
     spot = await fetch_one(conn, stmt)
     if spot:
-        return MstBlankEarthSpot.from_orm(spot)
+        return parse_row(MstBlankEarthSpot, spot)
 
     return None  # pragma: no cover
 
@@ -46,4 +46,4 @@ async def get_spot_from_ids(
     conn: AsyncConnection, spot_ids: Iterable[int]
 ) -> list[MstSpot]:
     stmt = select(mstSpot).where(mstSpot.c.id.in_(spot_ids))
-    return [MstSpot.from_orm(spot) for spot in (await conn.execute(stmt)).fetchall()]
+    return parse_rows(MstSpot, (await conn.execute(stmt)).fetchall())
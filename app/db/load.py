@@ -17,6 +17,7 @@ from ..data.event import get_event_with_warIds
 from ..data.gift import get_gift_with_index
 from ..data.item import get_item_with_use
 from ..data.script import get_script_path, get_script_text_only
+from ..models.cache import cacheTagChange, cacheTagDigest
 from ..models.raw import (
     TABLES_TO_BE_LOADED,
     AssetStorage,
@@ -44,6 +45,8 @@ from ..schemas.gameenums import BuffType, FuncType
 from ..schemas.raw import AssetStorageLine, get_subtitle_svtId
 from ..schemas.rayshift import QuestDetail, QuestList
 from .engine import engines
+from .helpers.cache_tags import record_cache_tag_changes
+from .helpers.entity_cache import clear_entity_cache
 from .helpers.rayshift import (
     fetch_all_missing_quest_ids,
     fetch_missing_quest_ids,
@@ -68,6 +71,7 @@ def recreate_table(conn: Connection, table: Table) -> None:  # pragma: no cover
 
 
 def insert_db(conn: Connection, table: Table, db_data: Any) -> None:  # pragma: no cover
+    record_cache_tag_changes(conn, table, db_data)
     recreate_table(conn, table)
     logger.debug(f"Inserting into {table.name}")
     if db_data:
@@ -472,6 +476,11 @@ def update_db(region_path: dict[Region, DirectoryPath]) -> None:  # pragma: no c
         master_folder = repo_folder / "master"
         engine = engines[region]
 
+        with engine.begin() as conn:
+            cacheTagDigest.create(conn, checkfirst=True)
+            cacheTagChange.create(conn, checkfirst=True)
+            clear_entity_cache(conn)
+
         with engine.begin() as conn:
             logger.info("Updating parsed skill and td …")
             load_skill_td_lv(conn, repo_folder)
@@ -1,31 +1,38 @@
-import hashlib
-import json
-import pickle
+import asyncio
 import time
 import tomllib
 from math import ceil
-from typing import Any, Awaitable, Callable, Optional
+from typing import Any, Awaitable, Callable
 
-import orjson
 import uvicorn
 from fastapi import Depends, FastAPI, HTTPException, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.staticfiles import StaticFiles
-from fastapi_cache import Coder, FastAPICache
+from fastapi_cache import FastAPICache
 from fastapi_cache.backends.redis import RedisBackend
-from redis.asyncio import Redis as AsyncRedis
-from sqlalchemy.ext.asyncio import AsyncConnection
+from fastapi_cache.types import Backend
 
-from .config import Settings, get_app_info, logger, project_root
+from .cache import PickleCoder, custom_key_builder
+from .config import CacheBackend, Settings, get_app_info, logger, project_root
 from .core.info import get_all_repo_info
-from .db.engine import async_engines, engines
+from .core.nice.pool import shutdown_nice_executor, start_nice_executor
+from .db.engine import async_engines, engines, replica_engines
+from .db.helpers.master_store import reload_master_stores
+from .memory_cache import MemoryBackend
 from .redis import Redis
+from .redis.helpers.invalidation import listen_cache_invalidation
+from .redis.helpers.single_flight import listen_single_flight_release
+from .redis.helpers.traffic import (
+    flush_traffic,
+    flush_traffic_periodically,
+    get_traffic_key,
+    record_traffic,
+)
 from .routers import basic, nice, raw, secret
 from .routers.deps import get_redis
 from .schemas.common import Region, RepoInfo
-from .zstd import zstd_compress, zstd_decompress
 
 
 settings = Settings()
@@ -201,6 +208,20 @@ async def add_process_time_header(
     return response
 
 
+@app.middleware("http")
+async def record_request_traffic(
+    request: Request, call_next: Callable[..., Awaitable[Response]]
+) -> Response:
+    response = await call_next(request)
+    if (
+        settings.cache_warmer_count > 0
+        and response.status_code == 200
+        and (traffic_key := get_traffic_key(request))
+    ):
+        record_traffic(traffic_key)
+    return response
+
+
 async def limiter_callback(
     request: Request,
     response: Response,  # noqa: ARG001
@@ -218,91 +239,55 @@ async def limiter_callback(
     )
 
 
-def get_region(args: list[Any], kwargs: dict[str, Any]) -> str:  # pragma: no cover
-    if "region" in kwargs and isinstance(kwargs["region"], Region):
-        return kwargs["region"].value
-    elif "search_param" in kwargs:
-        search_param = kwargs["search_param"]
-        if hasattr(search_param, "region") and isinstance(search_param.region, Region):
-            return search_param.region.value
-    else:
-        for arg in args:
-            if isinstance(arg, Region):
-                return arg.value
-            if hasattr(arg, "region") and isinstance(arg.region, Region):
-                return arg.region.value
-
-    return ""
-
-
-def custom_key_builder(
-    __function: Callable[..., Any],
-    __namespace: str = "",
-    *,
-    request: Optional[Request] = None,  # noqa: ARG001
-    response: Optional[Response] = None,  # noqa: ARG001
-    args: tuple[Any, ...],
-    kwargs: dict[str, Any],
-) -> str:
-    prefix = FastAPICache.get_prefix()
-    static_kwargs = {k: v for k, v in kwargs.items() if k not in {"conn", "redis"}}
-
-    static_args = [
-        arg
-        for arg in args
-        if not isinstance(arg, AsyncConnection) and not isinstance(arg, AsyncRedis)
-    ]
-
-    region = get_region(static_args, static_kwargs)
-
-    try:
-        args_dump = orjson.dumps(static_args)
-        kwargs_dump = orjson.dumps(static_kwargs)
-    except TypeError:  # orjson can't dump 64+ bit int
-        args_dump = json.dumps(static_args).encode("utf-8")
-        kwargs_dump = json.dumps(static_kwargs).encode("utf-8")
-
-    raw_key = (
-        f"{__function.__module__}:{__function.__name__}:".encode("utf-8")
-        + args_dump
-        + b":"
-        + kwargs_dump
-    )
-    cache_key = hashlib.sha1(raw_key).hexdigest()
-
-    return f"{prefix}:{region}:{__namespace}:{cache_key}"
-
-
-class PickleCoder(Coder):  # pragma: no cover
-    @classmethod
-    def encode(cls, value: Any) -> bytes:
-        picked = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
-        return zstd_compress(picked)
-
-    @classmethod
-    def decode(cls, value: bytes) -> Any:
-        return pickle.loads(zstd_decompress(value))
-
-
 @app.on_event("startup")
 async def startup() -> None:
     redis = await Redis.from_url(str(settings.redisdsn))
+    cache_backend: Backend
+    if settings.cache_backend == CacheBackend.MEMORY:
+        cache_backend = MemoryBackend(settings.memory_cache_size)
+    else:
+        cache_backend = RedisBackend(redis)
     FastAPICache.init(
-        RedisBackend(redis),
+        cache_backend,
         prefix=f"{settings.redis_prefix}:cache",
         expire=60 * 60 * 24 * 7,
         key_builder=custom_key_builder,
         coder=PickleCoder,
     )
     app.state.redis = redis
+    if settings.memory_master_tables:
+        await reload_master_stores(settings.data)
+    start_nice_executor()
+    app.state.single_flight_listener = asyncio.create_task(
+        listen_single_flight_release(redis)
+    )
+    app.state.cache_invalidation_listener = asyncio.create_task(
+        listen_cache_invalidation(redis, list(settings.data))
+    )
+    if settings.cache_warmer_count > 0:
+        app.state.traffic_flusher = asyncio.create_task(
+            flush_traffic_periodically(redis, settings.cache_warmer_count * 10)
+        )
 
 
 @app.on_event("shutdown")
 async def shutdown() -> None:
+    app.state.single_flight_listener.cancel()
+    app.state.cache_invalidation_listener.cancel()
+    if settings.cache_warmer_count > 0:
+        app.state.traffic_flusher.cancel()
+        try:
+            await flush_traffic(app.state.redis, settings.cache_warmer_count * 10)
+        except Exception:  # noqa: BLE001
+            logger.warning("Failed to record traffic", exc_info=True)
     for engine in engines.values():
         engine.dispose()
     for async_engine in async_engines.values():
         await async_engine.dispose()
+    for region_replicas in replica_engines.values():
+        for replica_engine in region_replicas:
+            await replica_engine.dispose()
+    shutdown_nice_executor()
 
 
 app.include_router(nice.router)
@@ -0,0 +1,89 @@
+import time
+from collections import OrderedDict
+from math import ceil
+from typing import Optional
+
+from fastapi_cache.types import Backend
+
+
+class MemoryCache:
+    """In-process LRU cache of bytes limited by the total size of its items.
+
+    The TTL follows Redis: -1 if the key doesn't expire.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self.size = 0
+        self._store: OrderedDict[str, tuple[bytes, float | None]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def get_with_ttl(self, key: str) -> tuple[int, bytes | None]:
+        item = self._store.get(key)
+        if item is None:
+            return 0, None
+
+        value, expire_at = item
+        ttl = -1
+        if expire_at is not None:
+            ttl = ceil(expire_at - time.monotonic())
+            if ttl <= 0:
+                self.delete(key)
+                return 0, None
+
+        self._store.move_to_end(key)
+        return ttl, value
+
+    def get(self, key: str) -> bytes | None:
+        return self.get_with_ttl(key)[1]
+
+    def set(self, key: str, value: bytes, expire: int | None = None) -> None:
+        self.delete(key)
+        item_size = len(key) + len(value)
+        if item_size > self.max_size:
+            return
+
+        expire_at = time.monotonic() + expire if expire else None
+        self._store[key] = (value, expire_at)
+        self.size += item_size
+        while self.size > self.max_size:
+            old_key, (old_value, _) = self._store.popitem(last=False)
+            self.size -= len(old_key) + len(old_value)
+
+    def delete(self, key: str) -> bool:
+        item = self._store.pop(key, None)
+        if item is None:
+            return False
+        self.size -= len(key) + len(item[0])
+        return True
+
+    def clear(self, prefix: str = "") -> int:
+        keys = [key for key in self._store if key.startswith(prefix)]
+        for key in keys:
+            self.delete(key)
+        return len(keys)
+
+
+class MemoryBackend(Backend):
+    """`FastAPICache` backend keeping the responses in process memory"""
+
+    def __init__(self, max_size: int) -> None:
+        self.cache = MemoryCache(max_size)
+
+    async def get_with_ttl(self, key: str) -> tuple[int, Optional[bytes]]:
+        return self.cache.get_with_ttl(key)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self.cache.get(key)
+
+    async def set(self, key: str, value: bytes, expire: Optional[int] = None) -> None:
+        self.cache.set(key, value, expire)
+
+    async def clear(
+        self, namespace: Optional[str] = None, key: Optional[str] = None
+    ) -> int:
+        if key:
+            return int(self.cache.delete(key))
+        return self.cache.clear(namespace or "")
@@ -0,0 +1,31 @@
+from sqlalchemy import VARCHAR, Boolean, Column, Integer, Table, Text
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+
+from .base import metadata
+
+
+cacheTagDigest = Table(
+    "cacheTagDigest",
+    metadata,
+    Column("tag", Text, primary_key=True),
+    Column("tableName", Text, index=True),
+    Column("digest", VARCHAR(40)),
+)
+
+
+cacheTagChange = Table(
+    "cacheTagChange",
+    metadata,
+    Column("tag", Text, primary_key=True),
+)
+
+
+entityCache = Table(
+    "entityCache",
+    metadata,
+    Column("type", Text, primary_key=True),
+    Column("id", Integer, primary_key=True),
+    Column("entity", JSONB),
+    Column("tags", ARRAY(Text)),
+    Column("tracked", Boolean),
+)
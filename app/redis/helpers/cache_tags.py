@@ -0,0 +1,85 @@
+from typing import Iterable
+
+from ...cache_tags import FULL_CLEAR_TAG
+from ...config import Settings, logger
+from .. import Redis
+
+
+settings = Settings()
+
+
+TRACKED_KEYS = "_tracked"
+APP_VERSION = "_app_version"
+
+
+def get_cache_tag_key(region: str, tag: str) -> str:
+    return f"{settings.redis_prefix}:cache_tags:{region}:{tag}"
+
+
+async def set_cache_tags(
+    redis: Redis, region: str, cache_key: str, tags: Iterable[str], expire: int
+) -> None:
+    """Record the key under its tags. The tag sets expire with the newest key."""
+    async with redis.pipeline(transaction=False) as pipe:
+        for tag in tags:
+            tag_key = get_cache_tag_key(region, tag)
+            pipe.sadd(tag_key, cache_key)
+            pipe.expire(tag_key, expire)
+        pipe.sadd(get_cache_tag_key(region, TRACKED_KEYS), cache_key)
+        await pipe.execute()
+
+
+async def untrack_cache_key(redis: Redis, region: str, cache_key: str) -> None:
+    await redis.srem(get_cache_tag_key(region, TRACKED_KEYS), cache_key)
+
+
+async def get_stale_cache_keys(
+    redis: Redis, region: str, tags: Iterable[str]
+) -> set[bytes]:  # pragma: no cover
+    tag_keys = [get_cache_tag_key(region, tag) for tag in tags]
+    if not tag_keys:
+        return set()
+    stale_keys = await redis.sunion(tag_keys)
+    return {key for key in stale_keys if isinstance(key, bytes)}
+
+
+async def get_untracked_cache_keys(
+    redis: Redis, region: str, cache_keys: list[bytes]
+) -> list[bytes]:  # pragma: no cover
+    if not cache_keys:
+        return []
+    tracked = await redis.smismember(  # type: ignore[no-untyped-call]
+        get_cache_tag_key(region, TRACKED_KEYS), cache_keys
+    )
+    return [key for key, is_tracked in zip(cache_keys, tracked) if not is_tracked]
+
+
+async def clear_cache_tags(
+    redis: Redis, region: str, tags: set[str], cleared_keys: Iterable[bytes]
+) -> None:  # pragma: no cover
+    """Drop the consumed tag sets after their keys have been deleted"""
+    if FULL_CLEAR_TAG in tags:
+        tag_count = 0
+        async for tag_key in redis.scan_iter(match=get_cache_tag_key(region, "*")):
+            await redis.delete(tag_key)
+            tag_count += 1
+        logger.info(f"Cleared {tag_count} cache tag sets for {region}.")
+        return
+
+    tracked_key = get_cache_tag_key(region, TRACKED_KEYS)
+    async with redis.pipeline(transaction=False) as pipe:
+        for tag in tags:
+            pipe.delete(get_cache_tag_key(region, tag))
+        for cache_key in cleared_keys:
+            pipe.srem(tracked_key, cache_key)
+        await pipe.execute()
+
+
+async def get_cache_app_version(redis: Redis, region: str) -> str | None:
+    """App version the tracked keys were computed with"""
+    app_version = await redis.get(get_cache_tag_key(region, APP_VERSION))
+    return app_version.decode() if app_version else None
+
+
+async def set_cache_app_version(redis: Redis, region: str, app_version: str) -> None:
+    await redis.set(get_cache_tag_key(region, APP_VERSION), app_version)
@@ -0,0 +1,38 @@
+from ...config import Settings
+from ...memory_cache import MemoryCache
+from .. import Redis
+from .invalidation import CacheInvalidation, on_cache_invalidation
+
+
+settings = Settings()
+
+
+# Copy of the `data` hash fields read by this process. Missing fields are cached
+# as empty bytes.
+data_cache = MemoryCache(settings.memory_data_cache_size)
+# Bounds the staleness if an invalidation message is missed
+DATA_CACHE_EXPIRE = 600
+
+
+def use_data_cache() -> bool:
+    return settings.memory_data_cache_size > 0
+
+
+async def get_data_field(redis: Redis, redis_key: str, field: str) -> bytes | None:
+    """`HGET` of the data hashes, read through the in-process cache if enabled"""
+    if not use_data_cache():
+        return await redis.hget(redis_key, field)
+
+    cache_key = f"{redis_key}:{field}"
+    if (cached := data_cache.get(cache_key)) is not None:
+        return cached or None
+
+    item_redis = await redis.hget(redis_key, field)
+    data_cache.set(cache_key, item_redis or b"", DATA_CACHE_EXPIRE)
+    return item_redis
+
+
+@on_cache_invalidation
+def clear_data_cache(invalidation: CacheInvalidation) -> None:
+    for region in invalidation.regions:
+        data_cache.clear(f"{settings.redis_prefix}:data:{region.name}:")
@@ -0,0 +1,129 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Callable
+from uuid import uuid4
+
+import orjson
+
+from ...config import Settings, logger
+from ...schemas.common import Region
+from .. import Redis
+
+
+settings = Settings()
+
+
+CACHE_INVALIDATION_CHANNEL = f"{settings.redis_prefix}:cache_invalidation"
+RECONNECT_INTERVAL = 1
+# Identify the messages sent by this process since it has cleared its caches already
+PROCESS_ID = uuid4().hex
+
+
+@dataclass
+class CacheInvalidation:
+    regions: list[Region]
+    # None while the data is updated but the Redis cache isn't cleared yet
+    data_version: str | None = None
+    # None if every key of the region is stale
+    changed_tags: dict[Region, set[str]] | None = None
+    sender: str = PROCESS_ID
+
+    def dumps(self) -> bytes:
+        return orjson.dumps(
+            {
+                "sender": self.sender,
+                "regions": self.regions,
+                "data_version": self.data_version,
+                "changed_tags": (
+                    {
+                        region.value: sorted(tags)
+                        for region, tags in self.changed_tags.items()
+                    }
+                    if self.changed_tags is not None
+                    else None
+                ),
+            }
+        )
+
+    @classmethod
+    def loads(cls, message: bytes) -> "CacheInvalidation":
+        data: dict[str, Any] = orjson.loads(message)
+        changed_tags = data["changed_tags"]
+        return cls(
+            regions=[Region(region) for region in data["regions"]],
+            data_version=data["data_version"],
+            changed_tags=(
+                {Region(region): set(tags) for region, tags in changed_tags.items()}
+                if changed_tags is not None
+                else None
+            ),
+            sender=data["sender"],
+        )
+
+    def get_changed_tags(self, region: Region) -> set[str] | None:
+        if self.changed_tags is None:
+            return None
+        return self.changed_tags.get(region)
+
+
+LocalCacheClear = Callable[[CacheInvalidation], None]
+_local_caches: list[LocalCacheClear] = []
+
+
+def on_cache_invalidation(clear: LocalCacheClear) -> LocalCacheClear:
+    """Register a function clearing an in-process cache after a data update"""
+    _local_caches.append(clear)
+    return clear
+
+
+def invalidate_local_caches(invalidation: CacheInvalidation) -> None:
+    for clear in _local_caches:
+        try:
+            clear(invalidation)
+        except Exception:  # noqa: BLE001
+            logger.exception(f"Failed to clear local cache {clear.__name__}")
+
+
+async def publish_cache_invalidation(
+    redis: Redis, invalidation: CacheInvalidation
+) -> None:  # pragma: no cover
+    """Clear the local caches of this process and every other worker"""
+    invalidate_local_caches(invalidation)
+    try:
+        await redis.publish(CACHE_INVALIDATION_CHANNEL, invalidation.dumps())
+    except Exception:  # noqa: BLE001
+        logger.exception("Failed to publish cache invalidation")
+
+
+async def listen_cache_invalidation(
+    redis: Redis, regions: list[Region]
+) -> None:  # pragma: no cover
+    """Clear the local caches when another worker updates the data.
+
+    Messages sent while disconnected are lost so everything is cleared on
+    reconnection.
+    """
+    connected_once = False
+    while True:
+        try:
+            async with redis.pubsub() as pubsub:
+                await pubsub.subscribe(CACHE_INVALIDATION_CHANNEL)
+                if connected_once:
+                    invalidate_local_caches(CacheInvalidation(regions))
+                connected_once = True
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    invalidation = CacheInvalidation.loads(message["data"])
+                    if invalidation.sender == PROCESS_ID:
+                        continue
+                    logger.info(
+                        f"Clearing local caches of {invalidation.regions} "
+                        f"for data version {invalidation.data_version}"
+                    )
+                    invalidate_local_caches(invalidation)
+        except asyncio.CancelledError:
+            raise
+        except Exception:  # noqa: BLE001
+            logger.warning("Cache invalidation listener disconnected", exc_info=True)
+            await asyncio.sleep(RECONNECT_INTERVAL)
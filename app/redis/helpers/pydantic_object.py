@@ -1,5 +1,6 @@
 from typing import Optional, Type, TypeVar
 
+from ...cache_tags import add_cache_tags, get_row_tag
 from ...config import Settings
 from ...schemas.base import BaseModelORJson
 from ...schemas.common import Region
@@ -15,6 +16,7 @@ from ...schemas.raw import (
 )
 from ...zstd import zstd_decompress
 from .. import Redis
+from .data import get_data_field
 
 
 settings = Settings()
@@ -37,9 +39,10 @@ RedisPydantic = TypeVar("RedisPydantic", bound=BaseModelORJson)
 async def fetch_id(
     redis: Redis, region: Region, schema: Type[RedisPydantic], item_id: int
 ) -> Optional[RedisPydantic]:
-    redis_table = pydantic_obj_redis_table[schema][0]
+    redis_table, id_field = pydantic_obj_redis_table[schema]
     redis_key = f"{settings.redis_prefix}:data:{region.name}:{redis_table}"
-    item_redis = await redis.hget(redis_key, str(item_id))
+    add_cache_tags([get_row_tag(redis_table, id_field, item_id)])
+    item_redis = await get_data_field(redis, redis_key, str(item_id))
 
     if item_redis:
         return schema.model_validate_json(zstd_decompress(item_redis))
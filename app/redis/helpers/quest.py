@@ -1,6 +1,9 @@
 import pickle
-from typing import Optional, cast
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional, cast
 
+from ...cache_tags import mark_untracked
 from ...config import Settings
 from ...schemas.base import BaseModelORJson
 from ...schemas.common import Language, Region
@@ -22,6 +25,26 @@ def get_redis_cache_key(
     return f"{settings.redis_prefix}:cache:{region.value}:stage_data:{quest_id}:{phase}:{hash}:{lang.value}"
 
 
+def parse_redis_cache_key(
+    redis_key: bytes,
+) -> tuple[Region, int, int, str | None, Language] | None:
+    """Get the region, quest ID, phase, hash and language of a stage cache key"""
+    parts = redis_key.decode().removesuffix(":heavy").split(":")
+    if len(parts) < 7 or parts[-5] != "stage_data":
+        return None
+    region, _, quest_id, phase, hash_, lang = parts[-6:]
+    try:
+        return (
+            Region(region),
+            int(quest_id),
+            int(phase),
+            None if hash_ == "None" else hash_,
+            Language(lang),
+        )
+    except ValueError:
+        return None
+
+
 class RayshiftRedisData(BaseModelORJson):
     quest_drops: list[EnemyDrop]
     stages: list[NiceStage]
@@ -39,16 +62,45 @@ async def get_stages_cache(
     phase: int,
     lang: Language = Language.jp,
     hash: str | None = None,
-) -> Optional[RayshiftRedisData]:
+) -> tuple[Optional[RayshiftRedisData], int]:
+    """Get the cached stage data and its remaining TTL in seconds.
+
+    The TTL is -1 if the data doesn't expire.
+    """
+    mark_untracked()
     redis_key = get_redis_cache_key(region, quest_id, phase, hash, lang)
 
-    if redis_data := await redis.get(redis_key):
-        return cast(RayshiftRedisData, pickle.loads(zstd_decompress(redis_data)))
+    for key in (redis_key, f"{redis_key}:heavy"):
+        async with redis.pipeline() as pipe:
+            redis_data, ttl = await pipe.get(key).ttl(key).execute()
+        if redis_data:
+            return (
+                cast(RayshiftRedisData, pickle.loads(zstd_decompress(redis_data))),
+                ttl,
+            )
+
+    return None, -2
+
+
+async def has_stages_cache(redis: Redis, redis_key: str) -> bool:
+    """Whether the stage data of `redis_key` is cached, in the light or heavy key"""
+    return bool(await redis.exists(redis_key, f"{redis_key}:heavy"))
+
+
+_written_stages_keys: ContextVar[set[str] | None] = ContextVar(
+    "written_stages_keys", default=None
+)
 
-    if redis_data := await redis.get(f"{redis_key}:heavy"):
-        return cast(RayshiftRedisData, pickle.loads(zstd_decompress(redis_data)))
 
-    return None
+@contextmanager
+def record_stages_cache_writes() -> Iterator[set[str]]:
+    """Collect the keys written by `set_stages_cache` inside the block"""
+    written_keys: set[str] = set()
+    token = _written_stages_keys.set(written_keys)
+    try:
+        yield written_keys
+    finally:
+        _written_stages_keys.reset(token)
 
 
 async def set_stages_cache(
@@ -69,8 +121,13 @@ async def set_stages_cache(
         redis_key = f"{redis_key}:heavy"
 
     redis_data = zstd_compress(pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+    if (written_keys := _written_stages_keys.get()) is not None:
+        written_keys.add(redis_key)
 
     if ttl is None:
         await redis.set(redis_key, redis_data)
     else:
-        await redis.set(redis_key, redis_data, ex=ttl)
+        # Keep the data for the stale-while-revalidate window
+        await redis.set(
+            redis_key, redis_data, ex=ttl + settings.quest_stale_cache_length
+        )
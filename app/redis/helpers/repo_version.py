@@ -22,3 +22,15 @@ async def set_repo_version(redis: Redis, region: Region, repo_info: RepoInfo) ->
     redis_key = f"{settings.redis_prefix}:repo_version:{region.name}"
     redis_data = repo_info.json()
     await redis.set(redis_key, redis_data)
+
+
+async def get_data_version(redis: Redis, region: Region) -> Optional[str]:
+    """Changes whenever the cache of the region has been refreshed after an update"""
+    redis_key = f"{settings.redis_prefix}:data_version:{region.name}"
+    data_version = await redis.get(redis_key)
+    return data_version.decode() if data_version else None
+
+
+async def set_data_version(redis: Redis, region: Region, data_version: str) -> None:
+    redis_key = f"{settings.redis_prefix}:data_version:{region.name}"
+    await redis.set(redis_key, data_version)
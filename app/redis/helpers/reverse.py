@@ -2,10 +2,12 @@ from enum import StrEnum
 
 import orjson
 
+from ...cache_tags import mark_untracked
 from ...config import Settings
 from ...schemas.common import Region
 from ...zstd import zstd_decompress
 from .. import Redis
+from .data import get_data_field
 
 
 settings = Settings()
@@ -25,8 +27,9 @@ class RedisReverse(StrEnum):
 async def get_reverse_ids(
     redis: Redis, region: Region, reverse_type: RedisReverse, item_id: int
 ) -> list[int]:
+    mark_untracked()
     redis_key = f"{settings.redis_prefix}:data:{region.name}:{reverse_type.name}"
-    item_redis = await redis.hget(redis_key, str(item_id))
+    item_redis = await get_data_field(redis, redis_key, str(item_id))
 
     if item_redis:
         id_list: list[int] = orjson.loads(zstd_decompress(item_redis))
@@ -0,0 +1,173 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from typing import Any, AsyncIterator, Awaitable, Callable
+from uuid import uuid4
+
+from ...config import Settings, logger
+from .. import Redis
+
+
+settings = Settings()
+
+
+SINGLE_FLIGHT_CHANNEL = f"{settings.redis_prefix}:single_flight"
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+else
+    return 0
+end
+"""
+POLL_INTERVAL = 0.5
+
+
+# Flights started by this process, awaited by the other requests of the same key
+_in_flight: dict[str, asyncio.Future[None]] = {}
+# Release notifications of the flights started by other workers
+_released: dict[str, asyncio.Event] = {}
+# Background refreshes started by this process
+_refreshes: dict[str, asyncio.Task[None]] = {}
+
+
+def get_lock_key(key: str) -> str:
+    return f"{settings.redis_prefix}:single_flight:{key}"
+
+
+async def refresh_lock(redis: Redis, lock_key: str) -> None:  # pragma: no cover
+    timeout = settings.single_flight_lock_timeout
+    while True:
+        await asyncio.sleep(timeout / 3)
+        await redis.expire(lock_key, timeout)
+
+
+async def acquire_lock(redis: Redis, lock_key: str, token: str) -> bool:
+    return bool(
+        await redis.set(
+            lock_key, token, nx=True, ex=settings.single_flight_lock_timeout
+        )
+    )
+
+
+async def release_lock(
+    redis: Redis, key: str, lock_key: str, token: str
+) -> None:  # pragma: no cover
+    try:
+        await redis.eval(RELEASE_LOCK_SCRIPT, 1, lock_key, token)  # type: ignore[no-untyped-call]
+        await redis.publish(SINGLE_FLIGHT_CHANNEL, key)
+    except Exception:  # noqa: BLE001
+        logger.warning(f"Error releasing single flight lock '{key}'", exc_info=True)
+
+
+async def wait_for_release(redis: Redis, key: str, lock_key: str) -> None:
+    """Wait until the other worker releases the lock.
+
+    The release is published on `SINGLE_FLIGHT_CHANNEL` but the lock is also
+    polled in case the notification is missed or the holder died.
+    """
+    event = _released.setdefault(key, asyncio.Event())
+    try:
+        while await redis.exists(lock_key):
+            with suppress(TimeoutError):
+                await asyncio.wait_for(event.wait(), POLL_INTERVAL)
+    finally:
+        _released.pop(key, None)
+
+
+@asynccontextmanager
+async def single_flight(redis: Redis | None, key: str) -> AsyncIterator[None]:
+    """Run the block for one request of the key at a time.
+
+    The other requests of the key wait until the first one is done and then run
+    the block themselves, which should find the result in the cache by then.
+    Requests in the same process wait on a shared future. Requests in other
+    workers wait on a short Redis lock. Without a redis client only the requests
+    in the same process are coalesced.
+    """
+    if (leader := _in_flight.get(key)) is not None:
+        await asyncio.shield(leader)
+        yield
+        return
+
+    flight = asyncio.get_running_loop().create_future()
+    _in_flight[key] = flight
+    lock_key = get_lock_key(key)
+    token = uuid4().hex
+    lock_acquired = False
+    refresh_task: asyncio.Task[None] | None = None
+
+    try:
+        if redis is not None:
+            try:
+                lock_acquired = await acquire_lock(redis, lock_key, token)
+                if lock_acquired:
+                    refresh_task = asyncio.create_task(refresh_lock(redis, lock_key))
+                else:
+                    await wait_for_release(redis, key, lock_key)
+            except Exception:  # noqa: BLE001
+                logger.warning(
+                    f"Error getting single flight lock '{key}'", exc_info=True
+                )
+
+        yield
+    finally:
+        if refresh_task is not None:
+            refresh_task.cancel()
+        if redis is not None and lock_acquired:
+            await release_lock(redis, key, lock_key, token)
+        del _in_flight[key]
+        flight.set_result(None)
+
+
+async def run_refresh(
+    redis: Redis | None, key: str, refresh: Callable[[], Awaitable[Any]]
+) -> None:  # pragma: no cover
+    lock_key = get_lock_key(f"{key}:refresh")
+    token = uuid4().hex
+    refresh_task: asyncio.Task[None] | None = None
+    if redis is not None:
+        if not await acquire_lock(redis, lock_key, token):
+            return
+        refresh_task = asyncio.create_task(refresh_lock(redis, lock_key))
+
+    try:
+        await refresh()
+    except Exception:  # noqa: BLE001
+        logger.exception(f"Failed to refresh '{key}'")
+    finally:
+        if refresh_task is not None:
+            refresh_task.cancel()
+        if redis is not None:
+            await release_lock(redis, f"{key}:refresh", lock_key, token)
+
+
+def refresh_in_background(
+    redis: Redis | None, key: str, refresh: Callable[[], Awaitable[Any]]
+) -> None:
+    """Run `refresh` in a background task unless the key is already refreshing.
+
+    A short Redis lock makes sure only one worker refreshes the key.
+    """
+    if key in _refreshes:
+        return
+
+    task = asyncio.create_task(run_refresh(redis, key, refresh))
+    _refreshes[key] = task
+    task.add_done_callback(lambda _: _refreshes.pop(key, None))
+
+
+async def listen_single_flight_release(redis: Redis) -> None:  # pragma: no cover
+    """Wake up the requests waiting for flights of other workers"""
+    while True:
+        try:
+            async with redis.pubsub() as pubsub:
+                await pubsub.subscribe(SINGLE_FLIGHT_CHANNEL)
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    if event := _released.get(message["data"].decode()):
+                        event.set()
+        except asyncio.CancelledError:
+            raise
+        except Exception:  # noqa: BLE001
+            logger.warning("Single flight listener disconnected", exc_info=True)
+            await asyncio.sleep(POLL_INTERVAL)
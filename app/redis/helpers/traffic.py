@@ -0,0 +1,104 @@
+import asyncio
+from collections import Counter
+from urllib.parse import urlencode
+
+from fastapi.dependencies.utils import get_flat_dependant
+from fastapi.routing import APIRoute
+from starlette.requests import Request
+
+from ...config import Settings, logger
+from .. import Redis
+
+
+settings = Settings()
+
+
+TRAFFIC_KEY = f"{settings.redis_prefix}:traffic"
+RECORDED_PATH_PREFIXES = ("/nice/", "/basic/", "/raw/")
+CACHE_WARMER_HEADER = "x-cache-warmer"
+TRAFFIC_FLUSH_INTERVAL = 60
+# Requests with new keys are dropped once this many are waiting for the next flush
+MAX_PENDING_TRAFFIC_KEYS = 10000
+
+
+_route_query_params: dict[str, frozenset[str]] = {}
+
+
+def get_route_query_params(route: APIRoute) -> frozenset[str]:
+    if route.unique_id not in _route_query_params:
+        _route_query_params[route.unique_id] = frozenset(
+            param.alias for param in get_flat_dependant(route.dependant).query_params
+        )
+    return _route_query_params[route.unique_id]
+
+
+def get_traffic_key(request: Request) -> str | None:
+    """Normalized `path?query` of the requests worth replaying, or None.
+
+    Only the query parameters known to the route are kept.
+    """
+    if request.method != "GET" or CACHE_WARMER_HEADER in request.headers:
+        return None
+    if not request.url.path.startswith(RECORDED_PATH_PREFIXES):
+        return None
+    route = request.scope.get("route")
+    if not isinstance(route, APIRoute):
+        return None
+    route_params = get_route_query_params(route)
+    query = urlencode(
+        sorted(
+            (name, value)
+            for name, value in request.query_params.multi_items()
+            if name in route_params
+        )
+    )
+    return f"{request.url.path}?{query}" if query else request.url.path
+
+
+_pending_traffic: Counter[str] = Counter()
+
+
+def record_traffic(traffic_key: str) -> None:
+    """Count a request in the worker, the counts are sent to Redis by
+    `flush_traffic_periodically`"""
+    if (
+        traffic_key in _pending_traffic
+        or len(_pending_traffic) < MAX_PENDING_TRAFFIC_KEYS
+    ):
+        _pending_traffic[traffic_key] += 1
+
+
+async def flush_traffic(redis: Redis, max_keys: int) -> None:
+    pending = dict(_pending_traffic)
+    _pending_traffic.clear()
+    async with redis.pipeline() as pipe:
+        for traffic_key, hits in pending.items():
+            pipe.zincrby(TRAFFIC_KEY, hits, traffic_key)
+        pipe.zremrangebyrank(TRAFFIC_KEY, 0, -max_keys - 1)
+        await pipe.execute()
+
+
+async def flush_traffic_periodically(
+    redis: Redis, max_keys: int
+) -> None:  # pragma: no cover
+    """Add the request counts of the worker to Redis and trim the tail every
+    `TRAFFIC_FLUSH_INTERVAL` seconds"""
+    while True:
+        await asyncio.sleep(TRAFFIC_FLUSH_INTERVAL)
+        try:
+            await flush_traffic(redis, max_keys)
+        except Exception:  # noqa: BLE001
+            logger.warning("Failed to record traffic", exc_info=True)
+
+
+async def get_top_traffic(redis: Redis, count: int) -> list[str]:
+    top_keys = await redis.zrevrange(TRAFFIC_KEY, 0, count - 1)
+    return [key.decode() for key in top_keys]
+
+
+async def decay_traffic(redis: Redis, max_keys: int) -> None:  # pragma: no cover
+    """Halve the hit counts so recent traffic weighs more and drop the tail"""
+    async with redis.pipeline() as pipe:
+        pipe.zunionstore(TRAFFIC_KEY, {TRAFFIC_KEY: 0.5})
+        pipe.zremrangebyrank(TRAFFIC_KEY, 0, -max_keys - 1)
+        await pipe.execute()
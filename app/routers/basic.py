@@ -1,8 +1,8 @@
 from typing import Optional
 
 from fastapi import APIRouter, Depends, Response
-from fastapi_cache.decorator import cache
 
+from ..cache import cache
 from ..config import Settings
 from ..core import basic, search
 from ..db.helpers.cc import get_cc_id
@@ -551,7 +551,11 @@ async def get_buff(
     response_model_exclude_unset=True,
     responses=get_error_code([400, 403]),
 )
-@cache(expire=settings.quest_cache_length)
+@cache(
+    expire=settings.quest_cache_length,
+    stale_ttl=settings.quest_stale_cache_length,
+    etag=False,
+)
 async def find_event(
     search_param: EventSearchQueryParams = Depends(EventSearchQueryParams),
     lang: Language = Depends(language_parameter),
@@ -612,7 +616,11 @@ async def get_war(
     response_model=list[BasicQuestPhase],
     response_model_exclude_unset=True,
 )
-@cache(expire=settings.quest_cache_length)
+@cache(
+    expire=settings.quest_cache_length,
+    stale_ttl=settings.quest_stale_cache_length,
+    etag=False,
+)
 async def get_latest_quest_phase_with_enemies(
     region: Region,
     lang: Language = Depends(language_parameter),
@@ -632,7 +640,11 @@ async def get_latest_quest_phase_with_enemies(
     response_model_exclude_unset=True,
     responses=get_error_code([400, 403]),
 )
-@cache(expire=settings.quest_cache_length)
+@cache(
+    expire=settings.quest_cache_length,
+    stale_ttl=settings.quest_stale_cache_length,
+    etag=False,
+)
 async def find_quest_phase(
     search_param: QuestSearchQueryParams = Depends(QuestSearchQueryParams),
     lang: Language = Depends(language_parameter),
@@ -4,7 +4,7 @@ from typing import AsyncGenerator, Optional
 from fastapi import HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncConnection
 
-from ..db.engine import async_engines
+from ..db.engine import async_engines, get_read_engine
 from ..redis import Redis
 from ..schemas.common import Language, Region
 
@@ -21,7 +21,7 @@ async def language_parameter(lang: Optional[Language] = None) -> Language:
 async def get_db(region: Region) -> AsyncGenerator[AsyncConnection, None]:
     if region not in async_engines:  # pragma: no cover
         raise HTTPException(status_code=404, detail="Region not found")
-    async with async_engines[region].connect() as connection:
+    async with get_read_engine(region).connect() as connection:
         connection.info["region"] = region
         yield connection
 
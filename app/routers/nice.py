@@ -1,8 +1,10 @@
+from contextlib import AbstractAsyncContextManager, nullcontext
+
 from fastapi import APIRouter, Depends, HTTPException, Query, Response
-from fastapi_cache.decorator import cache
 
+from ..cache import cache
 from ..config import Settings, logger
-from ..core import search
+from ..core import raw, search
 from ..core.nice import (
     ai,
     battle_message,
@@ -24,10 +26,15 @@ from ..core.nice.common_release import get_nice_common_releases_from_id
 from ..core.nice.event.event import get_nice_event
 from ..core.nice.event.mission import get_nice_event_mission
 from ..core.nice.event.shop import get_nice_shop_from_raw, get_nice_shops_from_raw
+from ..core.nice.func import use_preloaded_depend_funcs
+from ..core.nice.pool import NiceServantJob, get_nice_servants_json
+from ..core.nice.prebuilt import use_prebuilt_functions
 from ..core.nice.script import get_nice_script_search_result
 from ..db.helpers.cc import get_cc_id
 from ..db.helpers.svt import get_ce_id, get_svt_id
 from ..redis import Redis
+from ..redis.helpers.quest import get_redis_cache_key, has_stages_cache
+from ..redis.helpers.single_flight import single_flight
 from ..schemas.common import Language, Region, ReverseData, ReverseDepth
 from ..schemas.enums import AiType
 from ..schemas.nice import (
@@ -73,7 +80,7 @@ from ..schemas.search import (
     TdSearchParams,
 )
 from .deps import get_db, get_db_transaction, get_redis, language_parameter
-from .utils import get_error_code, item_response, list_response
+from .utils import get_error_code, item_response, json_list_response, list_response
 
 
 settings = Settings()
@@ -105,14 +112,20 @@ async def find_servant(
         if not search_param.excludeCollectionNo:
             search_param.excludeCollectionNo = [0]
         matches = await search.search_servant(conn, search_param)
-        return list_response(
-            [
-                await nice.get_nice_servant_model(
-                    conn, search_param.region, mstSvt.id, lang, lore, mstSvt
-                )
-                for mstSvt in matches
-            ]
+        raw_svts = await raw.get_servant_entities(
+            conn, [mstSvt.id for mstSvt in matches], True, lore, matches
         )
+        job = NiceServantJob(
+            region=search_param.region,
+            lang=lang,
+            lore=lore,
+            equip=False,
+            raw_svts=raw_svts,
+            depend_funcs=await nice.preload_servant_depend_funcs(conn, raw_svts),
+            prebuilt=await nice.load_servant_prebuilt_functions(conn, raw_svts, lang),
+        )
+    # The connection is back in the pool during the CPU-bound conversion
+    return json_list_response(await get_nice_servants_json(job))
 
 
 get_servant_description = """Get servant info from ID
@@ -152,8 +165,14 @@ async def get_servant(
 ) -> Response:
     async with get_db(region) as conn:
         servant_id = await get_svt_id(conn, servant_id)
+        raw_svt = await raw.get_servant_entity(conn, servant_id, True, lore)
+        depend_funcs = await nice.preload_servant_depend_funcs(conn, [raw_svt])
+        prebuilt = await nice.load_servant_prebuilt_functions(conn, [raw_svt], lang)
+    with use_preloaded_depend_funcs(depend_funcs), use_prebuilt_functions(prebuilt):
         return item_response(
-            await nice.get_nice_servant_model(conn, region, servant_id, lang, lore)
+            await nice.get_nice_servant_model(
+                conn, region, servant_id, lang, lore, raw_svt=raw_svt
+            )
         )
 
 
@@ -179,14 +198,20 @@ async def find_equip(
 ) -> Response:
     async with get_db(search_param.region) as conn:
         matches = await search.search_equip(conn, search_param)
-        return list_response(
-            [
-                await nice.get_nice_equip_model(
-                    conn, search_param.region, mstSvt.id, lang, lore, mstSvt
-                )
-                for mstSvt in matches
-            ]
+        raw_svts = await raw.get_servant_entities(
+            conn, [mstSvt.id for mstSvt in matches], True, lore, matches
+        )
+        job = NiceServantJob(
+            region=search_param.region,
+            lang=lang,
+            lore=lore,
+            equip=True,
+            raw_svts=raw_svts,
+            depend_funcs=await nice.preload_servant_depend_funcs(conn, raw_svts),
+            prebuilt=await nice.load_servant_prebuilt_functions(conn, raw_svts, lang),
         )
+    # The connection is back in the pool during the CPU-bound conversion
+    return json_list_response(await get_nice_servants_json(job))
 
 
 get_equip_description = """Get CE info from ID
@@ -226,8 +251,14 @@ async def get_equip(
 ) -> Response:
     async with get_db(region) as conn:
         equip_id = await get_ce_id(conn, equip_id)
+        raw_svt = await raw.get_servant_entity(conn, equip_id, True, lore)
+        depend_funcs = await nice.preload_servant_depend_funcs(conn, [raw_svt])
+        prebuilt = await nice.load_servant_prebuilt_functions(conn, [raw_svt], lang)
+    with use_preloaded_depend_funcs(depend_funcs), use_prebuilt_functions(prebuilt):
         return item_response(
-            await nice.get_nice_equip_model(conn, region, equip_id, lang, lore)
+            await nice.get_nice_equip_model(
+                conn, region, equip_id, lang, lore, raw_svt=raw_svt
+            )
         )
 
 
@@ -248,17 +279,28 @@ async def find_svt(
 ) -> Response:
     async with get_db(search_param.region) as conn:
         matches = await search.search_servant(conn, search_param)
-        out: list[NiceServant] = []
-        for mstSvt in matches:
+        raw_svts = await raw.get_servant_entities(
+            conn, [mstSvt.id for mstSvt in matches], True, lore, matches
+        )
+        depend_funcs = await nice.preload_servant_depend_funcs(conn, raw_svts)
+        prebuilt = await nice.load_servant_prebuilt_functions(conn, raw_svts, lang)
+    out: list[NiceServant] = []
+    with use_preloaded_depend_funcs(depend_funcs), use_prebuilt_functions(prebuilt):
+        for raw_svt in raw_svts:
             try:
                 out.append(
                     await nice.get_nice_servant_model(
-                        conn, search_param.region, mstSvt.id, lang, lore, mstSvt
+                        conn,
+                        search_param.region,
+                        raw_svt.mstSvt.id,
+                        lang,
+                        lore,
+                        raw_svt=raw_svt,
                     )
                 )
             except HTTPException:
-                logger.warning(f"Failed to get basic servant of {mstSvt}")
-        return list_response(out)
+                logger.warning(f"Failed to get basic servant of {raw_svt.mstSvt}")
+    return list_response(out)
 
 
 @router.get(
@@ -283,8 +325,14 @@ async def get_svt(
     The endpoint is not limited to servants or equips ids.
     """
     async with get_db(region) as conn:
+        raw_svt = await raw.get_servant_entity(conn, svt_id, True, lore)
+        depend_funcs = await nice.preload_servant_depend_funcs(conn, [raw_svt])
+        prebuilt = await nice.load_servant_prebuilt_functions(conn, [raw_svt], lang)
+    with use_preloaded_depend_funcs(depend_funcs), use_prebuilt_functions(prebuilt):
         return item_response(
-            await nice.get_nice_servant_model(conn, region, svt_id, lang, lore)
+            await nice.get_nice_servant_model(
+                conn, region, svt_id, lang, lore, raw_svt=raw_svt
+            )
         )
 
 
@@ -776,7 +824,11 @@ async def get_event(
     response_model_exclude_unset=True,
     responses=get_error_code([404, 500]),
 )
-@cache(expire=settings.quest_cache_length)
+@cache(
+    expire=settings.quest_cache_length,
+    stale_ttl=settings.quest_stale_cache_length,
+    etag=False,
+)
 async def get_war(
     region: Region,
     war_id: int,
@@ -811,12 +863,19 @@ async def get_quest_phase(
     lang: Language = Depends(language_parameter),
     hash: str | None = None,
 ) -> Response:
-    async with get_db_transaction(region) as conn:
-        return item_response(
-            await quest.get_nice_quest_phase(
-                conn, redis, region, quest_id, phase, lang, hash
+    stage_cache_key = get_redis_cache_key(region, quest_id, phase, hash, lang)
+    # Only the misses build the stages, the cache is checked again in the flight
+    if await has_stages_cache(redis, stage_cache_key):
+        flight: AbstractAsyncContextManager[None] = nullcontext()
+    else:
+        flight = single_flight(redis, stage_cache_key)
+    async with flight:
+        async with get_db_transaction(region) as conn:
+            return item_response(
+                await quest.get_nice_quest_phase(
+                    conn, redis, region, quest_id, phase, lang, hash
+                )
             )
-        )
 
 
 @router.get(
@@ -827,7 +886,11 @@ async def get_quest_phase(
     response_model_exclude_unset=True,
     responses=get_error_code([404, 500]),
 )
-@cache(expire=settings.quest_cache_length)
+@cache(
+    expire=settings.quest_cache_length,
+    stale_ttl=settings.quest_stale_cache_length,
+    etag=False,
+)
 async def get_quest(
     region: Region,
     quest_id: int,
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, Query, Response
-from fastapi_cache.decorator import cache
 
+from ..cache import cache
 from ..config import Settings
 from ..core import raw, search
 from ..db.helpers.cc import get_cc_id
@@ -85,10 +85,9 @@ async def find_servant(
             search_param.excludeCollectionNo = [0]
         matches = await search.search_servant(conn, search_param)
         return list_response(
-            [
-                await raw.get_servant_entity(conn, mstSvt.id, expand, lore, mstSvt)
-                for mstSvt in matches
-            ]
+            await raw.get_servant_entities(
+                conn, [mstSvt.id for mstSvt in matches], expand, lore, matches
+            )
         )
 
 
@@ -140,10 +139,9 @@ async def find_equip(
     async with get_db(search_param.region) as conn:
         matches = await search.search_equip(conn, search_param)
         return list_response(
-            [
-                await raw.get_servant_entity(conn, mstSvt.id, expand, lore, mstSvt)
-                for mstSvt in matches
-            ]
+            await raw.get_servant_entities(
+                conn, [mstSvt.id for mstSvt in matches], expand, lore, matches
+            )
         )
 
 
@@ -195,10 +193,9 @@ async def find_svt(
     async with get_db(search_param.region) as conn:
         matches = await search.search_servant(conn, search_param)
         return list_response(
-            [
-                await raw.get_servant_entity(conn, mstSvt.id, expand, lore, mstSvt)
-                for mstSvt in matches
-            ]
+            await raw.get_servant_entities(
+                conn, [mstSvt.id for mstSvt in matches], expand, lore, matches
+            )
         )
 
 
@@ -655,7 +652,11 @@ async def get_event(region: Region, event_id: int) -> Response:
     response_model_exclude_unset=True,
     responses=get_error_code([404]),
 )
-@cache(expire=settings.quest_cache_length)
+@cache(
+    expire=settings.quest_cache_length,
+    stale_ttl=settings.quest_stale_cache_length,
+    etag=False,
+)
 async def get_war(region: Region, war_id: int) -> Response:
     """
     Get the war data from the given war ID
@@ -672,7 +673,11 @@ async def get_war(region: Region, war_id: int) -> Response:
     response_model_exclude_unset=True,
     responses=get_error_code([404]),
 )
-@cache(expire=settings.quest_cache_length)
+@cache(
+    expire=settings.quest_cache_length,
+    stale_ttl=settings.quest_stale_cache_length,
+    etag=False,
+)
 async def get_quest_phase(
     region: Region,
     quest_id: int,
@@ -693,7 +698,11 @@ async def get_quest_phase(
     response_model_exclude_unset=True,
     responses=get_error_code([404]),
 )
-@cache(expire=settings.quest_cache_length)
+@cache(
+    expire=settings.quest_cache_length,
+    stale_ttl=settings.quest_stale_cache_length,
+    etag=False,
+)
 async def get_quest(
     region: Region,
     quest_id: int,
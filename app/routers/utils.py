@@ -70,6 +70,13 @@ def list_string_exclude(items: Iterable[BaseModelORJson], exclude: set[str]) ->
     return "[" + all_items + "]"
 
 
+def json_list_response(items: Iterable[str]) -> Response:
+    """
+    Convert list of already dumped json objects to a Starlette Response object.
+    """
+    return Response("[" + ",".join(items) + "]", media_type=JSON_MIME)
+
+
 def list_response(items: Iterable[BaseModelORJson]) -> Response:
     """
     Convert list of model objects to a Starlette Response object.
@@ -2,17 +2,19 @@ import asyncio
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Iterable, Union
+from typing import Any, Awaitable, Callable, Iterable, Union
 
 import aiofiles
 import httpx
 import orjson
 import psutil
+from fastapi import HTTPException
 from fastapi.concurrency import run_in_threadpool
 from git import Repo
-from pydantic import DirectoryPath
+from pydantic import BaseModel, DirectoryPath
 from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
 
+from .cache_tags import FULL_CLEAR_TAG, collect_cache_tags
 from .config import EXTRA_SVT_ID_IN_NICE, Settings, get_app_info, logger, project_root
 from .core.basic import (
     get_all_basic_ccs,
@@ -33,18 +35,50 @@ from .core.nice.item import get_all_nice_items
 from .core.nice.mc import get_all_nice_mcs
 from .core.nice.mm import get_all_nice_mms
 from .core.nice.nice import get_nice_equip_model, get_nice_servant_model
+from .core.nice.prebuilt import (
+    NICE_SKILL_FUNCTIONS_TYPES,
+    NICE_TD_FUNCTIONS_TYPES,
+    dump_nice_functions,
+)
+from .core.nice.quest import regenerate_stages_cache
+from .core.nice.skill import get_nice_skill_functions
+from .core.nice.td import get_nice_td_functions
 from .core.nice.war import get_nice_war
-from .core.raw import get_all_bgm_entities, get_servant_entity
+from .core.raw import (
+    build_event_entity,
+    build_servant_entities,
+    get_all_bgm_entities,
+    get_servant_entities,
+    get_skill_entity_no_reverse_many,
+    get_td_entity_no_reverse_many,
+    get_war_entities,
+)
 from .core.utils import get_translation
+from .data.basic_svt import get_basic_svt_store_path, write_basic_svt_store
 from .data.extra import get_extra_svt_data
 from .db.engine import engines
-from .db.helpers import fetch
+from .db.helpers import cache_tags, entity_cache, fetch
+from .db.helpers.entity_cache import EntityCacheType
 from .db.helpers.gacha import get_all_gacha_entities
 from .db.load import load_pydantic_to_db, update_db
 from .export.constants import export_constants
 from .models.raw import mstSvtExtra
 from .redis import Redis
-from .redis.helpers.repo_version import get_repo_version, set_repo_version
+from .redis.helpers.cache_tags import (
+    clear_cache_tags,
+    get_cache_app_version,
+    get_stale_cache_keys,
+    get_untracked_cache_keys,
+    set_cache_app_version,
+)
+from .redis.helpers.invalidation import CacheInvalidation, publish_cache_invalidation
+from .redis.helpers.quest import parse_redis_cache_key
+from .redis.helpers.repo_version import (
+    get_repo_version,
+    set_data_version,
+    set_repo_version,
+)
+from .redis.helpers.traffic import CACHE_WARMER_HEADER, decay_traffic, get_top_traffic
 from .redis.load import load_redis_data, load_svt_extra_redis
 from .routers.utils import list_string
 from .schemas.base import BaseModelORJson
@@ -59,6 +93,7 @@ from .schemas.nice import (
     NiceMasterMission,
     NiceServant,
     NiceShop,
+    NiceWar,
 )
 from .schemas.raw import (
     AssetStorageLine,
@@ -155,6 +190,12 @@ async def get_nice_svt(
         )
 
 
+# Entities fetched together, bounded to keep the memory in check
+SVT_ENTITY_BATCH_SIZE = 100
+WAR_ENTITY_BATCH_SIZE = 50
+ENTITY_CACHE_INSERT_BATCH_SIZE = 100
+
+
 async def dump_svt(
     util: ExportUtil, file_name: str, svts: list[MstSvt]
 ) -> None:  # pragma: no cover
@@ -167,26 +208,33 @@ async def dump_svt(
     with_lore_en: list[str] = []
     without_lore_en: list[str] = []
 
-    for svt in svts:
-        raw_svt = await get_servant_entity(
-            conn, svt.id, expand=True, lore=True, mstSvt=svt
+    for i in range(0, len(svts), SVT_ENTITY_BATCH_SIZE):
+        batch = svts[i : i + SVT_ENTITY_BATCH_SIZE]
+        raw_svts = await get_servant_entities(
+            conn, [svt.id for svt in batch], expand=True, lore=True, mstSvts=batch
         )
-
-        nice_svt = await get_nice_svt(conn, region, Language.jp, True, raw_svt)
-        with_lore.append(nice_svt.json(exclude_unset=True, exclude_none=True))
-        without_lore.append(
-            nice_svt.json(exclude={"profile"}, exclude_unset=True, exclude_none=True)
-        )
-
-        if region == Region.JP:
-            nice_svt_en = await get_nice_svt(conn, region, Language.en, True, raw_svt)
-            with_lore_en.append(nice_svt_en.json(exclude_unset=True, exclude_none=True))
-            without_lore_en.append(
-                nice_svt_en.json(
+        for raw_svt in raw_svts:
+            nice_svt = await get_nice_svt(conn, region, Language.jp, True, raw_svt)
+            with_lore.append(nice_svt.json(exclude_unset=True, exclude_none=True))
+            without_lore.append(
+                nice_svt.json(
                     exclude={"profile"}, exclude_unset=True, exclude_none=True
                 )
             )
 
+            if region == Region.JP:
+                nice_svt_en = await get_nice_svt(
+                    conn, region, Language.en, True, raw_svt
+                )
+                with_lore_en.append(
+                    nice_svt_en.json(exclude_unset=True, exclude_none=True)
+                )
+                without_lore_en.append(
+                    nice_svt_en.json(
+                        exclude={"profile"}, exclude_unset=True, exclude_none=True
+                    )
+                )
+
     out_name = export_path / f"{file_name}.json"
     out_lore_name = export_path / f"{file_name}_lore.json"
 
@@ -275,9 +323,16 @@ async def dump_nice_mms(
 async def dump_nice_wars(
     util: ExportUtil, wars: list[MstWar]
 ) -> None:  # pragma: no cover
-    all_war_data = [
-        await get_nice_war(util.conn, util.region, war.id, util.lang) for war in wars
-    ]
+    all_war_data: list[NiceWar] = []
+    for i in range(0, len(wars), WAR_ENTITY_BATCH_SIZE):
+        batch = wars[i : i + WAR_ENTITY_BATCH_SIZE]
+        raw_wars = await get_war_entities(util.conn, [war.id for war in batch], batch)
+        all_war_data += [
+            await get_nice_war(
+                util.conn, util.region, raw_war.mstWar.id, util.lang, raw_war
+            )
+            for raw_war in raw_wars
+        ]
     await util.dump_orjson("nice_war", all_war_data)
 
 
@@ -653,35 +708,135 @@ async def update_master_repo_info(
             await set_repo_version(redis, region, repo_info)
 
 
+async def get_changed_cache_tags(
+    redis: Redis,
+    region_path: dict[Region, DirectoryPath],
+    async_engines: dict[Region, AsyncEngine],
+) -> dict[Region, set[str]]:  # pragma: no cover
+    """Tags changed by the last import. A full clear is needed without the
+    Postgres import or when the app version changed since the keys were cached."""
+    app_version = get_app_info().hash
+    changed_tags: dict[Region, set[str]] = {}
+
+    for region in region_path:
+        tags = {FULL_CLEAR_TAG}
+        if settings.write_postgres_data:
+            async with async_engines[region].connect() as conn:
+                tags = await cache_tags.get_changed_cache_tags(conn)
+        if await get_cache_app_version(redis, region.value) != app_version:
+            tags.add(FULL_CLEAR_TAG)
+        changed_tags[region] = tags
+
+    return changed_tags
+
+
+async def clear_changed_cache_tags(
+    redis: Redis,
+    changed_tags: dict[Region, set[str]],
+    async_engines: dict[Region, AsyncEngine],
+) -> None:  # pragma: no cover
+    app_version = get_app_info().hash
+
+    for region, tags in changed_tags.items():
+        stale_keys = await get_stale_cache_keys(redis, region.value, tags)
+        await clear_cache_tags(redis, region.value, tags, stale_keys)
+        await set_cache_app_version(redis, region.value, app_version)
+        if settings.write_postgres_data:
+            async with async_engines[region].begin() as conn:
+                await cache_tags.clear_changed_cache_tags(conn, tags)
+
+
+async def get_keys_to_clear(
+    redis: Redis, region: Region, keys: list[bytes], tags: set[str] | None
+) -> list[bytes]:  # pragma: no cover
+    """Tracked keys are kept unless they are tagged with a changed tag"""
+    if tags is None or FULL_CLEAR_TAG in tags:
+        return keys
+
+    keys_to_clear = await get_stale_cache_keys(redis, region.value, tags)
+    for i in range(0, len(keys), 1000):
+        keys_to_clear.update(
+            await get_untracked_cache_keys(redis, region.value, keys[i : i + 1000])
+        )
+    return [key for key in keys if key in keys_to_clear]
+
+
 async def clear_redis_cache(
     redis: Redis,
     region_path: dict[Region, DirectoryPath],
-    clear_heavy_quests: bool = False,
+    changed_tags: dict[Region, set[str]] | None = None,
 ) -> None:  # pragma: no cover
     key_count = 0
 
     for region in region_path:
         key_pattern = f"{settings.redis_prefix}:cache:{region.value}*"
-        async for key in redis.scan_iter(match=key_pattern):
-            if (clear_heavy_quests and b"heavy" in key) or (
-                not clear_heavy_quests and b"heavy" not in key
-            ):
-                if clear_heavy_quests:
-                    while (load := psutil.cpu_percent()) > 25:
-                        logger.warning(f"Load too heavy {load}")
-                        await asyncio.sleep(15)
-
-                await redis.delete(key)
-                key_count += 1
-
-                if clear_heavy_quests:
-                    await asyncio.sleep(5)
+        keys = [
+            key
+            async for key in redis.scan_iter(match=key_pattern)
+            if b"heavy" not in key
+        ]
+        region_tags = changed_tags.get(region) if changed_tags is not None else None
+        for key in await get_keys_to_clear(redis, region, keys, region_tags):
+            await redis.delete(key)
+            key_count += 1
 
     async for key in redis.scan_iter(match=f"{settings.redis_prefix}:cache::*"):
         await redis.delete(key)
         key_count += 1
 
-    logger.info(f"Cleared {key_count} cache redis keys. {clear_heavy_quests=}")
+    logger.info(f"Cleared {key_count} cache redis keys.")
+
+
+async def regenerate_heavy_quests(
+    redis: Redis,
+    region_path: dict[Region, DirectoryPath],
+    changed_tags: dict[Region, set[str]] | None = None,
+) -> None:  # pragma: no cover
+    """Rebuild the heavy quest caches in place instead of deleting them.
+
+    The quests are rebuilt one at a time while the CPU usage is below
+    `HEAVY_QUEST_CPU_LIMIT` so they are never served cold.
+    """
+    logger.info("Regenerating heavy quests …")
+    start_regenerating_time = time.perf_counter()
+    key_count = 0
+
+    for region in region_path:
+        key_pattern = f"{settings.redis_prefix}:cache:{region.value}:stage_data:*"
+        keys = [
+            key
+            async for key in redis.scan_iter(match=key_pattern)
+            if key.endswith(b":heavy")
+        ]
+        region_tags = changed_tags.get(region) if changed_tags is not None else None
+        for key in await get_keys_to_clear(redis, region, keys, region_tags):
+            stages_key = parse_redis_cache_key(key)
+            if stages_key is None:
+                await redis.delete(key)
+                continue
+
+            while (load := psutil.cpu_percent()) > settings.heavy_quest_cpu_limit:
+                logger.debug(f"Load too heavy to regenerate quests {load}")
+                await asyncio.sleep(15)
+
+            _, quest_id, phase, quest_hash, lang = stages_key
+            await regenerate_stages_cache(
+                redis, region, quest_id, phase, lang, quest_hash
+            )
+            key_count += 1
+
+    regenerating_time = time.perf_counter() - start_regenerating_time
+    logger.info(f"Regenerated {key_count} heavy quests in {regenerating_time:.2f}s.")
+
+
+async def update_data_version(
+    redis: Redis, region_path: dict[Region, DirectoryPath]
+) -> str:  # pragma: no cover
+    """Change the ETags of the cached responses once the stale keys are cleared"""
+    data_version = str(time.time_ns())
+    for region in region_path:
+        await set_data_version(redis, region, data_version)
+    return data_version
 
 
 async def load_svt_extra(
@@ -697,11 +852,192 @@ async def load_svt_extra(
                 load_pydantic_to_db(conn, svtExtras, mstSvtExtra)
         if settings.write_redis_data:
             await load_svt_extra_redis(redis, region, svtExtras)
+        if (store_path := get_basic_svt_store_path(region)) is not None:
+            write_basic_svt_store(store_path, svtExtras)
 
     extra_loading_time = time.perf_counter() - start_loading_time
     logger.info(f"Loaded extra svt data in {extra_loading_time:.2f}s.")
 
 
+EntityBuilder = Callable[
+    [AsyncConnection, int], Awaitable[BaseModel | dict[str, Any] | None]
+]
+
+
+async def get_entity_cache_row(
+    conn: AsyncConnection, entity_id: int, build: EntityBuilder
+) -> dict[str, Any] | None:  # pragma: no cover
+    """Build the entity and record the tags of the rows it was built from"""
+    with collect_cache_tags() as collector:
+        try:
+            entity = await build(conn, entity_id)
+        except HTTPException:
+            logger.warning(f"Failed to build the cached entity {entity_id}")
+            return None
+    if entity is None:
+        return None
+    return {
+        "id": entity_id,
+        "entity": (
+            entity.model_dump(mode="json", exclude_unset=True)
+            if isinstance(entity, BaseModel)
+            else entity
+        ),
+        "tags": sorted(collector.tags),
+        "tracked": collector.tracked,
+    }
+
+
+async def build_cached_entities(
+    conn: AsyncConnection,
+    entity_type: EntityCacheType,
+    entity_ids: list[int],
+    build: EntityBuilder,
+) -> None:  # pragma: no cover
+    await entity_cache.delete_cached_entities(conn, entity_type)
+    rows: list[dict[str, Any]] = []
+    for entity_id in entity_ids:
+        row = await get_entity_cache_row(conn, entity_id, build)
+        if row is not None:
+            rows.append(row)
+        if len(rows) >= ENTITY_CACHE_INSERT_BATCH_SIZE:
+            await entity_cache.insert_cached_entities(conn, entity_type, rows)
+            rows = []
+    await entity_cache.insert_cached_entities(conn, entity_type, rows)
+
+
+async def build_cached_svt(
+    conn: AsyncConnection, svt_id: int
+) -> ServantEntity | None:  # pragma: no cover
+    svt_entities = await build_servant_entities(conn, [svt_id], expand=True)
+    return svt_entities[0] if svt_entities else None
+
+
+async def build_cached_svt_lore(
+    conn: AsyncConnection, svt_id: int
+) -> ServantEntity | None:  # pragma: no cover
+    svt_entities = await build_servant_entities(conn, [svt_id], expand=True, lore=True)
+    return svt_entities[0] if svt_entities else None
+
+
+def get_nice_skill_functions_builder(
+    region: Region, lang: Language
+) -> EntityBuilder:  # pragma: no cover
+    async def build(conn: AsyncConnection, skill_id: int) -> dict[str, Any] | None:
+        skill_entities = await get_skill_entity_no_reverse_many(
+            conn, [skill_id], expand=True
+        )
+        if not skill_entities:
+            return None
+        return dump_nice_functions(
+            await get_nice_skill_functions(conn, skill_entities[0], region, lang)
+        )
+
+    return build
+
+
+def get_nice_td_functions_builder(
+    region: Region, lang: Language
+) -> EntityBuilder:  # pragma: no cover
+    async def build(conn: AsyncConnection, td_id: int) -> dict[str, Any] | None:
+        td_entities = await get_td_entity_no_reverse_many(conn, [td_id], expand=True)
+        if not td_entities:
+            return None
+        return dump_nice_functions(
+            await get_nice_td_functions(conn, td_entities[0], region, lang)
+        )
+
+    return build
+
+
+async def update_entity_cache(
+    region_path: dict[Region, DirectoryPath],
+    async_engines: dict[Region, AsyncEngine],
+) -> None:  # pragma: no cover
+    """Build the servant and event entities and the nice functions of the servants'
+    skills and NPs once so the requests read one row per entity instead of
+    assembling it from the master tables"""
+    logger.info("Updating entity cache …")
+    start_loading_time = time.perf_counter()
+
+    for region in region_path:
+        # The entities are swapped in one transaction
+        async with async_engines[region].begin() as conn:
+            svt_ids = await entity_cache.get_entity_cache_svt_ids(conn)
+            await build_cached_entities(
+                conn, EntityCacheType.SERVANT, svt_ids, build_cached_svt
+            )
+            await build_cached_entities(
+                conn, EntityCacheType.SERVANT_LORE, svt_ids, build_cached_svt_lore
+            )
+            await build_cached_entities(
+                conn,
+                EntityCacheType.EVENT,
+                await entity_cache.get_entity_cache_event_ids(conn),
+                build_event_entity,
+            )
+            skill_ids = await entity_cache.get_entity_cache_skill_ids(conn)
+            td_ids = await entity_cache.get_entity_cache_td_ids(conn)
+            for lang in Language:
+                await build_cached_entities(
+                    conn,
+                    NICE_SKILL_FUNCTIONS_TYPES[lang],
+                    skill_ids,
+                    get_nice_skill_functions_builder(region, lang),
+                )
+                await build_cached_entities(
+                    conn,
+                    NICE_TD_FUNCTIONS_TYPES[lang],
+                    td_ids,
+                    get_nice_td_functions_builder(region, lang),
+                )
+
+    entity_cache_time = time.perf_counter() - start_loading_time
+    logger.info(f"Updated entity cache in {entity_cache_time:.2f}s.")
+
+
+async def warm_cache(
+    redis: Redis, region_path: dict[Region, DirectoryPath]
+) -> None:  # pragma: no cover
+    """Request the most requested endpoints again so they are cached. The requests go
+    through the served URL so they are spread over the workers instead of blocking the
+    one running the update."""
+    logger.info("Warming cache …")
+    start_warming_time = time.perf_counter()
+
+    regions = {region.value for region in region_path}
+    traffic_keys = [
+        traffic_key
+        for traffic_key in await get_top_traffic(redis, settings.cache_warmer_count)
+        if traffic_key.split("/")[2] in regions
+    ]
+    semaphore = asyncio.Semaphore(settings.cache_warmer_concurrency)
+
+    async with httpx.AsyncClient(
+        base_url=settings.cache_warmer_url,
+        headers={CACHE_WARMER_HEADER: "1"},
+        timeout=None,
+    ) as client:
+
+        async def warm(traffic_key: str) -> None:
+            async with semaphore:
+                while (load := psutil.cpu_percent()) > settings.cache_warmer_cpu_limit:
+                    logger.debug(f"Load too heavy to warm cache {load}")
+                    await asyncio.sleep(1)
+                try:
+                    await client.get(traffic_key)
+                except Exception:  # noqa: BLE001
+                    logger.warning(f"Failed to warm {traffic_key}", exc_info=True)
+
+        # The semaphore is FIFO so the keys are warmed in priority order
+        await asyncio.gather(*(warm(traffic_key) for traffic_key in traffic_keys))
+
+    await decay_traffic(redis, settings.cache_warmer_count * 10)
+
+    warming_time = time.perf_counter() - start_warming_time
+    logger.info(f"Warmed {len(traffic_keys)} cache keys in {warming_time:.2f}s.")
+
+
 async def load_and_export(
     redis: Redis,
     region_path: dict[Region, DirectoryPath],
@@ -716,13 +1052,23 @@ async def load_and_export(
             await update_master_repo_info(redis, region_path)
         if settings.write_postgres_data or settings.write_redis_data:
             await load_svt_extra(redis, region_path)
+            if settings.write_postgres_data and settings.entity_cache:
+                await update_entity_cache(region_path, async_engines)
             if enable_webhook:
                 await report_webhooks(region_path, "load")
     except Exception:  # noqa: BLE001
         logger.exception("Failed to load data")
+    regions = list(region_path)
+    await publish_cache_invalidation(redis, CacheInvalidation(regions))
 
+    changed_tags: dict[Region, set[str]] | None = None
     if settings.clear_redis_cache:
-        await clear_redis_cache(redis, region_path, clear_heavy_quests=False)
+        changed_tags = await get_changed_cache_tags(redis, region_path, async_engines)
+        await clear_redis_cache(redis, region_path, changed_tags=changed_tags)
+    data_version = await update_data_version(redis, region_path)
+    await publish_cache_invalidation(
+        redis, CacheInvalidation(regions, data_version, changed_tags)
+    )
 
     if settings.export_all_nice:
         try:
@@ -732,8 +1078,15 @@ async def load_and_export(
         except Exception:  # noqa: BLE001
             logger.exception("Failed to export data")
 
-    if settings.clear_redis_cache:
-        await clear_redis_cache(redis, region_path, clear_heavy_quests=True)
+    if settings.clear_redis_cache and changed_tags is not None:
+        await regenerate_heavy_quests(redis, region_path, changed_tags=changed_tags)
+        await clear_changed_cache_tags(redis, changed_tags, async_engines)
+
+    if settings.cache_warmer_url and settings.cache_warmer_count > 0:
+        try:
+            await warm_cache(redis, region_path)
+        except Exception:  # noqa: BLE001
+            logger.exception("Failed to warm cache")
 
 
 def update_data_repo(
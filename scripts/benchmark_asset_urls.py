@@ -0,0 +1,79 @@
+import argparse
+import time
+from pathlib import Path
+from typing import Any, Callable
+from unittest.mock import patch
+
+import orjson
+from pydantic import HttpUrl
+
+from app.core.nice.svt import asset
+from app.core.utils import fmt_url
+from app.schemas.base import HttpUrlAdapter
+from app.schemas.common import Region
+from app.schemas.raw import ServantEntity
+
+
+TEST_DATA = Path(__file__).resolve().parents[1] / "tests" / "test_data_raw"
+
+
+def validated_fmt_url(url_fmt: str, **kwargs: Any) -> HttpUrl:
+    """`fmt_url` validating every URL as an `HttpUrl`"""
+    return HttpUrlAdapter.validate_python(url_fmt.format(**kwargs))
+
+
+def load_servant(file_name: str) -> ServantEntity:
+    raw_svt = orjson.loads((TEST_DATA / f"{file_name}.json").read_bytes())
+    # The fixture predates some of the required fields
+    for skill in raw_svt["mstSkill"]:
+        skill.setdefault("mstSvtSkillRelease", [])
+    for td in raw_svt["mstTreasureDevice"]:
+        td.setdefault("mstSvtTreasureDeviceRelease", [])
+    for key in ("mstSvtOverwrite", "mstSvtBattlePoint", "mstBattlePoint"):
+        raw_svt.setdefault(key, [])
+    raw_svt.setdefault("mstBattlePointPhase", [])
+    raw_svt["mstSvtExtra"]["mstSvt"] = raw_svt["mstSvt"]
+    return ServantEntity.model_validate(raw_svt)
+
+
+def time_extra_assets(
+    url_formatter: Callable[..., HttpUrl], raw_svt: ServantEntity, runs: int
+) -> tuple[float, int]:
+    """Average time of a `get_svt_extraAssets` call in microseconds and the number of
+    URLs it formats"""
+    calls = 0
+
+    def counted_url_formatter(url_fmt: str, **kwargs: Any) -> HttpUrl:
+        nonlocal calls
+        calls += 1
+        return url_formatter(url_fmt, **kwargs)
+
+    with patch.object(asset, "fmt_url", counted_url_formatter):
+        asset.get_svt_extraAssets(Region.NA, raw_svt.mstSvt.id, raw_svt, {})
+        calls = 0
+        start = time.perf_counter()
+        for _ in range(runs):
+            asset.get_svt_extraAssets(Region.NA, raw_svt.mstSvt.id, raw_svt, {})
+        elapsed = time.perf_counter() - start
+    return elapsed / runs * 1_000_000, calls // runs
+
+
+def main(runs: int) -> None:
+    raw_svt = load_servant("NA_Tomoe")
+    for name, url_formatter in (
+        ("HttpUrl validation", validated_fmt_url),
+        ("fmt_url", fmt_url),
+    ):
+        call_time, urls = time_extra_assets(url_formatter, raw_svt, runs)
+        print(f"{name:<20} {call_time:8.1f}µs per call, {urls} URLs")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Time get_svt_extraAssets with and without the URL validation."
+    )
+    parser.add_argument("--runs", "-n", help="Calls", type=int, default=2000)
+
+    args = parser.parse_args()
+
+    main(args.runs)
@@ -0,0 +1,100 @@
+import argparse
+import asyncio
+import time
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+from sqlalchemy.sql import select
+
+from app.config import Settings
+from app.db.helpers import fetch
+from app.schemas.common import Region
+from app.schemas.raw import MstItem, MstSvt, MstSvtLimit
+
+
+settings = Settings()
+
+
+SVT_ID = 100100
+ITEM_IDS = [6501, 6502, 6503, 6505, 6507, 6509, 6510, 6511]
+
+
+Fetcher = Callable[[AsyncConnection], Awaitable[Any]]
+
+
+async def inline_get_one(conn: AsyncConnection) -> Any:
+    table, where_col = fetch.schema_map_fetch_one[MstSvt]
+    stmt = select(table).where(where_col == SVT_ID).limit(1)
+    return (await conn.execute(stmt)).first()
+
+
+async def inline_get_all(conn: AsyncConnection) -> Any:
+    table, where_col, order_col = fetch.schema_table_fetch_all[MstSvtLimit]
+    stmt = select(table).where(where_col == SVT_ID).order_by(order_col)
+    return (await conn.execute(stmt)).fetchall()
+
+
+async def inline_get_all_multiple(conn: AsyncConnection) -> Any:
+    table, where_col, order_col = fetch.schema_table_fetch_all_multiple[MstItem]
+    stmt = select(table).where(where_col.in_(ITEM_IDS)).order_by(*order_col)
+    return (await conn.execute(stmt)).fetchall()
+
+
+async def cached_get_one(conn: AsyncConnection) -> Any:
+    return await fetch.get_one(conn, MstSvt, SVT_ID)
+
+
+async def cached_get_all(conn: AsyncConnection) -> Any:
+    return await fetch.get_all(conn, MstSvtLimit, SVT_ID)
+
+
+async def cached_get_all_multiple(conn: AsyncConnection) -> Any:
+    return await fetch.get_all_multiple(conn, MstItem, ITEM_IDS)
+
+
+BENCHMARKS: dict[str, tuple[Fetcher, Fetcher]] = {
+    "get_one": (inline_get_one, cached_get_one),
+    "get_all": (inline_get_all, cached_get_all),
+    "get_all_multiple": (inline_get_all_multiple, cached_get_all_multiple),
+}
+
+
+async def time_fetcher(conn: AsyncConnection, fetcher: Fetcher, runs: int) -> float:
+    """Average time of a call in microseconds"""
+    await fetcher(conn)
+    start = time.perf_counter()
+    for _ in range(runs):
+        await fetcher(conn)
+    return (time.perf_counter() - start) / runs * 1_000_000
+
+
+async def main(region: Region, runs: int) -> None:
+    dsn = str(settings.data[region].postgresdsn).replace(
+        "postgresql", "postgresql+psycopg"
+    )
+    for prepare_threshold in (None, settings.db_prepare_threshold):
+        engine = create_async_engine(
+            dsn, connect_args={"prepare_threshold": prepare_threshold}
+        )
+        async with engine.connect() as conn:
+            for name, (inline_fetcher, cached_fetcher) in BENCHMARKS.items():
+                inline_time = await time_fetcher(conn, inline_fetcher, runs)
+                cached_time = await time_fetcher(conn, cached_fetcher, runs)
+                print(
+                    f"{name:<18} prepare_threshold={prepare_threshold!s:<5} "
+                    f"inline statement: {inline_time:7.1f}µs  "
+                    f"cached statement: {cached_time:7.1f}µs"
+                )
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Time the fetch helpers with and without the statement cache."
+    )
+    parser.add_argument("--region", "-r", help="Region", type=Region, default=Region.JP)
+    parser.add_argument("--runs", "-n", help="Calls per helper", type=int, default=2000)
+
+    args = parser.parse_args()
+
+    asyncio.run(main(args.region, args.runs))
@@ -0,0 +1,152 @@
+import argparse
+import asyncio
+import time
+import types
+import typing
+from functools import cache
+from typing import Any, Callable, Optional
+
+from pydantic import BaseModel
+from pydantic_core import PydanticUndefined
+
+from app.core.nice.func import use_preloaded_depend_funcs
+from app.core.nice.svt.svt import get_nice_servant
+from app.schemas.common import Language, Region
+from app.schemas.nice import NiceServant
+from scripts.benchmark_asset_urls import load_servant
+
+
+# (kind, model) where kind is "m" for a model, "l" for a list and "d" for a dict
+FieldPlan = Optional[tuple[str, Any]]
+
+
+def get_field_plan(annotation: Any) -> FieldPlan:
+    origin = typing.get_origin(annotation)
+    if origin in (typing.Union, types.UnionType):
+        for arg in typing.get_args(annotation):
+            if arg is not type(None):
+                return get_field_plan(arg)
+        return None
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return ("m", annotation)
+    if origin in (list, dict):
+        inner = get_field_plan(typing.get_args(annotation)[-1])
+        return ("l" if origin is list else "d", inner) if inner else None
+    return None
+
+
+@cache
+def get_model_plan(
+    model: type[BaseModel],
+) -> tuple[dict[str, FieldPlan], dict[str, Any], dict[str, Callable[[], Any]]]:
+    fields = model.model_fields
+    defaults = {
+        name: field.default
+        for name, field in fields.items()
+        if field.default is not PydanticUndefined
+    }
+    factories = {
+        name: field.default_factory
+        for name, field in fields.items()
+        if field.default_factory is not None
+    }
+    plan = {name: get_field_plan(field.annotation) for name, field in fields.items()}
+    return plan, defaults, factories
+
+
+def construct_value(plan: tuple[str, Any], value: Any) -> Any:
+    if value is None:
+        return None
+    kind, inner = plan
+    if kind == "m":
+        return construct_nice_model(inner, value) if type(value) is dict else value
+    if kind == "l":
+        return [construct_value(inner, item) for item in value]
+    return {key: construct_value(inner, item) for key, item in value.items()}
+
+
+def construct_nice_model(model: type[BaseModel], data: dict[str, Any]) -> Any:
+    """Build `model` from `data` without validation, turning the nested dicts into
+    their sub-models and taking the sub-models already built as they are"""
+    plan, defaults, factories = get_model_plan(model)
+    values = dict(defaults)
+    for name, factory in factories.items():
+        if name not in data:
+            values[name] = factory()
+    for name, value in data.items():
+        field_plan = plan.get(name)
+        values[name] = (
+            value if field_plan is None else construct_value(field_plan, value)
+        )
+    instance = model.__new__(model)
+    object.__setattr__(instance, "__dict__", values)
+    object.__setattr__(instance, "__pydantic_fields_set__", set(data))
+    object.__setattr__(instance, "__pydantic_extra__", None)
+    object.__setattr__(instance, "__pydantic_private__", None)
+    return instance
+
+
+def time_call(function: Callable[[], Any], runs: int) -> float:
+    """Average time of a `function` call in microseconds"""
+    start = time.perf_counter()
+    for _ in range(runs):
+        function()
+    return (time.perf_counter() - start) / runs * 1_000_000
+
+
+async def main(file_name: str, runs: int) -> None:
+    raw_svt = load_servant(file_name)
+    # The fixture lacks the unlock data of the append passives
+    raw_svt.mstSvtAppendPassiveSkill = []
+    with use_preloaded_depend_funcs({}):
+        start = time.perf_counter()
+        for _ in range(runs):
+            nice_data = await get_nice_servant(
+                None,  # type: ignore[arg-type]
+                Region.NA,
+                raw_svt.mstSvt.id,
+                Language.en,
+                True,
+                raw_svt=raw_svt,
+            )
+        build_time = (time.perf_counter() - start) / runs * 1_000_000
+
+    validated = NiceServant.model_validate(nice_data)
+    for name, call_time in (
+        ("get_nice_servant", build_time),
+        (
+            "model_validate",
+            time_call(lambda: NiceServant.model_validate(nice_data), runs),
+        ),
+        (
+            "construct_nice_model",
+            time_call(lambda: construct_nice_model(NiceServant, nice_data), runs),
+        ),
+        (
+            "model_dump_json",
+            time_call(
+                lambda: validated.model_dump_json(
+                    exclude_unset=True, exclude_none=True
+                ),
+                runs,
+            ),
+        ),
+    ):
+        print(f"{name:<22} {call_time:8.1f}µs")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=(
+            "Time the nice servant build against its validation and an unvalidated "
+            "construction of the model."
+        )
+    )
+    parser.add_argument(
+        "file_name", help="Raw servant fixture", nargs="?", default="NA_Tomoe"
+    )
+    parser.add_argument("--runs", "-n", help="Calls", type=int, default=200)
+
+    args = parser.parse_args()
+
+    asyncio.run(main(args.file_name, args.runs))
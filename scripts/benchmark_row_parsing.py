@@ -0,0 +1,99 @@
+import argparse
+import time
+import warnings
+from pathlib import Path
+from typing import Any, Callable, Type
+
+import orjson
+from sqlalchemy.engine import Row
+from sqlalchemy.engine.result import IteratorResult, SimpleResultMetaData
+
+from app.db.helpers.utils import parse_rows
+from app.schemas.base import BaseModelORJson
+from app.schemas.raw import MstSkillLv, MstSvt, QuestEntity, SkillEntityNoReverse
+
+
+TEST_DATA = Path(__file__).resolve().parents[1] / "tests" / "test_data_raw"
+
+
+def load_test_data(file_name: str) -> Any:
+    return orjson.loads((TEST_DATA / f"{file_name}.json").read_bytes())
+
+
+def get_rows(schema: Type[BaseModelORJson], data: dict[str, Any]) -> list[Row[Any]]:
+    """Result rows shaped like the DB rows `schema` is parsed from"""
+    row = schema.model_validate(data).model_dump()
+    keys = list(row)
+    metadata = SimpleResultMetaData(keys)
+    return list(IteratorResult(metadata, iter([tuple(row.values())])).fetchall())
+
+
+def get_benchmark_rows() -> dict[str, tuple[Type[BaseModelORJson], list[Row[Any]]]]:
+    svt = load_test_data("NA_Tomoe")
+    skill = load_test_data("NA_skill_24550") | {"mstSvtSkillRelease": []}
+    quest = load_test_data("NA_Artoria_rank_up_2") | {"mstQuestReleaseOverwrite": []}
+    return {
+        "MstSvt": (MstSvt, get_rows(MstSvt, svt["mstSvt"])),
+        "MstSkillLv": (
+            MstSkillLv,
+            [
+                row
+                for skill_lv in skill["mstSkillLv"]
+                for row in get_rows(MstSkillLv, skill_lv)
+            ],
+        ),
+        "SkillEntityNoReverse": (
+            SkillEntityNoReverse,
+            get_rows(SkillEntityNoReverse, skill),
+        ),
+        "QuestEntity": (QuestEntity, get_rows(QuestEntity, quest)),
+    }
+
+
+def from_orm_rows(
+    schema: Type[BaseModelORJson], rows: list[Row[Any]]
+) -> list[BaseModelORJson]:
+    return [schema.from_orm(row) for row in rows]
+
+
+RowParser = Callable[[Type[BaseModelORJson], list[Row[Any]]], list[BaseModelORJson]]
+
+
+def time_parser(
+    parser: RowParser,
+    schema: Type[BaseModelORJson],
+    rows: list[Row[Any]],
+    runs: int,
+) -> float:
+    """Average parsing time of a row in microseconds"""
+    parser(schema, rows)
+    start = time.perf_counter()
+    for _ in range(runs):
+        parser(schema, rows)
+    return (time.perf_counter() - start) / runs / len(rows) * 1_000_000
+
+
+def main(rows_per_result: int, runs: int) -> None:
+    warnings.simplefilter("ignore", DeprecationWarning)
+    for name, (schema, rows) in get_benchmark_rows().items():
+        result = rows * (rows_per_result // len(rows) or 1)
+        from_orm_time = time_parser(from_orm_rows, schema, result, runs)
+        parse_rows_time = time_parser(parse_rows, schema, result, runs)
+        print(
+            f"{name:<22} from_orm: {from_orm_time:7.2f}µs/row  "
+            f"parse_rows: {parse_rows_time:7.2f}µs/row"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Time the parsing of DB rows into the raw schemas."
+    )
+    parser.add_argument(
+        "--rows", "-r", help="Rows per result set", type=int, default=200
+    )
+    parser.add_argument("--runs", "-n", help="Result sets parsed", type=int, default=20)
+
+    args = parser.parse_args()
+
+    main(args.rows, args.runs)
@@ -0,0 +1,74 @@
+import argparse
+import asyncio
+import time
+
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+from app.config import Settings
+from app.core import raw
+from app.core.nice.func import parse_dataVals_text, use_preloaded_depend_funcs
+from app.core.nice.nice import get_nice_servant_model, preload_servant_depend_funcs
+from app.schemas.common import Language, Region
+from app.schemas.raw import ServantEntity
+
+
+settings = Settings()
+
+
+async def time_build(
+    conn: AsyncConnection,
+    region: Region,
+    raw_svt: ServantEntity,
+    runs: int,
+    warm: bool,
+) -> float:
+    """Average time of a nice servant build in milliseconds"""
+    depend_funcs = await preload_servant_depend_funcs(conn, [raw_svt])
+    total = 0.0
+    with use_preloaded_depend_funcs(depend_funcs):
+        for _ in range(runs):
+            if not warm:
+                parse_dataVals_text.cache_clear()
+            start = time.perf_counter()
+            await get_nice_servant_model(
+                conn, region, raw_svt.mstSvt.id, Language.jp, raw_svt=raw_svt
+            )
+            total += time.perf_counter() - start
+    return total / runs * 1000
+
+
+async def main(region: Region, svt_ids: list[int], runs: int) -> None:
+    engine = create_async_engine(
+        str(settings.data[region].postgresdsn).replace(
+            "postgresql", "postgresql+psycopg"
+        )
+    )
+    async with engine.connect() as conn:
+        for svt_id in svt_ids:
+            raw_svt = await raw.get_servant_entity(conn, svt_id, True, False)
+            cold_time = await time_build(conn, region, raw_svt, runs, warm=False)
+            warm_time = await time_build(conn, region, raw_svt, runs, warm=True)
+            print(
+                f"{svt_id:<8} datavals parsed each build: {cold_time:7.2f}ms  "
+                f"datavals memoized: {warm_time:7.2f}ms"
+            )
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Time the nice servant build with and without the datavals cache."
+    )
+    parser.add_argument("--region", "-r", help="Region", type=Region, default=Region.JP)
+    parser.add_argument(
+        "svt_ids",
+        help="Servant IDs",
+        type=int,
+        nargs="*",
+        default=[100100, 500800, 2500500],
+    )
+    parser.add_argument("--runs", "-n", help="Builds per servant", type=int, default=20)
+
+    args = parser.parse_args()
+
+    asyncio.run(main(args.region, args.svt_ids, args.runs))
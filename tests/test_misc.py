@@ -1,20 +1,51 @@
+import asyncio
 from decimal import Decimal
+from pathlib import Path
 
 import orjson
 import pytest
-from fastapi import HTTPException
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.routing import APIRoute
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncConnection
 
-from app.core.nice.func import parse_dataVals
-from app.core.utils import get_voice_name
+from app.cache import etag_matches
+from app.cache_tags import collect_cache_tags
+from app.core.nice.func import (
+    get_depend_func_ids,
+    parse_dataVals,
+    parse_dataVals_text,
+    preload_depend_funcs,
+    use_preloaded_depend_funcs,
+)
+from app.core.utils import fmt_url, get_voice_name
+from app.data.basic_svt import BasicSvtData, BasicSvtStore, write_basic_svt_store
 from app.data.custom_mappings import Translation
 from app.data.script import get_script_path, get_script_text_only, remove_brackets
+from app.db.helpers import fetch
+from app.db.helpers.cache_tags import get_cache_tag_digests
+from app.db.helpers.master_store import MasterStore
+from app.db.helpers.row_cache import (
+    get_cached_rows,
+    get_row_cache_prefix,
+    row_cache,
+    set_cached_rows,
+)
+from app.db.helpers.skill import get_mstSvtSkill
 from app.db.load import get_SkillID_from_sval, get_Value_from_sval
+from app.memory_cache import MemoryCache
+from app.redis.helpers.data import data_cache, settings
+from app.redis.helpers.invalidation import CacheInvalidation, invalidate_local_caches
+from app.redis.helpers.quest import get_redis_cache_key, parse_redis_cache_key
+from app.redis.helpers.single_flight import single_flight
+from app.redis.helpers.traffic import get_traffic_key
+from app.routers import nice, raw
 from app.routers.utils import list_string_exclude
+from app.schemas.base import HttpUrlAdapter
 from app.schemas.common import Language, Region, ReverseDepth
 from app.schemas.gameenums import FuncType
-from app.schemas.nice import NiceServant
-from app.schemas.raw import ScriptJsonInfo, get_subtitle_svtId
+from app.schemas.nice import AssetURL, NiceServant
+from app.schemas.raw import MstSvt, MstSvtExtra, ScriptJsonInfo, get_subtitle_svtId
 
 from .utils import get_response_data, get_text_data
 
@@ -64,6 +95,14 @@ async def test_parse_dataVals_class_drop_up_rate(na_db_conn: AsyncConnection) ->
     }
 
 
+def test_parse_dataVals_text_depend_func() -> None:
+    dataVals = "[1000,3,-1,DependFuncId1:[430],DependFuncVals1:[1000,500]]"
+    parsed, depend_func_vals = parse_dataVals_text(dataVals, FuncType.ADD_STATE)
+    assert parsed == {"Rate": 1000, "Turn": 3, "Count": -1, "DependFuncId": 430}
+    assert depend_func_vals == "[1000,500]"
+    assert parse_dataVals_text(dataVals, FuncType.ADD_STATE)[0] is parsed
+
+
 cases_datavals_fail_dict = {
     "test_dataVals_fail_str_dataVals_no_value": "[HideMiss]",
     "test_dataVals_fail_str_dataVals_str_value": "[HideMiss:123/abc]",
@@ -87,6 +126,27 @@ async def test_parse_datavals_fail_list_str(
         await parse_dataVals(na_db_conn, Region.NA, dataVals, 1, Language.en)
 
 
+@pytest.mark.asyncio
+async def test_parse_dataVals_preloaded_depend_funcs(
+    na_db_conn: AsyncConnection,
+) -> None:
+    dataVals = cases_datavals_fail_dict["test_unknown_function_dependFunc"]
+    depend_funcs = await preload_depend_funcs(na_db_conn, [dataVals])
+    assert depend_funcs == {}
+    with use_preloaded_depend_funcs(depend_funcs), pytest.raises(HTTPException):
+        await parse_dataVals(na_db_conn, Region.NA, dataVals, 1, Language.en)
+
+
+@pytest.mark.asyncio
+async def test_depend_funcs_without_connection() -> None:
+    dataVals = "[1000,-1,DependFuncId1:1234,DependFuncVals1:[0,DependFuncId1:5678]]"
+    assert get_depend_func_ids([dataVals]) == {1234, 5678}
+    with use_preloaded_depend_funcs({}), pytest.raises(HTTPException):
+        await parse_dataVals(
+            None, Region.NA, dataVals, 1, Language.en  # type: ignore[arg-type]
+        )
+
+
 def test_reverseDepth_str_comparison() -> None:
     assert ReverseDepth.function >= "aaaaa"
 
@@ -155,3 +215,224 @@ def test_get_SkillID_from_sval() -> None:
         )
         == 961313
     )
+
+
+def test_cache_tag_digests() -> None:
+    rows = [{"svtId": 100100, "cardId": 1}, {"svtId": 100200, "cardId": 1}]
+    digests = get_cache_tag_digests("mstSvtCard", rows)
+    assert digests.keys() == {
+        "mstSvtCard:*",
+        "mstSvtCard.svtId:100100",
+        "mstSvtCard.svtId:100200",
+    }
+
+    new_digests = get_cache_tag_digests(
+        "mstSvtCard", [rows[0], {"svtId": 100200, "cardId": 2}]
+    )
+    assert new_digests["mstSvtCard.svtId:100100"] == digests["mstSvtCard.svtId:100100"]
+    assert new_digests["mstSvtCard.svtId:100200"] != digests["mstSvtCard.svtId:100200"]
+    assert new_digests["mstSvtCard:*"] != digests["mstSvtCard:*"]
+
+
+@pytest.mark.asyncio
+async def test_cache_tags_collection(na_db_conn: AsyncConnection) -> None:
+    with collect_cache_tags() as collector:
+        await fetch.get_one(na_db_conn, MstSvt, 100100)
+    assert collector.tracked
+    assert collector.tags == {"mstSvt.id:100100"}
+
+    with collect_cache_tags() as collector:
+        await fetch.get_one(na_db_conn, MstSvt, 100100)
+        await get_mstSvtSkill(na_db_conn, 100100)
+    assert not collector.tracked
+
+
+@pytest.mark.asyncio
+async def test_single_flight_in_process() -> None:
+    cache: dict[str, int] = {}
+    builds = 0
+
+    async def get_data() -> int:
+        nonlocal builds
+        async with single_flight(None, "test_single_flight"):
+            if "key" not in cache:
+                builds += 1
+                await asyncio.sleep(0.05)
+                cache["key"] = builds
+            return cache["key"]
+
+    assert await asyncio.gather(*(get_data() for _ in range(5))) == [1] * 5
+    assert builds == 1
+
+
+def test_traffic_key() -> None:
+    def get_route(router: APIRouter, path: str) -> APIRoute:
+        return next(
+            route
+            for route in router.routes
+            if isinstance(route, APIRoute) and route.path == path
+        )
+
+    def get_request(
+        method: str, path: str, query: bytes = b"", route: APIRoute | None = None
+    ) -> Request:
+        return Request(
+            {
+                "type": "http",
+                "method": method,
+                "path": path,
+                "query_string": query,
+                "headers": [],
+                "route": route,
+            }
+        )
+
+    servant_route = get_route(nice.router, "/nice/{region}/servant/{servant_id}")
+    assert (
+        get_traffic_key(
+            get_request(
+                "GET",
+                "/nice/JP/servant/100100",
+                b"lore=true&junk=1&lang=en",
+                servant_route,
+            )
+        )
+        == "/nice/JP/servant/100100?lang=en&lore=true"
+    )
+    quest_route = get_route(raw.router, "/raw/{region}/quest/{quest_id}/{phase}")
+    assert get_traffic_key(
+        get_request("GET", "/raw/NA/quest/1000001/1", b"junk=1", quest_route)
+    ) == ("/raw/NA/quest/1000001/1")
+    assert get_traffic_key(get_request("GET", "/raw/NA/quest/1000001/1")) is None
+    assert get_traffic_key(get_request("GET", "/export/JP/nice_servant.json")) is None
+    assert get_traffic_key(get_request("POST", "/nice/JP/servant/search")) is None
+
+
+def test_etag_matches() -> None:
+    etag = '"8843d7f92416211de9ebb963ff4ce28125932878"'
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"abc", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches('"abc"', etag)
+
+
+def test_parse_redis_cache_key() -> None:
+    redis_key = get_redis_cache_key(Region.JP, 94032412, 1, None, Language.en)
+    assert parse_redis_cache_key(f"{redis_key}:heavy".encode()) == (
+        Region.JP,
+        94032412,
+        1,
+        None,
+        Language.en,
+    )
+    redis_key = get_redis_cache_key(Region.NA, 94032412, 3, "1_abc", Language.jp)
+    assert parse_redis_cache_key(redis_key.encode()) == (
+        Region.NA,
+        94032412,
+        3,
+        "1_abc",
+        Language.jp,
+    )
+    assert parse_redis_cache_key(b"fgoapi:cache:JP::abcdef") is None
+
+
+def test_memory_cache() -> None:
+    memory_cache = MemoryCache(max_size=20)
+    memory_cache.set("a", b"123456789")
+    memory_cache.set("b", b"123456789", expire=60)
+    assert memory_cache.get_with_ttl("a") == (-1, b"123456789")
+    assert memory_cache.get_with_ttl("b") == (60, b"123456789")
+
+    # "a" was used last so "b" is evicted
+    memory_cache.get("a")
+    memory_cache.set("c", b"1")
+    assert memory_cache.get("b") is None
+    assert memory_cache.size == 12
+
+    memory_cache.set("d", b"1" * 20)
+    assert memory_cache.get("d") is None
+    assert memory_cache.clear() == 2
+    assert memory_cache.size == 0
+
+
+def test_cache_invalidation(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(data_cache, "max_size", 1024)
+    invalidation = CacheInvalidation(
+        [Region.JP, Region.NA], "1", {Region.JP: {"mstSvt.id:100100"}}
+    )
+    assert CacheInvalidation.loads(invalidation.dumps()) == invalidation
+    assert invalidation.get_changed_tags(Region.NA) is None
+
+    data_key = f"{settings.redis_prefix}:data:{{}}:mstSvt:100100"
+    data_cache.set(data_key.format("JP"), b"JP")
+    data_cache.set(data_key.format("KR"), b"KR")
+    invalidate_local_caches(CacheInvalidation([Region.JP]))
+    assert data_cache.get(data_key.format("JP")) is None
+    assert data_cache.get(data_key.format("KR")) == b"KR"
+
+
+def test_row_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(row_cache, "max_size", 1024 * 1024)
+    mstSvt = MstSvt.model_validate(
+        get_response_data("test_data_raw", "NA_Tomoe")["mstSvt"]
+    )
+    prefix = get_row_cache_prefix(Region.JP)
+    set_cached_rows(prefix, MstSvt, {mstSvt.id: [mstSvt], 1: []})
+    cached, missing = get_cached_rows(prefix, MstSvt, [mstSvt.id, 1, 2])
+    assert cached == {mstSvt.id: [mstSvt], 1: []}
+    assert missing == [2]
+
+    invalidate_local_caches(CacheInvalidation([Region.JP], "2"))
+    assert get_row_cache_prefix(Region.JP).startswith("JP:2:")
+    cached, missing = get_cached_rows(prefix, MstSvt, [mstSvt.id])
+    assert missing == [mstSvt.id]
+
+
+def test_master_store() -> None:
+    store = MasterStore()
+    store.add_table(
+        "mstSvtLimit",
+        [
+            {"svtId": 1, "limitCount": 2},
+            {"svtId": 2, "limitCount": 0},
+            {"svtId": 1, "limitCount": 0},
+        ],
+    )
+    index_key = ("svtId", ("limitCount",))
+    assert orjson.loads(store.get_rows("mstSvtLimit", index_key, 1) or b"") == [
+        {"svtId": 1, "limitCount": 0},
+        {"svtId": 1, "limitCount": 2},
+    ]
+    assert store.get_rows("mstSvtLimit", index_key, 3) == b"[]"
+    assert store.get_rows("mstSvtLimit", ("id", ()), 1) is None
+    assert store.get_rows("mstSvt", ("id", ()), 1) is None
+
+
+def test_basic_svt_store(tmp_path: Path) -> None:
+    raw_svt = get_response_data("test_data_raw", "NA_Tomoe")
+    svtExtra = MstSvtExtra.model_validate(
+        raw_svt["mstSvtExtra"]
+        | {
+            "mstSvt": raw_svt["mstSvt"],
+            "limitAdds": raw_svt["mstSvtLimitAdd"],
+            "limits": raw_svt["mstSvtLimit"],
+        }
+    )
+    store_path = tmp_path / "NA_basic_svt.bin"
+    write_basic_svt_store(store_path, [svtExtra])
+    store = BasicSvtStore(store_path)
+    assert store.get(svtExtra.svtId) == BasicSvtData.from_svt_extra(svtExtra)
+    assert store.get(svtExtra.svtId + 1) is None
+    assert store.get(0) is None
+
+
+def test_fmt_url() -> None:
+    url = fmt_url(
+        AssetURL.face, base_url=settings.asset_url, region=Region.NA, item_id=1, i=0
+    )
+    assert url == HttpUrlAdapter.validate_python(
+        f"{settings.asset_url}/NA/Faces/f_10.png"
+    )
+    with pytest.raises(ValidationError):
+        fmt_url("{region}/Faces/f_{item_id}.png", region=Region.NA, item_id=1)